@@ -5,15 +5,18 @@ Auto-approve bash commands when they match patterns in the allow list.
 Handles both single commands and chained commands (pipes, &&, ||, ;).
 Bypasses Claude Code's built-in permission matching which has issues with
 commands containing shell-like characters (|, >, &) even when quoted/escaped.
+
+Decisions are remembered in a DecisionCache until settings change, so
+repeated commands skip validation.
 """
-from pathlib import Path
+import os
 import sys
 
-sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from hook_utils import (
     parse_hook_input, approve, pass_through,
-    CommandValidator
+    DecisionCache, SettingsReader
 )
 
 
@@ -28,9 +31,17 @@ def main():
 
     command = hook.get_input("command")
 
-    # Validate all commands (single or chained) against allow patterns
-    result = CommandValidator().validate(command)
-    if result.approved:
+    settings = SettingsReader()
+
+    def validate() -> bool:
+        from hook_validation import CommandValidator
+
+        # Validate all commands (single or chained) against allow patterns
+        return CommandValidator(settings_reader=settings).validate(command).approved
+
+    approved = DecisionCache("piped-bash", settings.fingerprint()).decide(command, validate)
+
+    if approved:
         approve()
 
     pass_through()
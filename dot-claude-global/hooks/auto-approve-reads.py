@@ -5,10 +5,10 @@ Auto-approve read operations on files within allowed directories.
 Works alongside block-env-files.py which runs first as a PreToolUse hook
 to block sensitive files.
 """
-from pathlib import Path
+import os
 import sys
 
-sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from hook_utils import (
     parse_hook_input, approve, pass_through,
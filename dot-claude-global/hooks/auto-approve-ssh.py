@@ -13,21 +13,21 @@ Security model:
 - Dangerous SSH options: Blocked (ProxyCommand, LocalCommand, etc.)
 - Fail-safe: Any uncertainty falls through to manual approval
 
+Decisions are remembered in a DecisionCache until settings.json or
+~/.ssh/config change.
+
 WARNING: This is friction-reduction, not security. SSH crosses trust boundaries
 and remote environments are opaque.
 """
-from dataclasses import dataclass
-from pathlib import Path
-from typing import Optional
+from typing import NamedTuple, Optional
 import os
-import shlex
 import sys
 
-sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from hook_utils import (
     parse_hook_input, approve, pass_through,
-    CommandValidator, ValidationResult
+    DecisionCache, SettingsCache, SettingsReader
 )
 
 
@@ -35,6 +35,8 @@ from hook_utils import (
 # SSH Configuration
 # =============================================================================
 
+SSH_CONFIG = "~/.ssh/config"
+
 DANGEROUS_SSH_OPTIONS = frozenset({
     '-o', '--option', '-F', '-S', '-W', '-J', '--jump',
 })
@@ -58,7 +60,7 @@ SSH_OPTIONS_WITH_ARGS = frozenset({
 class SSHConfigParser:
     """Parses ~/.ssh/config to extract trusted host names."""
 
-    def __init__(self, config_path: str = "~/.ssh/config"):
+    def __init__(self, config_path: str = SSH_CONFIG):
         self._path = os.path.expanduser(config_path)
         self._hosts: Optional[frozenset[str]] = None
 
@@ -88,8 +90,7 @@ class SSHConfigParser:
 # SSH Command Parser
 # =============================================================================
 
-@dataclass
-class SSHCommand:
+class SSHCommand(NamedTuple):
     host: str
     options: list[str]
     remote_command: str
@@ -99,6 +100,8 @@ class SSHCommandParser:
     """Parses SSH commands to extract host, options, and remote command."""
 
     def parse(self, command: str) -> Optional[SSHCommand]:
+        import shlex
+
         try:
             parts = shlex.split(command)
         except ValueError:
@@ -156,10 +159,12 @@ class SSHCommandParser:
 class SSHApprover:
     """Orchestrates SSH command validation."""
 
-    def __init__(self):
+    def __init__(self, settings_reader: Optional[SettingsReader] = None):
+        from hook_validation import CommandValidator
+
         self._ssh_config = SSHConfigParser()
         self._ssh_parser = SSHCommandParser()
-        self._cmd_validator = CommandValidator()
+        self._cmd_validator = CommandValidator(settings_reader=settings_reader)
 
     def should_approve(self, command: str) -> tuple[bool, str]:
         parsed = self._ssh_parser.parse(command)
@@ -195,7 +200,14 @@ def main():
     if not command.strip().startswith('ssh '):
         pass_through()
 
-    approved, _ = SSHApprover().should_approve(command)
+    settings = SettingsReader()
+    fingerprint = settings.fingerprint() + SettingsCache.make_key(
+        [os.path.expanduser(SSH_CONFIG)]
+    )
+    approved = DecisionCache("ssh", fingerprint).decide(
+        command, lambda: SSHApprover(settings_reader=settings).should_approve(command)[0]
+    )
+
     if approved:
         approve()
 
@@ -2,15 +2,15 @@
 """Auto-approve all WebFetch tool requests."""
 
 from datetime import datetime
-from pathlib import Path
 import json
+import os
 import sys
 
-sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from hook_utils import parse_hook_input, approve, pass_through
 
-LOG_FILE = Path.home() / ".claude" / "logs" / "webfetch-hook.log"
+LOG_FILE = os.path.expanduser("~/.claude/logs/webfetch-hook.log")
 
 
 def log(message: str, data: dict | None = None):
@@ -20,7 +20,7 @@ def log(message: str, data: dict | None = None):
     if data:
         entry += f"\n  {json.dumps(data, indent=2, default=str)}"
     entry += "\n"
-    LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+    os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
     with open(LOG_FILE, "a") as f:
         f.write(entry)
 
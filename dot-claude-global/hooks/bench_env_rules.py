@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark block-env-files.py rule matching on a synthetic corpus.
+
+Compares the combined RuleSet alternations against the previous approach
+(one re.search per pattern, relying on re's internal compile cache) over
+100k file paths and a set of Bash commands, and checks both agree.
+
+Usage:
+    python3 bench_env_rules.py [--paths N] [--commands N] [--seed S]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+HOOKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HOOKS_DIR)
+
+from hook_utils import load_hook_module
+
+env_files = load_hook_module(os.path.join(HOOKS_DIR, "block-env-files.py"))
+
+DIRS = ["/home/u/project", "/srv/app", "~/.ssh", "~/.aws", "/etc", "src/lib",
+        "~/.config/gcloud", "~/Documents/github/site", "/tmp", "~/.kube", "."]
+STEMS = ["main", "index", "tokenizer", "config", "README", "id_rsa", "secrets",
+         "credentials", "app", "settings", "server", "token", "apikey", "notes"]
+EXTS = [".py", ".ts", ".md", ".json", ".env", ".env.example", ".pem", ".key",
+        ".yaml", ".txt", "", ".env.local", ".tfstate", ".netrc", ".rs"]
+COMMANDS = ["cat", "grep -n foo", "ls -la", "git diff", "head -20", "python3",
+            "cp", "echo", "rg TODO", "source", "sed -n 1,5p", "npm test"]
+
+
+def synthetic_paths(count: int, seed: int = 0) -> list[str]:
+    """Mix of ordinary and sensitive-looking paths (roughly 1 in 4 sensitive)."""
+    rng = random.Random(seed)
+    return [
+        f"{rng.choice(DIRS)}/{rng.choice(STEMS)}{rng.choice(EXTS)}"
+        for _ in range(count)
+    ]
+
+
+def synthetic_commands(count: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    paths = synthetic_paths(count * 2, seed)
+    commands = []
+    for i in range(count):
+        command = f"{rng.choice(COMMANDS)} {paths[2 * i]}"
+        if rng.random() < 0.3:
+            command += f" | {rng.choice(COMMANDS)} {paths[2 * i + 1]}"
+        commands.append(command)
+    return commands
+
+
+def legacy_file(path: str) -> bool:
+    """Pre-RuleSet is_sensitive_file: one re.search per pattern."""
+    if not path:
+        return False
+    for pattern in env_files.SAFE_PATTERNS:
+        if re.search(pattern, path, re.IGNORECASE):
+            return False
+    if env_files.path_in_allowed_env_dir(path):
+        return False
+    resolved = env_files.resolve_path(path) or path
+    normalized = os.path.normpath(path)
+    for check_path in [path, normalized, resolved]:
+        for pattern in env_files.SENSITIVE_FILE_PATTERNS:
+            if re.search(pattern, check_path, re.IGNORECASE):
+                return True
+    return False
+
+
+def legacy_bash_patterns() -> list[str]:
+    """Pre-RuleSet pattern list: one pattern per (command, basename) pair."""
+    patterns = env_files.BASH_SENSITIVE_PATTERNS[:7]
+    for cmd in env_files.FILE_READ_COMMANDS:
+        for basename in env_files.SENSITIVE_BASENAMES:
+            patterns.append(rf"\b{cmd}\b[^|;\n]*{basename}")
+    return patterns
+
+
+def legacy_bash(command: str, patterns: list[str]) -> bool:
+    return any(re.search(p, command, re.IGNORECASE) for p in patterns)
+
+
+def throughput(label: str, fn, items) -> list[bool]:
+    start = time.perf_counter()
+    results = [fn(item) for item in items]
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<10} {elapsed * 1000:9.1f} ms  {len(items) / elapsed:>11,.0f} /s")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--paths", type=int, default=100_000)
+    parser.add_argument("--commands", type=int, default=5_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    paths = synthetic_paths(args.paths, args.seed)
+    sensitive = sum(map(env_files.is_sensitive_file, paths[:1000]))
+    print(f"File paths: {len(paths):,} (~{sensitive / 10:.0f}% sensitive)")
+    new = throughput("RuleSet", env_files.is_sensitive_file, paths)
+    old = throughput("legacy", legacy_file, paths)
+    print(f"  agree: {new == old}")
+
+    commands = synthetic_commands(args.commands, args.seed)
+    patterns = legacy_bash_patterns()
+    print(f"\nBash commands: {len(commands):,} "
+          f"({len(patterns)} legacy patterns vs {len(env_files.BASH_SENSITIVE_PATTERNS)} rules)")
+    new = throughput("RuleSet", env_files.is_sensitive_bash, commands)
+    old = throughput("legacy", lambda c: legacy_bash(c, patterns), commands)
+    print(f"  agree: {new == old}")
+
+    start = time.perf_counter()
+    for rules in (env_files.SAFE_RULES, env_files.SENSITIVE_FILE_RULES,
+                  env_files.BASH_SENSITIVE_RULES):
+        rules._compile()
+    print(f"\nCompiling all rule sets from scratch: "
+          f"{(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Replay realistic tool calls through every hook and report latency.
+
+The corpus is built from tool_use blocks in session JSONL transcripts
+(~/.claude/projects/*/*.jsonl by default), or read from a JSONL file of
+raw hook payloads, falling back to a small built-in sample. Each tool call
+is routed to the hooks settings.json registers for it (PermissionRequest,
+PreToolUse and PostToolUse matchers), then timed:
+
+    subprocess   python3 <hook> per call, as without the daemon
+    in-process   main() of a module imported once, as in the daemon
+
+Per hook it reports p50/p95/p99 for both modes, the hook's import time in
+a fresh interpreter, and the mean peak traced allocation per in-process
+call.
+
+post-edit-lint.py formats the files it is given, so it is skipped unless
+--include-side-effects is passed. Replayed `git push` calls would make
+block-push-others-branch.py query the remote, so the benchmark puts stub
+`gh` (always fails, so nothing is cached) and `git ls-remote` (answers a
+fixed head) first on PATH; every other git command runs the real binary.
+
+Usage:
+    python3 bench_hooks.py [--sessions GLOB] [--corpus FILE] [--limit N]
+                           [--repeat N] [--hook NAME ...]
+    python3 bench_hooks.py --trace [FILE]    Summarise a CLAUDE_HOOK_TRACE file
+"""
+import argparse
+import glob
+import io
+import json
+import os
+from pathlib import Path
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+HOOKS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(HOOKS_DIR))
+
+import hook_trace
+from hook_utils import load_hook_module
+
+SETTINGS_PATH = HOOKS_DIR.parent / "settings.json"
+DEFAULT_SESSIONS = os.path.expanduser("~/.claude/projects/*/*.jsonl")
+EVENTS = ("PermissionRequest", "PreToolUse", "PostToolUse")
+SIDE_EFFECT_HOOKS = frozenset({"post-edit-lint.py"})
+
+SAMPLE_TOOL_CALLS = [
+    ("Bash", {"command": "git status"}),
+    ("Bash", {"command": "git diff --stat | head -20"}),
+    ("Bash", {"command": "ls -la && cat README.md | grep -n hooks"}),
+    ("Bash", {"command": "python3 -m pytest -q 2>&1 | tail -5"}),
+    ("Bash", {"command": "ssh pve 'sudo pct exec 101 -- ls /var/log'"}),
+    ("Bash", {"command": "git push origin HEAD"}),
+    ("Read", {"file_path": os.path.expanduser("~/.claude/settings.json")}),
+    ("Read", {"file_path": "/etc/hosts"}),
+    ("Grep", {"pattern": "def main", "path": str(HOOKS_DIR)}),
+    ("Glob", {"pattern": "**/*.py", "path": str(HOOKS_DIR)}),
+    ("Edit", {"file_path": "/tmp/bench_hooks_example.py",
+              "old_string": "a = 1", "new_string": "a = 2"}),
+    ("WebFetch", {"url": "https://docs.python.org/3/", "prompt": "summarise"}),
+]
+
+
+# =============================================================================
+# Corpus
+# =============================================================================
+
+def tool_calls_from_sessions(pattern: str, limit: int) -> list[tuple[str, dict]]:
+    """Collect (tool_name, tool_input) pairs from session transcripts."""
+    calls = []
+    for path in sorted(glob.glob(pattern), key=os.path.getmtime, reverse=True):
+        try:
+            with open(path) as f:
+                for line in f:
+                    if '"tool_use"' not in line:
+                        continue
+                    try:
+                        content = json.loads(line).get("message", {}).get("content", [])
+                    except ValueError:
+                        continue
+                    for block in content if isinstance(content, list) else []:
+                        if isinstance(block, dict) and block.get("type") == "tool_use":
+                            calls.append((block.get("name", ""), block.get("input", {})))
+                            if len(calls) >= limit:
+                                return calls
+        except OSError:
+            continue
+    return calls
+
+
+def tool_calls_from_corpus(path: str, limit: int) -> list[tuple[str, dict]]:
+    """Read raw hook payloads (one JSON object per line)."""
+    calls = []
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                data = json.loads(line)
+                calls.append((data.get("tool_name", ""), data.get("tool_input", {})))
+    return calls[:limit]
+
+
+def registered_hooks() -> list[tuple[str, re.Pattern, str]]:
+    """(event, matcher, hook file) for every hook settings.json registers."""
+    with open(SETTINGS_PATH) as f:
+        hooks = json.load(f).get("hooks", {})
+    registered = []
+    for event in EVENTS:
+        for entry in hooks.get(event, []):
+            matcher = re.compile(f"^(?:{entry.get('matcher') or '.*'})$")
+            for hook in entry.get("hooks", []):
+                name = os.path.basename(hook.get("command", "").split()[-1])
+                if (HOOKS_DIR / name).is_file():
+                    registered.append((event, matcher, name))
+    return registered
+
+
+def build_workload(calls, only: set[str], include_side_effects: bool) -> dict[str, list[str]]:
+    """Map each hook file to the payloads it would receive for the corpus."""
+    workload: dict[str, list[str]] = {}
+    for event, matcher, name in registered_hooks():
+        if only and name not in only:
+            continue
+        if name in SIDE_EFFECT_HOOKS and not include_side_effects:
+            continue
+        for tool_name, tool_input in calls:
+            if matcher.match(tool_name):
+                workload.setdefault(name, []).append(json.dumps({
+                    "hook_event_name": event,
+                    "tool_name": tool_name,
+                    "tool_input": tool_input,
+                }))
+    return workload
+
+
+# =============================================================================
+# Measurement
+# =============================================================================
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+
+def time_subprocess(hook: str, payloads: list[str], repeat: int) -> list[float]:
+    path = str(HOOKS_DIR / hook)
+    samples = []
+    for _ in range(repeat):
+        for payload in payloads:
+            start = time.perf_counter()
+            subprocess.run([sys.executable, path], input=payload,
+                           capture_output=True, text=True)
+            samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def call_in_process(module, payload: str) -> None:
+    """Run main() against payload with stdio captured, like the daemon."""
+    saved = sys.stdin, sys.stdout, sys.stderr
+    sys.stdin, sys.stdout, sys.stderr = io.StringIO(payload), io.StringIO(), io.StringIO()
+    try:
+        module.main()
+    except SystemExit:
+        pass
+    finally:
+        sys.stdin, sys.stdout, sys.stderr = saved
+
+
+def time_in_process(module, payloads: list[str], repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        for payload in payloads:
+            start = time.perf_counter()
+            call_in_process(module, payload)
+            samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def peak_alloc_kib(module, payloads: list[str]) -> float:
+    """Mean peak traced allocation per call (separate pass: tracing is slow)."""
+    tracemalloc.start()
+    peaks = []
+    try:
+        for payload in payloads:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            call_in_process(module, payload)
+            peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    finally:
+        tracemalloc.stop()
+    return sum(peaks) / len(peaks) / 1024
+
+
+def import_ms(hook: str, repeat: int = 3) -> float:
+    """Best-of-N time to import the hook (and its deps) in a fresh interpreter."""
+    code = (
+        "import sys, time; t = time.perf_counter(); "
+        f"sys.path.insert(0, {str(HOOKS_DIR)!r}); "
+        "from hook_utils import load_hook_module; "
+        f"load_hook_module({str(HOOKS_DIR / hook)!r}); "
+        "print((time.perf_counter() - t) * 1000)"
+    )
+    best = float("inf")
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        try:
+            best = min(best, float(proc.stdout.strip()))
+        except ValueError:
+            return float("nan")
+    return best
+
+
+# =============================================================================
+# Reports
+# =============================================================================
+
+def report(workload: dict[str, list[str]], repeat: int) -> None:
+    header = (f"{'hook':<30} {'calls':>5} {'import':>7} "
+              f"{'sub p50':>8} {'p95':>7} {'p99':>7} "
+              f"{'inproc p50':>10} {'p95':>7} {'p99':>7} {'peak KiB':>9}")
+    print(header)
+    print("-" * len(header))
+    for hook, payloads in sorted(workload.items()):
+        module = load_hook_module(str(HOOKS_DIR / hook))
+        sub = time_subprocess(hook, payloads, repeat)
+        inproc = time_in_process(module, payloads, repeat)
+        print(f"{hook:<30} {len(payloads):>5} {import_ms(hook):>7.2f} "
+              f"{percentile(sub, 50):>8.2f} {percentile(sub, 95):>7.2f} {percentile(sub, 99):>7.2f} "
+              f"{percentile(inproc, 50):>10.3f} {percentile(inproc, 95):>7.3f} "
+              f"{percentile(inproc, 99):>7.3f} {peak_alloc_kib(module, payloads):>9.1f}")
+    print("\nAll times in ms. import excludes interpreter startup.")
+
+
+def report_trace(path: str) -> None:
+    groups: dict[tuple[str, str], list[float]] = {}
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            groups.setdefault((record.get("hook", "?"), record.get("mode", "?")), []).append(
+                record.get("ms", 0.0))
+    header = f"{'hook':<30} {'mode':<9} {'calls':>6} {'p50':>8} {'p95':>8} {'p99':>8}"
+    print(header)
+    print("-" * len(header))
+    for (hook, mode), samples in sorted(groups.items()):
+        print(f"{hook:<30} {mode:<9} {len(samples):>6} {percentile(samples, 50):>8.2f} "
+              f"{percentile(samples, 95):>8.2f} {percentile(samples, 99):>8.2f}")
+
+
+def stub_network_tools() -> str:
+    """Put offline `gh` and `git ls-remote` stubs first on PATH; returns the stub dir."""
+    real_git = shutil.which("git") or "/usr/bin/git"
+    stub_dir = tempfile.mkdtemp(prefix="bench_hooks_bin.")
+    stubs = {
+        "gh": "#!/bin/sh\nexit 1\n",
+        "git": ('#!/bin/sh\n'
+                'if [ "$1" = ls-remote ]; then\n'
+                '    printf "0000000000000000000000000000000000000000\\trefs/heads/bench\\n"\n'
+                '    exit 0\n'
+                'fi\n'
+                f'exec "{real_git}" "$@"\n'),
+    }
+    for name, body in stubs.items():
+        stub = Path(stub_dir, name)
+        stub.write_text(body)
+        stub.chmod(0o755)
+    os.environ["PATH"] = stub_dir + os.pathsep + os.environ.get("PATH", "")
+    return stub_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", default=DEFAULT_SESSIONS,
+                        help="glob of session JSONL files to mine for tool calls")
+    parser.add_argument("--corpus", help="JSONL file of hook payloads (overrides --sessions)")
+    parser.add_argument("--limit", type=int, default=200, help="max tool calls to replay")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--hook", action="append", default=[], help="only benchmark this hook")
+    parser.add_argument("--include-side-effects", action="store_true",
+                        help="also run hooks that modify files (post-edit-lint.py)")
+    parser.add_argument("--trace", nargs="?", const=hook_trace.DEFAULT_TRACE_FILE,
+                        help="summarise a CLAUDE_HOOK_TRACE file instead")
+    args = parser.parse_args()
+
+    if args.trace:
+        report_trace(args.trace)
+        return
+
+    if args.corpus:
+        calls, source = tool_calls_from_corpus(args.corpus, args.limit), args.corpus
+    else:
+        calls, source = tool_calls_from_sessions(args.sessions, args.limit), args.sessions
+    if not calls:
+        calls, source = SAMPLE_TOOL_CALLS, "built-in sample"
+
+    workload = build_workload(calls, set(args.hook), args.include_side_effects)
+    print(f"Replaying {len(calls)} tool calls from {source}, repeat={args.repeat}\n")
+    stub_dir = stub_network_tools()
+    try:
+        report(workload, args.repeat)
+    finally:
+        shutil.rmtree(stub_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark statusline refresh latency against the number of stored sessions.
+
+For each session count, builds a throwaway HOME with that many transcripts
+spread over project directories (SESSIONS_PER_PROJECT each), then renders
+statusline.sh for one of them repeatedly in two modes:
+
+    indexed     the session's entry exists in ~/.claude/cache/sessions
+    walk        the entry is removed before every render, so the statusline
+                falls back to searching ~/.claude/projects (the old behaviour)
+
+and reports the median and p95 refresh time of each. The transcripts are
+freshly written, so the walk runs against a warm dentry cache; on a real
+machine with years of history its cold cost is higher.
+
+Usage:
+    python3 bench_session_index.py [--sessions N ...] [--repeat N]
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+
+HOOKS_DIR = os.path.dirname(os.path.abspath(__file__))
+STATUSLINE = os.path.join(os.path.dirname(HOOKS_DIR), "statusline.sh")
+SESSIONS_PER_PROJECT = 50
+TRANSCRIPT = (
+    json.dumps({"type": "assistant", "message": {
+        "usage": {"input_tokens": 1200, "cache_read_input_tokens": 48000},
+        "content": [{"type": "text", "text": "done"}],
+    }}) + "\n"
+)
+
+
+def make_home(home: str, sessions: int) -> list[str]:
+    """Populate home with transcripts and installed hooks. Returns the session ids."""
+    hooks = os.path.join(home, ".claude", "hooks")
+    os.makedirs(hooks)
+    for name in ("hook_utils.py", "session_index.py", "transcript_index.py"):
+        shutil.copy(os.path.join(HOOKS_DIR, name), hooks)
+    ids = []
+    for n in range(sessions):
+        project = os.path.join(home, ".claude", "projects", f"-home-user-project-{n // SESSIONS_PER_PROJECT}")
+        os.makedirs(project, exist_ok=True)
+        session_id = f"{n:08x}-0000-4000-8000-{random.getrandbits(48):012x}"
+        with open(os.path.join(project, f"{session_id}.jsonl"), "w") as f:
+            f.write(TRANSCRIPT)
+        ids.append(session_id)
+    return ids
+
+
+def render(home: str, session_id: str) -> float:
+    """Seconds to render the statusline once."""
+    payload = json.dumps({
+        "session_id": session_id,
+        "model": {"display_name": "Opus"},
+        "workspace": {"current_dir": home},
+    })
+    start = time.perf_counter()
+    subprocess.run(
+        ["bash", STATUSLINE], input=payload.encode(), stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL, cwd=home, env={**os.environ, "HOME": home},
+    )
+    return time.perf_counter() - start
+
+
+def bench(sessions: int, repeat: int) -> dict[str, list[float]]:
+    samples = {"indexed": [], "walk": []}
+    with tempfile.TemporaryDirectory() as home:
+        session_id = random.choice(make_home(home, sessions))
+        entry = os.path.join(home, ".claude", "cache", "sessions", session_id)
+        # First render warms the transcript index and records the entry
+        render(home, session_id)
+        for _ in range(repeat):
+            samples["indexed"].append(render(home, session_id))
+            os.unlink(entry)
+            samples["walk"].append(render(home, session_id))
+    return samples
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'sessions':>8}  {'indexed p50':>11}  {'p95':>7}  {'walk p50':>9}  {'p95':>7}")
+    for sessions in args.sessions:
+        samples = bench(sessions, args.repeat)
+        row = [f"{sessions:>8}"]
+        for mode, width in (("indexed", 11), ("walk", 9)):
+            ms = [s * 1000 for s in samples[mode]]
+            row.append(f"{statistics.median(ms):>{width}.1f}  {percentile(ms, 95):>7.1f}")
+        print("  ".join(row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark CommandValidator on large pipe chains, wrapped commands and
+heredocs to confirm validation cost stays linear in command length.
+
+Usage:
+    python3 bench_shell_lexer.py [--repeat N]
+"""
+import argparse
+from pathlib import Path
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from hook_utils import CommandValidator, ShellLexer
+
+SIZES = (1_000, 4_000, 16_000, 64_000)
+
+
+class StaticSettings:
+    def get_bash_patterns(self):
+        return ["grep:*", "cat:*", "head:*", "git status:*"]
+
+
+def pipe_chain(size: int) -> str:
+    unit = "grep 'foo | bar' \"x;y\" | "
+    return (unit * (size // len(unit) + 1))[:size] + "head"
+
+
+def wrapped_chain(size: int) -> str:
+    unit = "grep foo | "
+    return "bash -c '" + (unit * (size // len(unit) + 1))[:size] + "head'"
+
+
+def heredoc(size: int) -> str:
+    body = ("line with 'quotes' and | pipes\n" * (size // 32 + 1))[:size]
+    return f"cat <<'EOF'\n{body}\nEOF"
+
+
+def time_ms(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    validator = CommandValidator(settings_reader=StaticSettings())
+    lexer = ShellLexer()
+
+    print(f"{'case':<10} {'chars':>8} {'lex ms':>9} {'validate ms':>12} {'us/char':>8}")
+    for name, build in (("pipe", pipe_chain), ("wrapped", wrapped_chain), ("heredoc", heredoc)):
+        for size in SIZES:
+            command = build(size)
+            lex_ms = time_ms(lambda: lexer.lex(command), args.repeat)
+            validate_ms = time_ms(lambda: validator.validate(command), args.repeat)
+            per_char = validate_ms * 1000 / len(command)
+            print(f"{name:<10} {len(command):>8} {lex_ms:>9.2f} {validate_ms:>12.2f} {per_char:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark statusline.py against statusline.sh.
+
+Renders both for the same input in a throwaway HOME with an indexed
+transcript and a fresh usage cache (so neither touches the network), and
+reports p50/p95 wall time per render and the number of processes each
+render starts (counted with strace when available).
+
+Usage:
+    python3 bench_statusline.py [--repeat N]
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HOOKS_DIR = os.path.dirname(os.path.abspath(__file__))
+RENDERERS = {
+    "statusline.sh": ["bash", os.path.join(os.path.dirname(HOOKS_DIR), "statusline.sh")],
+    "statusline.py": [sys.executable, os.path.join(HOOKS_DIR, "statusline.py")],
+}
+SESSION_ID = "7f0c2a4e-1b3d-4e5f-8a9b-0c1d2e3f4a5b"
+
+
+def make_home(home: str) -> tuple[str, dict]:
+    """Lay out home like an installed ~/.claude. Returns (payload, env)."""
+    hooks = os.path.join(home, ".claude", "hooks")
+    os.makedirs(hooks)
+    for name in ("hook_utils.py", "session_index.py", "transcript_index.py"):
+        shutil.copy(os.path.join(HOOKS_DIR, name), hooks)
+    project = os.path.join(home, ".claude", "projects", "-src-app")
+    os.makedirs(project)
+    with open(os.path.join(project, f"{SESSION_ID}.jsonl"), "w") as f:
+        for n in range(200):
+            f.write(json.dumps({"type": "assistant", "message": {
+                "usage": {"input_tokens": 1200, "cache_read_input_tokens": 400 * n},
+                "content": [{"type": "text", "text": f"step {n}"}],
+            }}) + "\n")
+    usage_cache = os.path.join(home, "tmp", "usage.json")
+    os.makedirs(os.path.dirname(usage_cache))
+    with open(usage_cache, "w") as f:
+        json.dump({
+            "five_hour": {"utilization": 41.0, "resets_at": "2026-01-02T15:00:00+00:00"},
+            "seven_day": {"utilization": 63.0, "resets_at": "2026-01-05T09:30:00+00:00"},
+        }, f)
+    payload = json.dumps({
+        "session_id": SESSION_ID,
+        "model": {"display_name": "Opus"},
+        "workspace": {"current_dir": os.path.join(home, "src")},
+        "version": "2.0.14",
+    })
+    return payload, {**os.environ, "HOME": home, "CLAUDE_USAGE_CACHE": usage_cache}
+
+
+def render(command: list[str], payload: str, env: dict, home: str) -> float:
+    start = time.perf_counter()
+    subprocess.run(command, input=payload.encode(), stdout=subprocess.DEVNULL,
+                   stderr=subprocess.DEVNULL, cwd=home, env=env)
+    return time.perf_counter() - start
+
+
+def count_processes(command: list[str], payload: str, env: dict, home: str) -> int | None:
+    """Processes started by one render (execve calls), or None without strace."""
+    strace = shutil.which("strace")
+    if not strace:
+        return None
+    with tempfile.NamedTemporaryFile("r") as log:
+        subprocess.run([strace, "-f", "-qq", "-e", "trace=execve", "-o", log.name, *command],
+                       input=payload.encode(), capture_output=True, cwd=home, env=env)
+        return sum(1 for line in log if re.search(r"execve\(.*\) = 0", line))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    print(f"{'renderer':<14} {'p50 ms':>8} {'p95 ms':>8} {'processes':>10}")
+    with tempfile.TemporaryDirectory() as home:
+        payload, env = make_home(home)
+        for name, command in RENDERERS.items():
+            # Warm the transcript sidecar, session entry and bytecode caches
+            render(command, payload, env, home)
+            ms = sorted(render(command, payload, env, home) * 1000 for _ in range(args.repeat))
+            p95 = ms[min(len(ms) - 1, int(len(ms) * 0.95))]
+            processes = count_processes(command, payload, env, home)
+            print(f"{name:<14} {statistics.median(ms):>8.1f} {p95:>8.1f} "
+                  f"{'n/a' if processes is None else processes:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,13 +10,13 @@ Safe alternatives:
   - pct shutdown: Sends shutdown signal, allows graceful termination
   - qm shutdown: Sends ACPI shutdown, allows graceful termination
 """
-from pathlib import Path
+import os
 import re
 import sys
 
-sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from hook_utils import parse_hook_input, deny, pass_through
+from hook_utils import HookInput, run_policies
 
 
 DANGEROUS_PATTERNS = [
@@ -44,24 +44,20 @@ def check_dangerous_command(command: str) -> tuple[bool, str]:
     return False, ""
 
 
-def main():
-    hook = parse_hook_input()
-    if not hook:
-        pass_through()
+def check(hook: HookInput) -> str | None:
+    """Return a denial reason for a forceful stop/shutdown command."""
+    if not hook.is_pre_tool_use or hook.tool_name != "Bash":
+        return None
 
-    if not hook.is_pre_tool_use:
-        pass_through()
+    dangerous, suggestion = check_dangerous_command(hook.get_input("command"))
+    if dangerous:
+        return f"Blocked: Forceful stop can corrupt data. {suggestion}"
 
-    if hook.tool_name != "Bash":
-        pass_through()
+    return None
 
-    command = hook.get_input("command")
-    dangerous, suggestion = check_dangerous_command(command)
 
-    if dangerous:
-        deny(f"Blocked: Forceful stop can corrupt data. {suggestion}")
-
-    pass_through()
+def main():
+    run_policies(check)
 
 
 if __name__ == "__main__":
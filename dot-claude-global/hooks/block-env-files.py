@@ -4,14 +4,13 @@ PreToolUse hook to block read/write/edit operations on sensitive files.
 Catches both file tools (Read, Write, Edit) and Bash commands.
 """
 
-from pathlib import Path
 import os
 import re
 import sys
 
-sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from hook_utils import parse_hook_input, deny, pass_through, resolve_path
+from hook_utils import HookInput, RuleSet, run_policies, resolve_path
 
 
 # =============================================================================
@@ -117,15 +116,15 @@ SAFE_PATTERNS = [
 # Only applies to file tools (Read/Write/Edit/Glob/Grep). Bash patterns stay
 # conservative across the board.
 ALLOWED_ENV_DIRS = [
-    str(Path.home() / "Documents/github/local-network"),
+    os.path.expanduser("~/Documents/github/local-network"),
 ]
 
 
-def path_in_allowed_env_dir(path: str) -> bool:
+def path_in_allowed_env_dir(path: str, resolved: str | None = None) -> bool:
     """True if the path resolves to somewhere inside an allowed-env directory."""
     if not path:
         return False
-    resolved = resolve_path(path) or path
+    resolved = resolved or resolve_path(path) or path
     abs_path = os.path.abspath(os.path.normpath(resolved))
     for allowed in ALLOWED_ENV_DIRS:
         allowed_abs = os.path.abspath(allowed)
@@ -213,6 +212,8 @@ SENSITIVE_BASENAMES = [
     r"\.token$",  # token files but not tokenizer.py etc
 ]
 
+_SENSITIVE_BASENAME_RE = "(?:" + "|".join(SENSITIVE_BASENAMES) + ")"
+
 BASH_SENSITIVE_PATTERNS = [
     # Source/eval .env
     r"source\s+[^\s]*\.env\b",
@@ -220,17 +221,25 @@ BASH_SENSITIVE_PATTERNS = [
     r"eval\s+.*\.env\b",
     r"export\s+.*\.env\b",
     # File copy/link to sensitive files (bypass attempts)
-    r"\bcp\s+[^\s]*(" + "|".join(SENSITIVE_BASENAMES) + r")",
-    r"\bln\s+[^\s]*(" + "|".join(SENSITIVE_BASENAMES) + r")",
-    r"\bmv\s+[^\s]*(" + "|".join(SENSITIVE_BASENAMES) + r")",
+    r"\bcp\s+[^\s]*" + _SENSITIVE_BASENAME_RE,
+    r"\bln\s+[^\s]*" + _SENSITIVE_BASENAME_RE,
+    r"\bmv\s+[^\s]*" + _SENSITIVE_BASENAME_RE,
 ]
 
-# Build patterns for each file-reading command + sensitive basename
+# One pattern per file-reading command: cmd ... basename on the same line
+# (with optional flags/paths in between). Using [^|;\n] to avoid matching
+# across newlines in heredoc commit messages.
 for cmd in FILE_READ_COMMANDS:
-    for basename in SENSITIVE_BASENAMES:
-        # Match: cmd ... basename on the same line (with optional flags/paths in between)
-        # Using [^|;\n] to avoid matching across newlines in heredoc commit messages
-        BASH_SENSITIVE_PATTERNS.append(rf"\b{cmd}\b[^|;\n]*{basename}")
+    BASH_SENSITIVE_PATTERNS.append(rf"\b{cmd}\b[^|;\n]*{_SENSITIVE_BASENAME_RE}")
+
+
+# =============================================================================
+# Rule Sets (compiled once per process; the daemon keeps them warm)
+# =============================================================================
+
+SAFE_RULES = RuleSet.from_patterns(SAFE_PATTERNS, re.IGNORECASE)
+SENSITIVE_FILE_RULES = RuleSet.from_patterns(SENSITIVE_FILE_PATTERNS, re.IGNORECASE)
+BASH_SENSITIVE_RULES = RuleSet.from_patterns(BASH_SENSITIVE_PATTERNS, re.IGNORECASE)
 
 
 # =============================================================================
@@ -238,42 +247,45 @@ for cmd in FILE_READ_COMMANDS:
 # =============================================================================
 
 
-def is_sensitive_file(path: str) -> bool:
-    """Check if a path refers to a sensitive file."""
+def sensitive_file_rule(path: str) -> str | None:
+    """Return the rule that marks path as sensitive, or None if it's allowed."""
     if not path:
-        return False
+        return None
 
     # Allow safe template files
-    for pattern in SAFE_PATTERNS:
-        if re.search(pattern, path, re.IGNORECASE):
-            return False
+    if SAFE_RULES.search(path):
+        return None
+
+    resolved = resolve_path(path) or path
 
     # Allow .env access inside user-trusted project directories
-    if path_in_allowed_env_dir(path):
-        return False
+    if path_in_allowed_env_dir(path, resolved):
+        return None
 
-    # Check all path variants
-    resolved = resolve_path(path) or path
-    normalized = os.path.normpath(path)
+    # Check all path variants (usually fewer than three are distinct)
+    for check_path in dict.fromkeys((path, os.path.normpath(path), resolved)):
+        rule = SENSITIVE_FILE_RULES.search(check_path)
+        if rule:
+            return rule
 
-    for check_path in [path, normalized, resolved]:
-        for pattern in SENSITIVE_FILE_PATTERNS:
-            if re.search(pattern, check_path, re.IGNORECASE):
-                return True
+    return None
 
-    return False
 
+def is_sensitive_file(path: str) -> bool:
+    """Check if a path refers to a sensitive file."""
+    return sensitive_file_rule(path) is not None
 
-def is_sensitive_bash(command: str) -> bool:
-    """Check if a bash command accesses sensitive files."""
+
+def sensitive_bash_rule(command: str) -> str | None:
+    """Return the rule a bash command trips, or None."""
     if not command:
-        return False
+        return None
+    return BASH_SENSITIVE_RULES.search(command)
 
-    for pattern in BASH_SENSITIVE_PATTERNS:
-        if re.search(pattern, command, re.IGNORECASE):
-            return True
 
-    return False
+def is_sensitive_bash(command: str) -> bool:
+    """Check if a bash command accesses sensitive files."""
+    return sensitive_bash_rule(command) is not None
 
 
 # =============================================================================
@@ -281,43 +293,44 @@ def is_sensitive_bash(command: str) -> bool:
 # =============================================================================
 
 
-def main():
-    hook = parse_hook_input()
-    if not hook:
-        pass_through()
-
+def check(hook: HookInput) -> str | None:
+    """Return a denial reason if the tool call touches a sensitive file."""
     if not hook.is_pre_tool_use:
-        pass_through()
+        return None
 
     # Check file-based tools
     if hook.tool_name in ("Read", "Write", "Edit"):
         path = hook.get_input("file_path")
         if is_sensitive_file(path):
-            deny(f"{DENY_MSG}\n\nFile: {os.path.basename(path)}")
+            return f"{DENY_MSG}\n\nFile: {os.path.basename(path)}"
 
     elif hook.tool_name == "Glob":
         pattern = hook.get_input("pattern")
         if is_sensitive_file(pattern):
-            deny(f"{DENY_MSG}\n\nPattern: {pattern}")
+            return f"{DENY_MSG}\n\nPattern: {pattern}"
 
     elif hook.tool_name == "Grep":
         path = hook.get_input("path")
         if is_sensitive_file(path):
-            deny(f"{DENY_MSG}\n\nPath: {path}")
+            return f"{DENY_MSG}\n\nPath: {path}"
 
     elif hook.tool_name == "Bash":
         command = hook.get_input("command")
         if is_sensitive_bash(command):
             # Detect if this is a git commit and provide tailored guidance
             if command and re.match(r"^\s*git\s+commit\b", command):
-                deny(
+                return (
                     f"{DENY_MSG}\n\nCommand blocked.\n\n"
                     "If you are writing a commit message, use '.environment' "
                     "instead of '.env' to avoid triggering this block."
                 )
-            deny(f"{DENY_MSG}\n\nCommand blocked.")
+            return f"{DENY_MSG}\n\nCommand blocked."
 
-    pass_through()
+    return None
+
+
+def main():
+    run_policies(check)
 
 
 if __name__ == "__main__":
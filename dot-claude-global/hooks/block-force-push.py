@@ -9,13 +9,13 @@ Blocks:
 Safe alternative:
   - git push --force-with-lease: Only force pushes if remote hasn't changed
 """
-from pathlib import Path
+import os
 import re
 import sys
 
-sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from hook_utils import parse_hook_input, deny, pass_through
+from hook_utils import HookInput, run_policies
 
 
 def is_dangerous_force_push(command: str) -> bool:
@@ -44,27 +44,23 @@ def is_dangerous_force_push(command: str) -> bool:
     return False
 
 
-def main():
-    hook = parse_hook_input()
-    if not hook:
-        pass_through()
-
-    if not hook.is_pre_tool_use:
-        pass_through()
-
-    if hook.tool_name != "Bash":
-        pass_through()
-
-    command = hook.get_input("command")
+def check(hook: HookInput) -> str | None:
+    """Return a denial reason for a Bash force push."""
+    if not hook.is_pre_tool_use or hook.tool_name != "Bash":
+        return None
 
-    if is_dangerous_force_push(command):
-        deny(
+    if is_dangerous_force_push(hook.get_input("command")):
+        return (
             "Blocked: 'git push --force' can overwrite others' work. "
             "Use 'git push --force-with-lease' instead - it only force pushes "
             "if the remote branch hasn't been updated by someone else."
         )
 
-    pass_through()
+    return None
+
+
+def main():
+    run_policies(check)
 
 
 if __name__ == "__main__":
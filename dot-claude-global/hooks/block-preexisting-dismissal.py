@@ -3,7 +3,8 @@
 Stop hook: block Claude from stopping when its response dismisses errors
 as "pre-existing" without fixing or flagging them.
 
-Reads the session transcript to find the last assistant message and checks
+Reads the last assistant message from the session transcript's index
+(see transcript_index.py, which decodes only newly appended lines) and checks
 for the word "pre-existing" (or "preexisting"). If found, blocks the stop
 and quotes each offending sentence back to Claude with the trigger phrase
 highlighted, so Claude can see exactly what was flagged.
@@ -16,6 +17,10 @@ import json
 import os
 import sys
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import transcript_index
+
 NEEDLES = ("pre-existing", "preexisting")
 SENTENCE_DELIMS = (". ", "! ", "? ", "\n")
 MAX_QUOTES = 5
@@ -35,51 +40,6 @@ BLOCK_TRAILER = (
 )
 
 
-def tail_bytes(filepath, nbytes=262144):
-    """Read the last nbytes of a file and return as lines."""
-    try:
-        with open(filepath, "rb") as f:
-            f.seek(0, 2)
-            size = f.tell()
-            chunk = min(size, nbytes)
-            f.seek(size - chunk)
-            data = f.read().decode("utf-8", errors="replace")
-            return data.splitlines()
-    except (OSError, ValueError):
-        return []
-
-
-def find_last_assistant_message(lines):
-    """
-    Walk backwards through JSONL lines to find the last assistant message
-    with string content.
-    """
-    for raw_line in reversed(lines):
-        try:
-            entry = json.loads(raw_line)
-        except (json.JSONDecodeError, ValueError):
-            continue
-
-        if entry.get("type") != "assistant":
-            continue
-
-        msg = entry.get("message", "")
-        if isinstance(msg, dict):
-            content = msg.get("content", "")
-            if isinstance(content, list):
-                parts = []
-                for block in content:
-                    if isinstance(block, dict) and block.get("type") == "text":
-                        parts.append(block.get("text", ""))
-                msg = " ".join(parts)
-            else:
-                msg = content
-        if isinstance(msg, str) and msg.strip():
-            return msg
-
-    return None
-
-
 def find_code_ranges(text):
     """Return (start, end) ranges covering inline and fenced backtick code spans.
 
@@ -218,8 +178,7 @@ def main():
     if not transcript or not os.path.isfile(transcript):
         return
 
-    lines = tail_bytes(transcript)
-    message = find_last_assistant_message(lines)
+    message = transcript_index.load(transcript).state["last_assistant_text"]
     if not message:
         return
 
@@ -232,4 +191,6 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    from hook_trace import run_traced
+
+    run_traced(main, __file__, "Stop")
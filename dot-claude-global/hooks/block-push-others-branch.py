@@ -6,28 +6,117 @@ When Claude runs `git push`, this hook checks whether the current branch
 has existing commits on the remote authored by other GitHub users. If the
 current user has no commits on the remote branch, the push is blocked
 with a suggestion to create a separate branch and open a PR instead.
+
+The GitHub login, each remote's default branch and the commit authors of
+each (remote, branch, remote head sha, default branch) are cached in
+~/.claude/cache/push-ownership.json, and the network calls that are still
+needed run concurrently. A repeat push to an unchanged branch costs one
+`git ls-remote`.
 """
 
-from pathlib import Path
+import json
+import os
 import re
-import subprocess
 import sys
+import time
 
-sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from hook_utils import parse_hook_input, deny, pass_through
+from hook_utils import HookInput, SettingsCache, run_policies, write_atomic
 
 
 SHARED_BRANCHES = {"main", "master", "develop", "staging", "production", "release"}
 
+# Shared budget for the network calls, which run concurrently
+NETWORK_TIMEOUT = 15
+
+
+# =============================================================================
+# Ownership Cache (Single Responsibility: Remember slow git/GitHub answers)
+# =============================================================================
+
+class OwnershipCache:
+    """
+    On-disk cache of the GitHub lookups behind the ownership check.
+
+    Three sections, each with its own TTL:
+        login           the gh user, keyed by gh's auth state so a
+                        `gh auth switch` or token change invalidates it
+        default_branch  per remote URL
+        authors         commit authors per (remote, branch, remote head sha,
+                        default branch); a new push to the remote changes
+                        the sha, so the entry is only ever reused for an
+                        unchanged branch
+
+    Only successful lookups are stored, so a network failure is never
+    remembered as an answer. Unreadable or mismatched files read as empty.
+    """
+
+    VERSION = 1
+    TTL_SECONDS = {
+        "login": 7 * 24 * 3600,
+        "default_branch": 24 * 3600,
+        "authors": 24 * 3600,
+    }
+    MAX_AUTHOR_ENTRIES = 200
+
+    def __init__(self, path: str | None = None):
+        self._path = path or os.path.join(SettingsCache.DEFAULT_DIR, "push-ownership.json")
+        self._state = self._load()
+        self._dirty = False
+
+    def _load(self) -> dict:
+        try:
+            with open(self._path) as f:
+                state = json.load(f)
+            if state.get("version") == self.VERSION:
+                return state
+        except (OSError, ValueError, AttributeError):
+            pass
+        return {"version": self.VERSION}
+
+    def get(self, section: str, key: str):
+        """Return the cached value, or None if missing or expired."""
+        entry = self._state.get(section, {}).get(key)
+        if not isinstance(entry, dict):
+            return None
+        if time.time() - entry.get("ts", 0) > self.TTL_SECONDS[section]:
+            return None
+        return entry.get("value")
+
+    def put(self, section: str, key: str, value) -> None:
+        entries = self._state.setdefault(section, {})
+        entries[key] = {"value": value, "ts": time.time()}
+        if section == "authors" and len(entries) > self.MAX_AUTHOR_ENTRIES:
+            oldest = sorted(entries, key=lambda k: entries[k].get("ts", 0))
+            for stale in oldest[:len(entries) - self.MAX_AUTHOR_ENTRIES]:
+                del entries[stale]
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write back if anything changed. Failures are ignored."""
+        if self._dirty:
+            write_atomic(self._path, json.dumps(self._state).encode())
+            self._dirty = False
+
+
+def gh_auth_key() -> str:
+    """Fingerprint of gh's auth state: token env vars and the hosts file."""
+    import hashlib
+
+    config_dir = os.environ.get("GH_CONFIG_DIR") or os.path.expanduser("~/.config/gh")
+    parts = [os.environ.get(name, "") for name in ("GH_TOKEN", "GITHUB_TOKEN", "GH_HOST")]
+    parts.append(repr(SettingsCache.make_key([os.path.join(config_dir, "hosts.yml")])))
+    return hashlib.sha1("\0".join(parts).encode()).hexdigest()
+
+
+# =============================================================================
+# Commands (Single Responsibility: Run git/gh with a timeout)
+# =============================================================================
 
 def run(cmd: list[str], timeout: int = 15) -> str:
     """Run a command and return stdout, or empty string on failure."""
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
-        return result.stdout.strip() if result.returncode == 0 else ""
-    except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
-        return ""
+    return run_checked(cmd, timeout)[1]
 
 
 def run_checked(cmd: list[str], timeout: int = 15) -> tuple[bool, str]:
@@ -35,86 +124,157 @@ def run_checked(cmd: list[str], timeout: int = 15) -> tuple[bool, str]:
 
     Returns (True, stdout) on success, (False, "") on failure.
     """
+    return collect(start(cmd), time.monotonic() + timeout)
+
+
+def start(cmd: list[str]):
+    """Start a command in the background; returns None if it can't be spawned."""
+    # Imported here: most calls are not `git push` and never get this far
+    import subprocess
+
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
-        if result.returncode == 0:
-            return True, result.stdout.strip()
+        return subprocess.Popen(
+            cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL, text=True,
+        )
+    except OSError:
+        return None
+
+
+def collect(proc, deadline: float) -> tuple[bool, str]:
+    """Wait for a started command until deadline (time.monotonic()).
+
+    Returns (True, stdout) on success, (False, "") on failure or timeout.
+    """
+    import subprocess
+
+    if proc is None:
         return False, ""
-    except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+    try:
+        stdout, _ = proc.communicate(timeout=max(0.0, deadline - time.monotonic()))
+    except subprocess.TimeoutExpired:
+        stop(proc)
         return False, ""
+    if proc.returncode == 0:
+        return True, stdout.strip()
+    return False, ""
 
 
-def main():
-    hook = parse_hook_input()
-    if not hook:
-        pass_through()
+def stop(proc) -> None:
+    """Kill a started command whose answer is no longer needed."""
+    if proc is not None and proc.poll() is None:
+        proc.kill()
+        proc.communicate()
+
+
+# =============================================================================
+# Ownership Check (Single Responsibility: Decide whether the push is ours)
+# =============================================================================
+
+def verify_failed(branch: str, what: str) -> str:
+    return (
+        f"Cannot verify branch ownership for '{branch}': "
+        f"failed to {what} (gh api error). "
+        f"This may be a transient network issue — retry the push."
+    )
 
-    if not hook.is_pre_tool_use:
-        pass_through()
 
-    if hook.tool_name != "Bash":
-        pass_through()
+def check(hook: HookInput) -> str | None:
+    """Return a denial reason when pushing to a branch owned by someone else."""
+    if not hook.is_pre_tool_use or hook.tool_name != "Bash":
+        return None
 
     command = hook.get_input("command")
     if not re.search(r"\bgit\s+push\b", command):
-        pass_through()
+        return None
 
+    # The remote URL keys the caches; look it up alongside the branch
+    remote_proc = start(["git", "remote", "get-url", "origin"])
     branch = run(["git", "symbolic-ref", "--short", "HEAD"])
     if not branch or branch in SHARED_BRANCHES:
-        pass_through()
-
-    # New branch (not on remote yet) is safe to push.
-    # Fail open here: if the remote is unreachable, the push itself will also fail.
-    if not run(["git", "ls-remote", "--heads", "origin", branch]):
-        pass_through()
-
-    # From here the remote branch exists, so we must verify ownership.
-    # Fail closed on gh API errors — a transient network glitch should not
-    # silently bypass the check.
-
-    ok, gh_user = run_checked(["gh", "api", "user", "-q", ".login"])
-    if not ok:
-        deny(
-            f"Cannot verify branch ownership for '{branch}': "
-            f"failed to determine your GitHub username (gh api error). "
-            f"This may be a transient network issue — retry the push."
-        )
-    if not gh_user:
-        pass_through()
+        stop(remote_proc)
+        return None
 
-    default_branch = (
-        run(["gh", "api", "repos/{owner}/{repo}", "-q", ".default_branch"]) or "main"
-    )
+    cache = OwnershipCache()
+    auth_key = gh_auth_key()
+    gh_user = cache.get("login", auth_key)
 
-    ok, authors_raw = run_checked(
-        [
-            "gh",
-            "api",
-            f"repos/{{owner}}/{{repo}}/compare/{default_branch}...{branch}",
-            "-q",
-            ".commits[] | (.author.login // .committer.login // empty)",
-        ]
-    )
-    if not ok:
-        deny(
-            f"Cannot verify branch ownership for '{branch}': "
-            f"failed to fetch commit authors (gh api error). "
-            f"This may be a transient network issue — retry the push."
-        )
-    if not authors_raw:
-        pass_through()  # No divergent commits, can't determine ownership
+    # ls-remote and any uncached gh lookups run side by side
+    deadline = time.monotonic() + NETWORK_TIMEOUT
+    ls_remote = start(["git", "ls-remote", "--heads", "origin", branch])
+    user_proc = None if gh_user else start(["gh", "api", "user", "-q", ".login"])
+    default_proc = None
+
+    try:
+        remote = collect(remote_proc, deadline)[1] or os.getcwd()
+        default_branch = cache.get("default_branch", remote)
+        if not default_branch:
+            default_proc = start(["gh", "api", "repos/{owner}/{repo}", "-q", ".default_branch"])
+
+        # New branch (not on remote yet) is safe to push.
+        # Fail open here: if the remote is unreachable, the push itself will also fail.
+        ok, heads = collect(ls_remote, deadline)
+        if not ok or not heads:
+            return None
+        head_sha = heads.split()[0]
 
-    authors = {a for a in authors_raw.splitlines() if a}
+        # From here the remote branch exists, so we must verify ownership.
+        # Fail closed on gh API errors — a transient network glitch should not
+        # silently bypass the check.
+        if not gh_user:
+            ok, gh_user = collect(user_proc, deadline)
+            if not ok:
+                return verify_failed(branch, "determine your GitHub username")
+            if not gh_user:
+                return None
+            cache.put("login", auth_key, gh_user)
+
+        if not default_branch:
+            ok, default_branch = collect(default_proc, deadline)
+            if ok and default_branch:
+                cache.put("default_branch", remote, default_branch)
+            else:
+                default_branch = "main"
+
+        # The authors are those of default_branch...branch, so a changed
+        # default branch needs a fresh lookup too
+        authors_key = "\0".join((remote, branch, head_sha, default_branch))
+        authors = cache.get("authors", authors_key)
+        if authors is None:
+            ok, authors_raw = run_checked(
+                [
+                    "gh",
+                    "api",
+                    f"repos/{{owner}}/{{repo}}/compare/{default_branch}...{branch}",
+                    "-q",
+                    ".commits[] | (.author.login // .committer.login // empty)",
+                ],
+                timeout=max(0.0, deadline - time.monotonic()),
+            )
+            if not ok:
+                return verify_failed(branch, "fetch commit authors")
+            authors = sorted({a for a in authors_raw.splitlines() if a})
+            cache.put("authors", authors_key, authors)
+    finally:
+        for proc in (remote_proc, ls_remote, user_proc, default_proc):
+            stop(proc)
+        cache.save()
+
+    # No divergent commits means ownership can't be determined
     if not authors or gh_user in authors:
-        pass_through()
+        return None
 
-    author_list = ", ".join(sorted(authors))
-    deny(
+    author_list = ", ".join(authors)
+    return (
         f"Blocked: Branch '{branch}' belongs to {author_list}. "
         f"You ({gh_user}) have no commits on this remote branch. "
         f"Create your own branch and open a PR to '{branch}' instead."
     )
 
 
+def main():
+    run_policies(check)
+
+
 if __name__ == "__main__":
     main()
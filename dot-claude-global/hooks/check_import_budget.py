@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Check that every hook stays within its import-time budget.
+
+Runs each hook under `python -X importtime` with a payload it ignores
+(an unrelated tool and event), so the measurement covers exactly what a
+hook pays before its first cheap check can exit. Reports the summed
+cumulative time of the top-level imports the hook adds on top of a bare
+interpreter, and fails if it exceeds the hook's budget or if the early-exit
+path pulls in a module that should only load on demand.
+
+Run locally after touching hook imports:
+    python3 check_import_budget.py [--runs N] [--scale X]
+
+--scale multiplies every budget, for slower machines.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+HOOKS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_BUDGET_MS = 30.0
+BUDGET_MS = {
+    # Always goes on to spawn formatters and linters; imports are noise
+    "post-edit-lint.py": 50.0,
+}
+
+# Modules that must not load before a hook's cheap checks
+LAZY_MODULES = frozenset({"dataclasses", "hook_validation", "pathlib", "subprocess"})
+LAZY_EXEMPT = {
+    "post-edit-lint.py": frozenset({"subprocess"}),
+}
+
+# Files that are not hook entry points
+NON_HOOK_FILES = frozenset({"hook-client.py"})
+
+IGNORED_PAYLOAD = json.dumps({
+    "tool_name": "ImportBudgetProbe",
+    "hook_event_name": "ImportBudgetProbe",
+    "tool_input": {},
+})
+
+
+def hook_files() -> list[str]:
+    return sorted(
+        name for name in os.listdir(HOOKS_DIR)
+        if name.endswith(".py") and "-" in name and name not in NON_HOOK_FILES
+    )
+
+
+def import_times(args: list[str], payload: str = "", env: dict | None = None) -> dict[str, tuple[int, bool]]:
+    """Map module name -> (cumulative us, is top-level) from -X importtime."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        input=payload, capture_output=True, text=True, cwd=HOOKS_DIR, env=env,
+    )
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, raw_name = line[len("import time:"):].split("|")
+        # Nested imports are indented by two extra spaces per level
+        modules[raw_name.strip()] = (int(cumulative), not raw_name.startswith("  "))
+    return modules
+
+
+def measure(hook: str, runs: int, env: dict) -> tuple[float, set[str]]:
+    """Median added import ms and the set of modules the hook loads."""
+    baseline = set(import_times(["-c", "pass"], env=env))
+    samples = []
+    loaded: set[str] = set()
+    import_times([os.path.join(HOOKS_DIR, hook)], IGNORED_PAYLOAD, env)
+    for _ in range(runs):
+        modules = import_times([os.path.join(HOOKS_DIR, hook)], IGNORED_PAYLOAD, env)
+        added = {name: value for name, value in modules.items() if name not in baseline}
+        samples.append(sum(us for us, top in added.values() if top) / 1000)
+        loaded |= set(added)
+    return statistics.median(samples), loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=1.0)
+    args = parser.parse_args()
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as home:
+        # Isolated HOME so hooks that log or cache don't touch real files.
+        # Bytecode caching on, as for installed hooks: the first run of each
+        # hook warms __pycache__ and later runs measure the cached imports.
+        env = {**os.environ, "HOME": home}
+        env.pop("PYTHONDONTWRITEBYTECODE", None)
+        for hook in hook_files():
+            budget = BUDGET_MS.get(hook, DEFAULT_BUDGET_MS) * args.scale
+            ms, loaded = measure(hook, args.runs, env)
+            eager = sorted((loaded & LAZY_MODULES) - LAZY_EXEMPT.get(hook, frozenset()))
+            ok = ms <= budget and not eager
+            failures += not ok
+            note = f"  loads {', '.join(eager)} before exiting" if eager else ""
+            print(f"{'ok  ' if ok else 'FAIL'} {hook:<32} {ms:6.1f} / {budget:5.1f} ms{note}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
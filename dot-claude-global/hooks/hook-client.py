@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Thin client that forwards a hook invocation to hook_daemon.py.
+
+Usage (in settings.json):
+    ~/.claude/hooks/hook-client.py <hook-script.py>
+
+If a daemon is listening, the hook's stdin payload is sent over the socket
+and the daemon's stdout, stderr and exit code are replayed verbatim. If no
+daemon is running, one is started in the background and this call falls
+back to today's one-shot execution of the hook script, so behaviour never
+depends on the daemon being up.
+
+Set CLAUDE_HOOKD=0 to always run hooks one-shot. Set CLAUDE_HOOK_TRACE to
+record each call's wall time (see hook_trace.py).
+"""
+import os
+import sys
+import time
+
+HOOKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HOOKS_DIR)
+
+import hook_daemon
+import hook_trace
+
+START = time.perf_counter()
+
+
+def run_one_shot(hook_path: str, payload: bytes | None, mode: str = "oneshot") -> None:
+    """Run the hook script directly, exactly as settings.json used to."""
+    trace = hook_trace.trace_path()
+    if payload is None:
+        if not trace:
+            # stdin is untouched, so the hook can read it directly
+            os.execv(sys.executable, [sys.executable, hook_path])
+        payload = sys.stdin.buffer.read()
+
+    import subprocess
+
+    proc = subprocess.run([sys.executable, hook_path], input=payload)
+    if trace:
+        record_trace(trace, hook_path, payload, mode, proc.returncode)
+    sys.exit(proc.returncode)
+
+
+def record_trace(trace: str, hook_path: str, payload: bytes, mode: str,
+                 exit_code: int, hook_ms: float | None = None) -> None:
+    """Append this call's timing to the trace file."""
+    record = {
+        "hook": os.path.basename(hook_path),
+        **hook_trace.payload_fields(payload),
+        "mode": mode,
+        "ms": round((time.perf_counter() - START) * 1000, 3),
+        "exit": exit_code,
+    }
+    if hook_ms is not None:
+        record["hook_ms"] = hook_ms
+    hook_trace.append(trace, record)
+
+
+def main():
+    if len(sys.argv) != 2:
+        print("Usage: hook-client.py <hook-script.py>", file=sys.stderr)
+        sys.exit(1)
+
+    hook_name = os.path.basename(sys.argv[1])
+    hook_path = os.path.join(HOOKS_DIR, hook_name)
+
+    if not hook_daemon.is_enabled():
+        run_one_shot(hook_path, None)
+
+    sock = hook_daemon.connect()
+    if sock is None:
+        hook_daemon.spawn()
+        run_one_shot(hook_path, None)
+
+    payload = sys.stdin.buffer.read()
+    header = {"hook": hook_name, "cwd": os.getcwd(), "env": dict(os.environ)}
+    reply = hook_daemon.request(sock, header, payload)
+    if not reply or "error" in reply:
+        run_one_shot(hook_path, payload, mode="fallback")
+
+    sys.stdout.write(reply.get("stdout", ""))
+    sys.stderr.write(reply.get("stderr", ""))
+    trace = hook_trace.trace_path()
+    if trace:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        record_trace(trace, hook_path, payload, "daemon", reply.get("exit", 0),
+                     reply.get("ms"))
+    sys.exit(reply.get("exit", 0))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Persistent hook server that keeps hook modules imported between tool calls.
+
+Each hook registered in settings.json normally runs as a fresh `python3`
+process, so a single Bash call pays interpreter startup, `hook_utils`
+import and regex compilation five or more times. This daemon imports every
+hook once, then serves requests from `hook-client.py` over a Unix socket.
+
+Each request is handled in a forked child: the child inherits the warm
+modules (copy-on-write), adopts the client's cwd and environment, and runs
+the hook's existing `main()` with stdin/stdout/stderr redirected. Forking
+keeps per-request state (cwd, env, sys.exit) isolated and lets slow hooks
+like block-push-others-branch.py run concurrently with fast ones.
+
+Lifecycle:
+    - Started on demand by hook-client.py when no daemon is listening
+    - Only one instance runs (flock on the socket's lock file)
+    - Exits after IDLE_TIMEOUT seconds without requests
+    - Exits when any loaded hook file changes on disk, so edits to hooks
+      take effect on the next call instead of serving stale code
+
+Protocol (one request per connection):
+    client -> server: JSON header line, then the raw hook stdin payload
+    server -> client: JSON {"exit": int, "stdout": str, "stderr": str,
+                      "ms": float} or {"error": str} when the client must
+                      fall back (ms is the time spent in the hook's main())
+
+Usage:
+    hook_daemon.py serve     Run in the foreground
+    hook_daemon.py stop      Ask a running daemon to exit
+    hook_daemon.py status    Print whether a daemon is listening
+
+Environment:
+    CLAUDE_HOOKD_SOCKET      Override the socket path
+    CLAUDE_HOOKD=0           Disable the daemon (client always runs one-shot)
+"""
+import json
+import os
+import socket
+import sys
+
+HOOKS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SOCKET = os.path.expanduser("~/.claude/run/hookd.sock")
+IDLE_TIMEOUT = 15 * 60
+POLL_INTERVAL = 1.0
+CONNECT_TIMEOUT = 0.5
+
+# Files in HOOKS_DIR that are not hook entry points
+NON_HOOK_FILES = frozenset({"hook-client.py"})
+
+# Shared modules whose changes make the daemon stale
+SHARED_MODULES = ("hook_utils.py", "hook_validation.py", "lint_workers.py")
+
+
+# =============================================================================
+# Protocol Helpers (shared with hook-client.py; keep imports light)
+# =============================================================================
+
+def socket_path() -> str:
+    """Return the daemon socket path, honouring CLAUDE_HOOKD_SOCKET."""
+    return os.environ.get("CLAUDE_HOOKD_SOCKET") or DEFAULT_SOCKET
+
+
+def is_enabled() -> bool:
+    """Check whether the daemon is enabled (CLAUDE_HOOKD=0 disables it)."""
+    return os.environ.get("CLAUDE_HOOKD", "1") != "0"
+
+
+def connect() -> socket.socket | None:
+    """Connect to a running daemon, or return None if none is listening."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+    try:
+        sock.connect(socket_path())
+    except OSError:
+        sock.close()
+        return None
+    # Hooks may legitimately take a while (network calls); the caller's
+    # hook timeout bounds the total wait.
+    sock.settimeout(None)
+    return sock
+
+
+def request(sock: socket.socket, header: dict, payload: bytes) -> dict | None:
+    """Send one request over an open connection and return the decoded reply."""
+    try:
+        with sock:
+            sock.sendall(json.dumps(header).encode() + b"\n" + payload)
+            sock.shutdown(socket.SHUT_WR)
+            reply = _recv_all(sock)
+        return json.loads(reply)
+    except (OSError, ValueError):
+        return None
+
+
+def spawn() -> None:
+    """Start a detached daemon in the background. Errors are ignored."""
+    import subprocess
+
+    try:
+        subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "serve"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+            close_fds=True,
+        )
+    except OSError:
+        pass
+
+
+def _recv_all(sock: socket.socket) -> bytes:
+    chunks = []
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            return b"".join(chunks)
+        chunks.append(chunk)
+
+
+# =============================================================================
+# Hook Registry (imports every hook module once)
+# =============================================================================
+
+class HookRegistry:
+    """Loads hook scripts as modules and tracks their on-disk mtimes."""
+
+    def __init__(self, hooks_dir: str = HOOKS_DIR):
+        self._dir = hooks_dir
+        self._modules: dict = {}
+        self._mtimes: dict[str, float] = {}
+
+    def load_all(self) -> None:
+        """Import every hyphenated hook script that defines main()."""
+        sys.path.insert(0, self._dir)
+        from hook_utils import load_hook_module
+        # Hooks import this lazily; load it once here so children inherit it
+        import hook_validation  # noqa: F401
+
+        for name in SHARED_MODULES:
+            self._mtimes[name] = self._mtime(name)
+        for name in sorted(os.listdir(self._dir)):
+            if not self._is_hook_file(name):
+                continue
+            try:
+                module = load_hook_module(os.path.join(self._dir, name))
+            except Exception:
+                continue
+            if callable(getattr(module, "main", None)):
+                self._modules[name] = module
+                self._mtimes[name] = self._mtime(name)
+
+    def get(self, name: str):
+        """Return the loaded module for a hook file name, or None."""
+        return self._modules.get(name)
+
+    def is_stale(self) -> bool:
+        """True if any loaded file changed since it was imported."""
+        return any(self._mtime(name) != mtime for name, mtime in self._mtimes.items())
+
+    def _is_hook_file(self, name: str) -> bool:
+        return (
+            name.endswith(".py")
+            and "-" in name
+            and not name.startswith("test_")
+            and name not in NON_HOOK_FILES
+        )
+
+    def _mtime(self, name: str) -> float:
+        try:
+            return os.stat(os.path.join(self._dir, name)).st_mtime
+        except OSError:
+            return -1.0
+
+
+# =============================================================================
+# Hook Execution (runs inside the forked child)
+# =============================================================================
+
+def run_hook(module, payload: str, cwd: str, env: dict) -> dict:
+    """
+    Run a hook module's main() as if it were a fresh process.
+
+    Must only be called in a forked child: it replaces the process cwd,
+    environment and standard streams.
+    """
+    import io
+    import time
+    import traceback
+
+    os.chdir(cwd)
+    os.environ.clear()
+    os.environ.update(env)
+
+    stdout, stderr = io.StringIO(), io.StringIO()
+    sys.stdin = io.StringIO(payload)
+    sys.stdout, sys.stderr = stdout, stderr
+
+    exit_code = 0
+    start = time.perf_counter()
+    try:
+        module.main()
+    except SystemExit as e:
+        exit_code = _exit_code(e.code, stderr)
+    except Exception:
+        traceback.print_exc(file=stderr)
+        exit_code = 1
+
+    return {
+        "exit": exit_code,
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+        "ms": round((time.perf_counter() - start) * 1000, 3),
+    }
+
+
+def _exit_code(code, stderr) -> int:
+    """Map a SystemExit code to a process exit status, like the interpreter."""
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=stderr)
+    return 1
+
+
+# =============================================================================
+# Server
+# =============================================================================
+
+def serve() -> None:
+    """Run the daemon in the foreground until idle, stale or stopped."""
+    import fcntl
+    import signal
+    import socketserver
+    import time
+
+    path = socket_path()
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+
+    lock_file = open(path + ".lock", "w")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return  # Another daemon owns the socket
+
+    registry = HookRegistry()
+    registry.load_all()
+
+    class Handler(socketserver.BaseRequestHandler):
+        def handle(self):
+            reply = _handle_request(self.request, registry)
+            try:
+                self.request.sendall(json.dumps(reply).encode())
+            except OSError:
+                pass
+
+    class Server(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+        timeout = POLL_INTERVAL
+        block_on_close = False
+        last_request = time.monotonic()
+        stop_requested = False
+
+        def process_request(self, request, client_address):
+            self.last_request = time.monotonic()
+            super().process_request(request, client_address)
+
+        def should_exit(self) -> bool:
+            """Stop when asked to, when idle too long, or when hooks changed."""
+            if self.stop_requested:
+                return True
+            if time.monotonic() - self.last_request > IDLE_TIMEOUT:
+                return True
+            return registry.is_stale()
+
+    if os.path.exists(path):
+        os.unlink(path)
+    old_umask = os.umask(0o077)
+    try:
+        server = Server(path, Handler)
+    finally:
+        os.umask(old_umask)
+
+    def request_stop(*_):
+        server.stop_requested = True
+
+    signal.signal(signal.SIGTERM, request_stop)
+
+    try:
+        while not server.should_exit():
+            server.handle_request()
+    finally:
+        server.server_close()
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+        lock_file.close()
+
+
+def _handle_request(sock: socket.socket, registry: HookRegistry) -> dict:
+    """Decode one request and run the requested hook."""
+    try:
+        raw = _recv_all(sock)
+        header_raw, _, payload = raw.partition(b"\n")
+        header = json.loads(header_raw)
+    except (OSError, ValueError):
+        return {"error": "malformed request"}
+
+    if header.get("command") == "stop":
+        # Runs in a forked child, so signal the parent to exit
+        import signal
+        os.kill(os.getppid(), signal.SIGTERM)
+        return {"exit": 0, "stdout": "", "stderr": ""}
+
+    if registry.is_stale():
+        return {"error": "stale"}
+
+    module = registry.get(header.get("hook", ""))
+    if module is None:
+        return {"error": "unknown hook"}
+
+    return run_hook(
+        module,
+        payload.decode(errors="replace"),
+        header.get("cwd") or "/",
+        header.get("env") or {},
+    )
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "serve"
+
+    if command == "serve":
+        serve()
+    elif command == "stop":
+        sock = connect()
+        if sock:
+            request(sock, {"command": "stop"}, b"")
+    elif command == "status":
+        sock = connect()
+        print(f"running ({socket_path()})" if sock else "not running")
+        if sock:
+            sock.close()
+    else:
+        print(f"Usage: {os.path.basename(__file__)} [serve|stop|status]", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Opt-in timing trace for hook calls in production.
+
+Set CLAUDE_HOOK_TRACE=1 to append one JSON line per hook call to
+~/.claude/logs/hook-trace.jsonl, or set it to a file path to write there
+instead. Records are written by hook-client.py, which wraps every hook
+registered in settings.json:
+
+    {"ts": 1760000000.1, "hook": "pretool-router.py", "event": "PreToolUse",
+     "tool": "Bash", "mode": "daemon", "ms": 3.1, "hook_ms": 0.4, "exit": 0}
+
+mode is "daemon", "oneshot" (no daemon listening) or "fallback" (daemon
+answered with an error). ms is the client's wall time from main() to exit
+and excludes the client's own interpreter startup; hook_ms is the time
+spent inside the hook's main() when served by the daemon.
+
+Hooks that settings.json runs directly rather than through hook-client.py
+(the Stop and SessionStart hooks, and statusline.py) wrap their main() in
+run_traced() and record mode "direct"; their ms covers main() only, not
+interpreter startup or module imports. encrypt-old-sessions (a shell
+script) and the shell one-liners in settings.json are not traced.
+
+Summarise a trace with: bench_hooks.py --trace [FILE]
+
+Kept import-light (os, json, time) since the client loads it on every call.
+"""
+import json
+import os
+import time
+
+TRACE_ENV = "CLAUDE_HOOK_TRACE"
+DEFAULT_TRACE_FILE = os.path.expanduser("~/.claude/logs/hook-trace.jsonl")
+
+
+def trace_path() -> str | None:
+    """Return the trace file path, or None when tracing is off."""
+    value = os.environ.get(TRACE_ENV, "")
+    if value in ("", "0"):
+        return None
+    if value == "1":
+        return DEFAULT_TRACE_FILE
+    return os.path.expanduser(value)
+
+
+def payload_fields(payload: bytes) -> dict:
+    """Pull the event and tool name out of a hook payload, if it parses."""
+    try:
+        data = json.loads(payload)
+        return {"event": data.get("hook_event_name", ""), "tool": data.get("tool_name", "")}
+    except (ValueError, AttributeError):
+        return {"event": "", "tool": ""}
+
+
+def append(path: str, record: dict) -> None:
+    """
+    Append one record as a JSON line. Lines are well under PIPE_BUF, so
+    O_APPEND keeps concurrent hooks from interleaving. Errors are ignored:
+    tracing must never change a hook's outcome.
+    """
+    line = json.dumps({"ts": round(time.time(), 3), **record}) + "\n"
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        try:
+            os.write(fd, line.encode())
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+
+def run_traced(main, hook_path: str, event: str) -> None:
+    """Run a directly invoked hook's main(), recording its wall time when tracing."""
+    path = trace_path()
+    if path is None:
+        main()
+        return
+    start = time.perf_counter()
+    exit_code = 0
+    try:
+        main()
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else int(e.code is not None)
+        raise
+    except BaseException:
+        exit_code = 1
+        raise
+    finally:
+        append(path, {
+            "hook": os.path.basename(hook_path),
+            "event": event,
+            "tool": "",
+            "mode": "direct",
+            "ms": round((time.perf_counter() - start) * 1000, 3),
+            "exit": exit_code,
+        })
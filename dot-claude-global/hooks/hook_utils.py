@@ -8,6 +8,11 @@ following SOLID principles:
 - Open/Closed: New patterns can be added via configuration
 - Dependency Inversion: High-level validators depend on abstractions
 
+Most hook calls exit after a tool-name or event check, so this module only
+imports json, os, re (already loaded by json), sys and time. The command validation components live in
+hook_validation.py and are loaded on first attribute access; hooks should
+import them inside main() after their cheap checks.
+
 Components:
     Hook Helpers:
         HookInput: Parsed hook input data
@@ -15,40 +20,82 @@ Components:
         approve(): Output approval and exit
         deny(): Output denial and exit
         pass_through(): Exit without decision
+        run_policies(): Evaluate PreToolUse policy checks over one input
+        load_hook_module(): Import a hyphenated hook script as a module
 
     Path Utilities:
         resolve_path(): Resolve path with expansion
         is_path_within(): Check if path is within allowed directories
+        write_atomic(): Replace a cache file atomically
+
+    Rule Sets:
+        RuleSet: Named regex rules matched in one pass
 
-    Command Validation:
+    Settings and Caches:
+        SettingsCache: On-disk cache of compiled Bash allow patterns
         SettingsReader: Reads Bash allow patterns from settings files
+        DecisionCache: LRU of recent approval decisions per settings state
+
+    Command Validation (lazy, from hook_validation):
         PatternMatcher: Matches commands against allow patterns
+        PatternIndex: Precompiled allow patterns for fast lookup
+        ShellLexer: Single-pass tokenizer shared by the checks below
         DangerousPatternChecker: Detects dangerous command patterns
         ChainSplitter: Splits command chains on operators
         WrapperUnwrapper: Unwraps trusted command wrapper patterns
         CommandValidator: Orchestrates full command validation
 """
-from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
-from typing import Optional, Protocol, NoReturn
-import fnmatch
+from __future__ import annotations
+
 import json
 import os
 import re
 import sys
+import time
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, NoReturn, Optional
+
+    from hook_validation import PatternIndex
+
+    # A policy check returns a denial reason, or None to let the call through.
+    PolicyCheck = Callable[[HookInput], Optional[str]]
+
+# Names served lazily from hook_validation (see __getattr__)
+VALIDATION_NAMES = frozenset({
+    "IPatternMatcher", "ISettingsReader", "PatternMatcher", "PatternIndex",
+    "Token", "LexedCommand", "ShellLexer", "DangerousPatternConfig",
+    "DangerousPatternChecker", "ChainSplitter", "WrapperPattern",
+    "WrapperUnwrapper", "ValidationResult", "CommandValidator",
+})
+
+
+def __getattr__(name: str):
+    """Import hook_validation on first use of one of its names (PEP 562)."""
+    if name in VALIDATION_NAMES:
+        import hook_validation
+        return getattr(hook_validation, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # =============================================================================
 # Hook Input/Output Helpers (DRY: Common boilerplate for all hooks)
 # =============================================================================
 
-@dataclass
 class HookInput:
     """Parsed hook input data."""
-    tool_name: str
-    hook_event: str
-    tool_input: dict
-    raw_data: dict
+
+    __slots__ = ("tool_name", "hook_event", "tool_input", "raw_data")
+
+    def __init__(self, tool_name: str, hook_event: str, tool_input: dict, raw_data: dict):
+        self.tool_name = tool_name
+        self.hook_event = hook_event
+        self.tool_input = tool_input
+        self.raw_data = raw_data
+
+    def __repr__(self) -> str:
+        return f"HookInput(tool_name={self.tool_name!r}, hook_event={self.hook_event!r})"
 
     @property
     def is_permission_request(self) -> bool:
@@ -112,6 +159,39 @@ def pass_through() -> NoReturn:
     sys.exit(0)
 
 
+def run_policies(*checks: PolicyCheck) -> NoReturn:
+    """
+    Parse stdin once and run policy checks in order.
+
+    Denies with the first reason returned (later checks are skipped),
+    otherwise passes through.
+    """
+    hook = parse_hook_input()
+    if not hook:
+        pass_through()
+
+    for check in checks:
+        reason = check(hook)
+        if reason:
+            deny(reason)
+
+    pass_through()
+
+
+def load_hook_module(path: str):
+    """
+    Import a hook script by path (hook file names contain hyphens, so they
+    can't be imported normally). The module's main() is not run.
+    """
+    import importlib.util
+
+    name = "hook_" + os.path.basename(path)[:-3].replace("-", "_")
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
 # =============================================================================
 # Path Utilities (DRY: Common path operations)
 # =============================================================================
@@ -155,18 +235,155 @@ def is_path_within(path: str, allowed_dirs: tuple[str, ...]) -> bool:
     )
 
 
+def write_atomic(path: str, data: bytes) -> bool:
+    """
+    Write data to path via a temp file and rename, creating the parent
+    directory (0700) if needed. Readers never see a partial file.
+
+    Returns:
+        True on success; False if the write failed (the old file is kept).
+    """
+    import tempfile
+
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except OSError:
+        return False
+    return True
+
+
 # =============================================================================
-# Protocols (Interfaces for Dependency Inversion)
+# Rule Sets (Single Responsibility: Match many named regexes in one pass)
 # =============================================================================
 
-class IPatternMatcher(Protocol):
-    """Interface for pattern matching."""
-    def matches(self, command: str, pattern: str) -> bool: ...
+class RuleSet:
+    """
+    Named regex rules compiled into a single alternation.
+
+    One search over the combined pattern replaces a loop of re.search calls,
+    and avoids thrashing re's compile cache (512 entries) when a hook has
+    more patterns than that. The alternation uses no capturing groups, which
+    lets re factor shared prefixes; only on a hit are the individual rules
+    tried at the match position to name the one that fired. The verdict is
+    the same as searching each rule separately; when several rules match,
+    the one matching leftmost (then first listed) is reported.
+
+    Compiled on first search, so hooks that exit early never pay for it.
+    """
+
+    def __init__(self, rules: list[tuple[str, str]], flags: int = 0):
+        self.rules = list(rules)
+        self._flags = flags
+        self._regex: Optional[re.Pattern] = None
+        self._rule_regexes: Optional[list[re.Pattern]] = None
+
+    @classmethod
+    def from_patterns(cls, patterns: list[str], flags: int = 0) -> RuleSet:
+        """Rule set where each pattern is its own name."""
+        return cls([(pattern, pattern) for pattern in patterns], flags)
+
+    def search(self, text: str) -> Optional[str]:
+        """Return the name of a rule matching text, or None."""
+        if self._regex is None:
+            self._regex = self._compile()
+        match = self._regex.search(text)
+        if match is None:
+            return None
+        return self._rule_at(text, match.start())
+
+    def _compile(self) -> re.Pattern:
+        return re.compile(
+            "|".join(f"(?:{pattern})" for _, pattern in self.rules), self._flags
+        )
+
+    def _rule_at(self, text: str, pos: int) -> str:
+        """Name of the first rule matching at pos (the alternation's choice)."""
+        if self._rule_regexes is None:
+            self._rule_regexes = [re.compile(p, self._flags) for _, p in self.rules]
+        for (name, _), regex in zip(self.rules, self._rule_regexes):
+            if regex.match(text, pos):
+                return name
+        raise AssertionError("combined pattern matched but no rule did")
+
+
+# =============================================================================
+# Settings Cache (Single Responsibility: Persist compiled patterns on disk)
+# =============================================================================
+
+class SettingsCache:
+    """
+    On-disk cache of the merged Bash patterns and their PatternIndex.
+
+    One file per set of contributing settings files, keyed by each file's
+    (mtime, inode, size), so the common case is a stat per settings file
+    plus one small load instead of re-parsing settings.json. Any change to
+    a contributing file, or a different project settings file being found,
+    produces a different key and a rebuild.
+
+    The cache is pickled: it lives under ~/.claude, the same trust domain
+    as the hook scripts themselves, and is written 0600 in a 0700 dir.
+    """
+
+    VERSION = 2
+    DEFAULT_DIR = os.path.expanduser("~/.claude/cache")
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self._dir = cache_dir or self.DEFAULT_DIR
 
+    @staticmethod
+    def make_key(paths: list[str]) -> tuple:
+        """Stat signature of every contributing file (missing files included)."""
+        key = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+                key.append((path, st.st_mtime_ns, st.st_ino, st.st_size))
+            except OSError:
+                key.append((path, None, None, None))
+        return tuple(key)
 
-class ISettingsReader(Protocol):
-    """Interface for reading settings."""
-    def get_bash_patterns(self) -> list[str]: ...
+    def load(self, key: tuple) -> Optional[tuple[list[str], "PatternIndex"]]:
+        """Return (patterns, index) if a cache entry matches key exactly."""
+        import pickle
+
+        try:
+            with open(self._path_for(key), "rb") as f:
+                entry = pickle.load(f)
+            if entry["version"] == self.VERSION and entry["key"] == key:
+                return entry["patterns"], entry["index"]
+        except (OSError, pickle.PickleError, EOFError, KeyError, TypeError,
+                AttributeError, ValueError):
+            pass
+        return None
+
+    def store(self, key: tuple, patterns: list[str], index: "PatternIndex") -> None:
+        """Atomically write a cache entry. Failures leave the cache untouched."""
+        import pickle
+
+        entry = {"version": self.VERSION, "key": key,
+                 "patterns": patterns, "index": index}
+        try:
+            data = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+        except pickle.PickleError:
+            return
+        write_atomic(self._path_for(key), data)
+
+    def _path_for(self, key: tuple) -> str:
+        """One file per set of contributing paths (not per mtime)."""
+        import hashlib
+
+        paths = "\0".join(entry[0] for entry in key)
+        digest = hashlib.sha1(paths.encode()).hexdigest()[:16]
+        return os.path.join(self._dir, f"bash-patterns-{digest}.pickle")
 
 
 # =============================================================================
@@ -176,22 +393,55 @@ class ISettingsReader(Protocol):
 class SettingsReader:
     """Reads and caches Bash allow patterns from global and project settings."""
 
-    def __init__(self):
+    GLOBAL_SETTINGS = "~/.claude/settings.json"
+
+    def __init__(self, cache: Optional[SettingsCache] = None):
         self._patterns: Optional[list[str]] = None
+        self._index: Optional["PatternIndex"] = None
+        self._sources: Optional[list[str]] = None
+        self._cache = cache or SettingsCache()
 
     def get_bash_patterns(self) -> list[str]:
         """Return list of Bash allow patterns from all settings files."""
-        if self._patterns is not None:
-            return self._patterns
-
-        self._patterns = []
-        self._read_patterns_from(os.path.expanduser("~/.claude/settings.json"))
+        if self._patterns is None:
+            self._load()
+        return self._patterns
 
-        project_settings = self._find_project_settings()
-        if project_settings:
-            self._read_patterns_from(project_settings)
+    def get_pattern_index(self) -> "PatternIndex":
+        """Return the precompiled PatternIndex for get_bash_patterns()."""
+        if self._index is None:
+            self._load()
+        return self._index
+
+    def fingerprint(self) -> tuple:
+        """Stat signature of the settings files the patterns come from."""
+        return self._cache.make_key(self._get_sources())
+
+    def _get_sources(self) -> list[str]:
+        """Global settings plus the nearest project settings, if any."""
+        if self._sources is None:
+            self._sources = [os.path.expanduser(self.GLOBAL_SETTINGS)]
+            project_settings = self._find_project_settings()
+            if project_settings:
+                self._sources.append(project_settings)
+        return self._sources
+
+    def _load(self) -> None:
+        """Load patterns from the on-disk cache, rebuilding it on a miss."""
+        sources = self._get_sources()
+        key = self._cache.make_key(sources)
+        cached = self._cache.load(key)
+        if cached is not None:
+            self._patterns, self._index = cached
+            return
+
+        from hook_validation import PatternIndex
 
-        return self._patterns
+        self._patterns = []
+        for path in sources:
+            self._read_patterns_from(path)
+        self._index = PatternIndex(self._patterns)
+        self._cache.store(key, self._patterns, self._index)
 
     def _find_project_settings(self) -> Optional[str]:
         """Walk up from cwd to find .claude/settings.local.json."""
@@ -224,496 +474,199 @@ class SettingsReader:
 
 
 # =============================================================================
-# Pattern Matcher (Single Responsibility: Match commands against patterns)
-# =============================================================================
-
-class PatternMatcher:
-    """Matches commands against settings.json Bash patterns."""
-
-    def matches(self, command: str, pattern: str) -> bool:
-        """
-        Check if command matches a Bash pattern from settings.json.
-
-        Pattern formats:
-        - "ls:*"           -> matches "ls", "ls -la", "ls /path"
-        - "git status:*"   -> matches "git status", "git status -s"
-        - "npm:--version"  -> matches "npm --version" exactly
-        - "curl:-s :*"     -> matches "curl -s ..." (flag must be present)
-
-        Also handles full paths: "/usr/bin/ls -la" matches "ls:*"
-        """
-        # Try matching with original command first
-        if self._matches_internal(command, pattern):
-            return True
-
-        # Try matching with normalized command (basename of first token)
-        normalized = self._normalize_command(command)
-        if normalized != command:
-            return self._matches_internal(normalized, pattern)
-
-        return False
-
-    def _normalize_command(self, command: str) -> str:
-        """Normalize command by replacing full path with basename."""
-        if not command:
-            return command
-        parts = command.split(None, 1)
-        if not parts:
-            return command
-        first_token = parts[0]
-        if '/' in first_token:
-            basename = os.path.basename(first_token)
-            if len(parts) > 1:
-                return f"{basename} {parts[1]}"
-            return basename
-        return command
-
-    def _matches_internal(self, command: str, pattern: str) -> bool:
-        """Internal matching logic."""
-        if ":" not in pattern:
-            return self._match_bare_command(command, pattern)
-
-        cmd_part, args_pattern = pattern.split(":", 1)
-        return self._match_with_args(command, cmd_part.strip(), args_pattern)
-
-    def _match_bare_command(self, command: str, pattern: str) -> bool:
-        """Match pattern without colon (just command name)."""
-        cmd_base = command.split()[0] if command else ""
-        return cmd_base == pattern
-
-    def _match_with_args(self, command: str, cmd_part: str, args_pattern: str) -> bool:
-        """Match pattern with command:args format."""
-        if command == cmd_part:
-            rest = ""
-        elif command.startswith(cmd_part + " "):
-            rest = command[len(cmd_part):].strip()
-        else:
-            return False
-
-        if args_pattern == "*":
-            return True
-
-        if args_pattern.endswith(":*"):
-            required_prefix = args_pattern[:-2]
-            return rest.startswith(required_prefix)
-
-        if " :*" in args_pattern:
-            required_flag = args_pattern.replace(" :*", "").strip()
-            return required_flag in rest
-
-        if args_pattern.endswith("*"):
-            return fnmatch.fnmatch(rest, args_pattern)
-
-        return rest == args_pattern or rest.startswith(args_pattern + " ")
-
-
-# =============================================================================
-# Dangerous Pattern Checker (Single Responsibility: Detect dangerous patterns)
-# =============================================================================
-
-@dataclass
-class DangerousPatternConfig:
-    """Configuration for dangerous pattern detection."""
-    # Patterns dangerous even inside quotes (command substitution)
-    always_dangerous: tuple[re.Pattern, ...] = field(default_factory=lambda: tuple(
-        re.compile(p) for p in [
-            r'\$\(',           # Command substitution $(...)
-            r'`[^`]*`',        # Backtick command substitution
-        ]
-    ))
-    # Patterns dangerous only when unquoted
-    unquoted_dangerous: tuple[re.Pattern, ...] = field(default_factory=lambda: tuple(
-        re.compile(p) for p in [
-            r'\beval\b',       # eval command
-            r'\bsource\b',     # source command
-            r'^\s*\.',         # . (source) at start
-            # Redirect to absolute path (but allow /dev/null and fd redirects like 2>/dev/null)
-            r'(?<!\d)>\s*/(?!dev/null)',
-            r'(?<!\d)>>\s*/(?!dev/null)',
-            r'<\(',            # Process substitution <(...)
-            r'>\(',            # Process substitution >(...)
-            r'\n',             # Newline (command separator)
-        ]
-    ))
-
-
-class DangerousPatternChecker:
-    """Checks commands for dangerous patterns."""
-
-    def __init__(self, config: Optional[DangerousPatternConfig] = None):
-        self._config = config or DangerousPatternConfig()
-
-    def is_dangerous(self, command: str) -> bool:
-        """Return True if command contains dangerous patterns."""
-        # Always-dangerous patterns apply everywhere
-        if any(p.search(command) for p in self._config.always_dangerous):
-            return True
-
-        # Unquoted-dangerous patterns only apply outside quotes
-        stripped = self._strip_quoted_content(command)
-        return any(p.search(stripped) for p in self._config.unquoted_dangerous)
-
-    def _strip_quoted_content(self, s: str) -> str:
-        """Remove content inside quotes, preserving structure outside."""
-        result = []
-        in_single = False
-        in_double = False
-        i = 0
-
-        while i < len(s):
-            c = s[i]
-
-            if c == '\\' and i + 1 < len(s) and (in_single or in_double):
-                i += 2
-                continue
-
-            if c == "'" and not in_double:
-                in_single = not in_single
-                i += 1
-                continue
-
-            if c == '"' and not in_single:
-                in_double = not in_double
-                i += 1
-                continue
-
-            if not in_single and not in_double:
-                result.append(c)
-            i += 1
-
-        return ''.join(result)
-
-
-# =============================================================================
-# Chain Splitter (Single Responsibility: Split commands on operators)
-# =============================================================================
-
-class ChainSplitter:
-    """Splits shell command chains into individual commands."""
-
-    OPERATORS = ('&&', '||', '|', ';')
-
-    def has_operators(self, command: str) -> bool:
-        """Check if command contains chain operators outside quotes."""
-        stripped = self._strip_quoted_content(command)
-        return any(op in stripped for op in self.OPERATORS)
-
-    def split(self, command: str) -> Optional[list[str]]:
-        """
-        Split command on chain operators, respecting quotes.
-        Returns None if parsing fails (unclosed quotes, etc.)
-        """
-        segments = []
-        current: list[str] = []
-        in_single_quote = False
-        in_double_quote = False
-        i = 0
-
-        while i < len(command):
-            char = command[i]
-
-            # Handle quote toggling
-            if char == "'" and not in_double_quote:
-                in_single_quote = not in_single_quote
-                current.append(char)
-                i += 1
-                continue
-            elif char == '"' and not in_single_quote:
-                in_double_quote = not in_double_quote
-                current.append(char)
-                i += 1
-                continue
-
-            # Handle escapes
-            if char == '\\' and i + 1 < len(command):
-                current.append(char)
-                current.append(command[i + 1])
-                i += 2
-                continue
-
-            # Check for operators only outside quotes
-            if not in_single_quote and not in_double_quote:
-                matched_op = None
-                for op in self.OPERATORS:
-                    if command[i:i+len(op)] == op:
-                        matched_op = op
-                        break
-
-                if matched_op:
-                    segment = ''.join(current).strip()
-                    if segment:
-                        segments.append(segment)
-                    current = []
-                    i += len(matched_op)
-                    continue
-
-            current.append(char)
-            i += 1
-
-        # Append final segment
-        segment = ''.join(current).strip()
-        if segment:
-            segments.append(segment)
-
-        return segments if segments else None
-
-    def _strip_quoted_content(self, s: str) -> str:
-        """Remove content inside quotes for operator detection."""
-        result = []
-        in_single = False
-        in_double = False
-        i = 0
-
-        while i < len(s):
-            c = s[i]
-            if c == '\\' and i + 1 < len(s):
-                i += 2
-                continue
-            if c == "'" and not in_double:
-                in_single = not in_single
-                i += 1
-                continue
-            if c == '"' and not in_single:
-                in_double = not in_double
-                i += 1
-                continue
-            if not in_single and not in_double:
-                result.append(c)
-            i += 1
-
-        return ''.join(result)
-
-
-# =============================================================================
-# Wrapper Unwrapper (Single Responsibility: Unwrap trusted command wrappers)
-# =============================================================================
-
-@dataclass
-class WrapperPattern:
-    """Defines a trusted command wrapper pattern."""
-    name: str
-    regex: re.Pattern
-    inner_group: int = 1  # Capture group containing the inner command
-
-    @classmethod
-    def create(cls, name: str, pattern: str, inner_group: int = 1) -> 'WrapperPattern':
-        """Factory method to create a WrapperPattern."""
-        return cls(name=name, regex=re.compile(pattern), inner_group=inner_group)
-
-
-class WrapperUnwrapper:
-    """Unwraps trusted command wrapper patterns to extract inner commands."""
-
-    # Default trusted wrapper patterns
-    DEFAULT_PATTERNS: tuple[WrapperPattern, ...] = (
-        # Proxmox LXC: sudo pct exec <container_id> -- <command>
-        WrapperPattern.create('proxmox_pct', r'^sudo\s+pct\s+exec\s+(\d+)\s+--\s+(.+)$', 2),
-        # Proxmox VM: sudo qm guest exec <vmid> -- <command>
-        WrapperPattern.create('proxmox_qm', r'^sudo\s+qm\s+guest\s+exec\s+(\d+)\s+--\s+(.+)$', 2),
-        # Docker: sudo docker exec <container> <command>
-        WrapperPattern.create('docker', r'^sudo\s+docker\s+exec\s+([a-zA-Z0-9_.-]+)\s+(.+)$', 2),
-        # bash -c with single quotes
-        WrapperPattern.create('bash_single', r"^bash\s+-c\s+'(.+)'$", 1),
-        # bash -c with double quotes
-        WrapperPattern.create('bash_double', r'^bash\s+-c\s+"(.+)"$', 1),
-        # sh -c with single quotes
-        WrapperPattern.create('sh_single', r"^sh\s+-c\s+'(.+)'$", 1),
-        # sh -c with double quotes
-        WrapperPattern.create('sh_double', r'^sh\s+-c\s+"(.+)"$', 1),
-        # Generic sudo: sudo <command> (must be last to let specific sudo patterns match first)
-        WrapperPattern.create('sudo', r'^sudo\s+(.+)$', 1),
-    )
-
-    def __init__(self, patterns: Optional[tuple[WrapperPattern, ...]] = None):
-        self._patterns = patterns or self.DEFAULT_PATTERNS
-
-    def unwrap(self, command: str) -> tuple[str, list[str]]:
-        """
-        Recursively unwrap command wrappers.
-
-        Returns:
-            (inner_command, wrapper_chain): The innermost command and list of
-            wrapper names that were unwrapped.
-        """
-        wrapper_chain: list[str] = []
-        current = command.strip()
-
-        while True:
-            unwrapped, wrapper_name = self._unwrap_once(current)
-            if wrapper_name is None:
-                break
-            wrapper_chain.append(wrapper_name)
-            current = unwrapped.strip()
-
-        return current, wrapper_chain
-
-    def _unwrap_once(self, command: str) -> tuple[str, Optional[str]]:
-        """
-        Try to unwrap one layer of wrapper.
-
-        Returns:
-            (inner_command, wrapper_name) or (command, None) if no match.
-        """
-        for pattern in self._patterns:
-            match = pattern.regex.match(command.strip())
-            if match:
-                try:
-                    inner = match.group(pattern.inner_group)
-                    return inner, pattern.name
-                except IndexError:
-                    continue
-        return command, None
-
-    def is_wrapped(self, command: str) -> bool:
-        """Check if command matches any wrapper pattern."""
-        _, wrapper_name = self._unwrap_once(command)
-        return wrapper_name is not None
-
-
-# =============================================================================
-# Command Validator (Facade: Orchestrates full command validation)
+# Decision Cache (Single Responsibility: Remember recent approval decisions)
 # =============================================================================
 
-@dataclass
-class ValidationResult:
-    """Result of command validation."""
-    approved: bool
-    reason: str
-    unwrapped_command: Optional[str] = None
-    wrapper_chain: list[str] = field(default_factory=list)
-
-
-class CommandValidator:
+class DecisionCache:
     """
-    Orchestrates command validation using composition.
-
-    This is a Facade that coordinates:
-    - Dangerous pattern checking
-    - Wrapper unwrapping
-    - Chain splitting
-    - Pattern matching against allow list
+    Bounded LRU of approval decisions, persisted across hook invocations.
+
+    Agents re-issue the same commands (git status, ls, test runners) many
+    times per session. Each namespace (one per hook) gets one JSON file per
+    set of contributing settings paths, so switching projects doesn't evict
+    the other project's decisions. The file records the settings
+    fingerprint it was built under; a different fingerprint means settings
+    changed and every entry is dropped.
+
+    Entries are keyed by a hash of the stripped command, so the file stays
+    small however long the commands are; commands over MAX_COMMAND_BYTES
+    (heredocs, generated scripts) are rarely repeated and not cached.
+    Entries expire after ttl seconds. Hit, miss, eviction and invalidation
+    counters are kept in the file for tuning (see stats()). Hooks for
+    parallel tool calls run concurrently, so every write re-reads and
+    rewrites the file under a lock; decide() records a miss and its
+    answer in one such write.
     """
 
+    VERSION = 2
+    MAX_ENTRIES = 512
+    MAX_COMMAND_BYTES = 4096
+    TTL_SECONDS = 3600
+    COUNTERS = ("hits", "misses", "evictions", "invalidations")
+
     def __init__(
         self,
-        settings_reader: Optional[ISettingsReader] = None,
-        pattern_matcher: Optional[IPatternMatcher] = None,
-        dangerous_checker: Optional[DangerousPatternChecker] = None,
-        chain_splitter: Optional[ChainSplitter] = None,
-        wrapper_unwrapper: Optional[WrapperUnwrapper] = None,
+        namespace: str,
+        fingerprint: tuple,
+        cache_dir: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.time,
     ):
-        self._settings = settings_reader or SettingsReader()
-        self._matcher = pattern_matcher or PatternMatcher()
-        self._dangerous = dangerous_checker or DangerousPatternChecker()
-        self._splitter = chain_splitter or ChainSplitter()
-        self._unwrapper = wrapper_unwrapper or WrapperUnwrapper()
-
-    def validate(self, command: str) -> ValidationResult:
+        self._namespace = namespace
+        self._fingerprint = json.loads(json.dumps(fingerprint))
+        self._dir = cache_dir or SettingsCache.DEFAULT_DIR
+        self._max_entries = max_entries or self.MAX_ENTRIES
+        self._ttl = self.TTL_SECONDS if ttl is None else ttl
+        self._clock = clock
+        self._state: Optional[dict] = None
+
+    def decide(self, command: str, decide: Callable[[], bool]) -> bool:
         """
-        Validate a command, handling wrappers and chains.
-
-        Flow:
-        1. Check for dangerous patterns
-        2. Split on chain operators
-        3. For each segment:
-           a. Unwrap any wrappers
-           b. Recursively validate the inner command
-        4. All segments must be approved
+        Return the cached decision for command, or call decide() and cache
+        its answer. Either way the file is written once.
         """
-        # Fast fail on dangerous patterns
-        if self._dangerous.is_dangerous(command):
-            return ValidationResult(False, "Command contains dangerous patterns")
-
-        # Split into chain segments
-        segments = self._splitter.split(command)
-        if segments is None:
-            return ValidationResult(False, "Failed to parse command")
-
-        patterns = self._settings.get_bash_patterns()
-        all_wrappers: list[str] = []
-
-        for segment in segments:
-            result = self._validate_segment(segment, patterns)
-            if not result.approved:
-                return result
-            all_wrappers.extend(result.wrapper_chain)
-
-        return ValidationResult(
-            True,
-            f"All {len(segments)} command(s) approved",
-            wrapper_chain=all_wrappers
-        )
-
-    def _validate_segment(self, segment: str, patterns: list[str]) -> ValidationResult:
-        """Validate a single command segment (may contain wrappers)."""
-        # Try to unwrap
-        inner_cmd, wrapper_chain = self._unwrapper.unwrap(segment)
-
-        if wrapper_chain:
-            # Command was wrapped - validate the inner command
-            return self._validate_inner_command(inner_cmd, patterns, wrapper_chain)
-
-        # No wrapper - validate directly against patterns
-        if self._matches_any_pattern(segment, patterns):
-            return ValidationResult(True, "Command matches allow pattern")
-
-        base_cmd = segment.split()[0] if segment else segment
-        return ValidationResult(False, f"Command '{base_cmd}' not in allow list")
-
-    def _validate_inner_command(
-        self,
-        inner_cmd: str,
-        patterns: list[str],
-        wrapper_chain: list[str]
-    ) -> ValidationResult:
-        """Validate the inner command extracted from wrappers."""
-        # Check for dangerous patterns in inner command
-        if self._dangerous.is_dangerous(inner_cmd):
-            return ValidationResult(
-                False,
-                "Inner command contains dangerous patterns",
-                wrapper_chain=wrapper_chain
-            )
-
-        # If inner command has chain operators, split and validate each
-        if self._splitter.has_operators(inner_cmd):
-            segments = self._splitter.split(inner_cmd)
-            if segments is None:
-                return ValidationResult(False, "Failed to parse inner command")
-
-            for seg in segments:
-                # Recursively validate - inner segments might have wrappers too
-                result = self._validate_segment(seg, patterns)
-                if not result.approved:
-                    return ValidationResult(
-                        False,
-                        result.reason,
-                        wrapper_chain=wrapper_chain + result.wrapper_chain
-                    )
-
-            return ValidationResult(
-                True,
-                f"All {len(segments)} inner command(s) approved",
-                unwrapped_command=inner_cmd,
-                wrapper_chain=wrapper_chain
-            )
-
-        # Single inner command - validate against patterns
-        if self._matches_any_pattern(inner_cmd, patterns):
-            return ValidationResult(
-                True,
-                "Inner command matches allow pattern",
-                unwrapped_command=inner_cmd,
-                wrapper_chain=wrapper_chain
-            )
-
-        base_cmd = inner_cmd.split()[0] if inner_cmd else inner_cmd
-        return ValidationResult(
-            False,
-            f"Inner command '{base_cmd}' not in allow list",
-            wrapper_chain=wrapper_chain
-        )
+        key = self._key(command)
+        if key is None:
+            return decide()
+        # Unlocked read: the file is only ever replaced atomically
+        self._state = None
+        if key in self._load()["entries"]:
+            approved = self._update(lambda state: self._lookup(state, key))
+            if approved is not None:
+                return approved
+            # Expired, or evicted by another hook since the read: the
+            # lookup above already counted the miss
+            approved = decide()
+            self._update(lambda state: self._record(state, key, approved))
+            return approved
+
+        approved = decide()
+
+        def miss(state: dict) -> None:
+            state["stats"]["misses"] += 1
+            self._record(state, key, approved)
+
+        self._update(miss)
+        return approved
+
+    def get(self, command: str) -> Optional[bool]:
+        """Return the cached decision for command, or None on a miss."""
+        key = self._key(command)
+        if key is None:
+            return None
+        return self._update(lambda state: self._lookup(state, key))
+
+    def put(self, command: str, approved: bool) -> None:
+        """Record a decision, evicting the least recently used entries."""
+        key = self._key(command)
+        if key is not None:
+            self._update(lambda state: self._record(state, key, approved))
+
+    def _key(self, command: str) -> Optional[str]:
+        """Hash of the stripped command, or None if it is too long to cache."""
+        import hashlib
+
+        data = command.strip().encode("utf-8", "surrogatepass")
+        if len(data) > self.MAX_COMMAND_BYTES:
+            return None
+        return hashlib.sha256(data).hexdigest()
+
+    def _lookup(self, state: dict, key: str) -> Optional[bool]:
+        entry = state["entries"].pop(key, None)
+        if entry is None or self._clock() - entry[1] > self._ttl:
+            state["stats"]["misses"] += 1
+            return None
+        # Re-insert to mark as most recently used
+        state["entries"][key] = entry
+        state["stats"]["hits"] += 1
+        return entry[0]
+
+    def _record(self, state: dict, key: str, approved: bool) -> None:
+        entries = state["entries"]
+        entries.pop(key, None)
+        entries[key] = [approved, self._clock()]
+        while len(entries) > self._max_entries:
+            del entries[next(iter(entries))]
+            state["stats"]["evictions"] += 1
+
+    def invalidate(self) -> None:
+        """Drop every entry, keeping the counters."""
+
+        def clear(state: dict) -> None:
+            state["entries"] = {}
+            state["stats"]["invalidations"] += 1
+
+        self._update(clear)
+
+    def stats(self) -> dict:
+        """Counters plus current size."""
+        state = self._load()
+        return {**state["stats"], "size": len(state["entries"])}
+
+    def _load(self) -> dict:
+        """Read the cache file once, resetting it on version or settings change."""
+        if self._state is not None:
+            return self._state
+
+        state = None
+        try:
+            with open(self._path()) as f:
+                state = json.load(f)
+            if state.get("version") != self.VERSION:
+                state = None
+            elif state["fingerprint"] != self._fingerprint:
+                state["entries"] = {}
+                state["stats"]["invalidations"] += 1
+                state["fingerprint"] = self._fingerprint
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            state = None
+
+        if state is None or not all(c in state.get("stats", {}) for c in self.COUNTERS):
+            state = {
+                "version": self.VERSION,
+                "fingerprint": self._fingerprint,
+                "entries": {},
+                "stats": dict.fromkeys(self.COUNTERS, 0),
+            }
+        self._state = state
+        return state
+
+    def _update(self, change: Callable[[dict], Any]) -> Any:
+        """
+        Apply change to the file's current state and write it back, holding
+        an exclusive lock on a sibling .lock file so concurrent hooks don't
+        drop each other's entries or counts. Without a lock file (e.g. a
+        read-only cache directory) the update proceeds unlocked.
+        """
+        import fcntl
 
-    def _matches_any_pattern(self, command: str, patterns: list[str]) -> bool:
-        """Check if command matches any allow pattern."""
-        return any(self._matcher.matches(command, p) for p in patterns)
+        path = self._path()
+        try:
+            os.makedirs(self._dir, mode=0o700, exist_ok=True)
+            lock = open(path + ".lock", "a")
+        except OSError:
+            lock = None
+        try:
+            if lock is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            # Re-read: another hook may have written since this one loaded
+            self._state = None
+            result = change(self._load())
+            self._save()
+            return result
+        finally:
+            if lock is not None:
+                lock.close()
+
+    def _save(self) -> None:
+        """Atomically write the cache file. Failures are ignored."""
+        write_atomic(self._path(), json.dumps(self._state).encode())
+
+    def _path(self) -> str:
+        """One file per namespace and set of contributing settings paths."""
+        import hashlib
+
+        paths = "\0".join(str(entry[0]) for entry in self._fingerprint)
+        digest = hashlib.sha1(paths.encode()).hexdigest()[:16]
+        return os.path.join(self._dir, f"decisions-{self._namespace}-{digest}.json")
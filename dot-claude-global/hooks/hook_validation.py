@@ -0,0 +1,688 @@
+#!/usr/bin/env python3
+"""
+Command validation components for the Bash auto-approve hooks.
+
+Split out of hook_utils.py so hooks that exit on a tool-name or event check
+never pay for these imports and regex compiles. hook_utils re-exports every
+public name here lazily, so `from hook_utils import CommandValidator` still
+works; hooks import it inside main() after their cheap checks.
+
+Components:
+    PatternMatcher: Matches commands against allow patterns
+    PatternIndex: Precompiled allow patterns for fast lookup
+    ShellLexer: Single-pass tokenizer shared by the checks below
+    DangerousPatternChecker: Detects dangerous command patterns
+    ChainSplitter: Splits command chains on operators
+    WrapperUnwrapper: Unwraps trusted command wrapper patterns
+    CommandValidator: Orchestrates full command validation
+"""
+from dataclasses import dataclass, field
+from typing import NamedTuple, Optional, Protocol
+import fnmatch
+import os
+import re
+
+from hook_utils import SettingsReader
+
+
+# =============================================================================
+# Protocols (Interfaces for Dependency Inversion)
+# =============================================================================
+
+class IPatternMatcher(Protocol):
+    """Interface for pattern matching."""
+    def matches(self, command: str, pattern: str) -> bool: ...
+
+
+class ISettingsReader(Protocol):
+    """Interface for reading settings."""
+    def get_bash_patterns(self) -> list[str]: ...
+
+
+# =============================================================================
+# Pattern Matcher (Single Responsibility: Match commands against patterns)
+# =============================================================================
+
+def _normalize_command_path(command: str) -> str:
+    """Replace a full-path first token with its basename ("/usr/bin/ls" -> "ls")."""
+    if not command:
+        return command
+    parts = command.split(None, 1)
+    if not parts:
+        return command
+    first_token = parts[0]
+    if '/' in first_token:
+        basename = os.path.basename(first_token)
+        if len(parts) > 1:
+            return f"{basename} {parts[1]}"
+        return basename
+    return command
+
+
+class PatternMatcher:
+    """Matches commands against settings.json Bash patterns."""
+
+    def matches(self, command: str, pattern: str) -> bool:
+        """
+        Check if command matches a Bash pattern from settings.json.
+
+        Pattern formats:
+        - "ls:*"           -> matches "ls", "ls -la", "ls /path"
+        - "git status:*"   -> matches "git status", "git status -s"
+        - "npm:--version"  -> matches "npm --version" exactly
+        - "curl:-s :*"     -> matches "curl -s ..." (flag must be present)
+
+        Also handles full paths: "/usr/bin/ls -la" matches "ls:*"
+        """
+        # Try matching with original command first
+        if self._matches_internal(command, pattern):
+            return True
+
+        # Try matching with normalized command (basename of first token)
+        normalized = self._normalize_command(command)
+        if normalized != command:
+            return self._matches_internal(normalized, pattern)
+
+        return False
+
+    def _normalize_command(self, command: str) -> str:
+        """Normalize command by replacing full path with basename."""
+        return _normalize_command_path(command)
+
+    def _matches_internal(self, command: str, pattern: str) -> bool:
+        """Internal matching logic."""
+        if ":" not in pattern:
+            return self._match_bare_command(command, pattern)
+
+        cmd_part, args_pattern = pattern.split(":", 1)
+        return self._match_with_args(command, cmd_part.strip(), args_pattern)
+
+    def _match_bare_command(self, command: str, pattern: str) -> bool:
+        """Match pattern without colon (just command name)."""
+        cmd_base = command.split()[0] if command else ""
+        return cmd_base == pattern
+
+    def _match_with_args(self, command: str, cmd_part: str, args_pattern: str) -> bool:
+        """Match pattern with command:args format."""
+        if command == cmd_part:
+            rest = ""
+        elif command.startswith(cmd_part + " "):
+            rest = command[len(cmd_part):].strip()
+        else:
+            return False
+
+        if args_pattern == "*":
+            return True
+
+        if args_pattern.endswith(":*"):
+            required_prefix = args_pattern[:-2]
+            return rest.startswith(required_prefix)
+
+        if " :*" in args_pattern:
+            required_flag = args_pattern.replace(" :*", "").strip()
+            return required_flag in rest
+
+        if args_pattern.endswith("*"):
+            return fnmatch.fnmatch(rest, args_pattern)
+
+        return rest == args_pattern or rest.startswith(args_pattern + " ")
+
+
+class PatternIndex:
+    """
+    Precompiled allow-list: same decisions as PatternMatcher over a pattern
+    list, but looked up in roughly O(tokens) instead of O(patterns).
+
+    "cmd:args" patterns are stored in a trie keyed on the space-separated
+    words of "cmd"; each node holds pre-classified argument matchers
+    (any, prefix, required flag, glob, exact). Bare patterns (no colon) are
+    a set lookup on the first word.
+    """
+
+    ANY, PREFIX, FLAG, GLOB, EXACT = range(5)
+
+    def __init__(self, patterns: list[str]):
+        self._bare: set[str] = set()
+        # Trie node: {"children": {word: node}, "args": [(kind, value)]}
+        self._root: dict = {"children": {}, "args": []}
+        for pattern in patterns:
+            self._add(pattern)
+
+    def _add(self, pattern: str) -> None:
+        if ":" not in pattern:
+            self._bare.add(pattern)
+            return
+
+        cmd_part, args_pattern = pattern.split(":", 1)
+        node = self._root
+        for word in cmd_part.strip().split(" "):
+            node = node["children"].setdefault(word, {"children": {}, "args": []})
+        node["args"].append(self._classify(args_pattern))
+
+    def _classify(self, args_pattern: str) -> tuple:
+        """Mirror the branch order of PatternMatcher._match_with_args."""
+        if args_pattern == "*":
+            return (self.ANY, None)
+        if args_pattern.endswith(":*"):
+            return (self.PREFIX, args_pattern[:-2])
+        if " :*" in args_pattern:
+            return (self.FLAG, args_pattern.replace(" :*", "").strip())
+        if args_pattern.endswith("*"):
+            return (self.GLOB, re.compile(fnmatch.translate(args_pattern)))
+        return (self.EXACT, args_pattern)
+
+    def matches(self, command: str) -> bool:
+        """Check if command matches any pattern (full paths normalized)."""
+        if self._matches_internal(command):
+            return True
+
+        normalized = _normalize_command_path(command)
+        if normalized != command:
+            return self._matches_internal(normalized)
+
+        return False
+
+    def _matches_internal(self, command: str) -> bool:
+        first_words = command.split(None, 1)
+        cmd_base = first_words[0] if first_words else ""
+        if cmd_base in self._bare:
+            return True
+
+        # PatternMatcher compares with str.startswith(cmd_part + " "), so the
+        # trie walks literal single-space-separated words, empty ones included.
+        words = command.split(" ")
+        node = self._root
+        for depth, word in enumerate(words):
+            node = node["children"].get(word)
+            if node is None:
+                return False
+            if node["args"]:
+                rest = " ".join(words[depth + 1:]).strip()
+                if any(self._arg_matches(m, rest) for m in node["args"]):
+                    return True
+        return False
+
+    def _arg_matches(self, matcher: tuple, rest: str) -> bool:
+        kind, value = matcher
+        if kind == self.ANY:
+            return True
+        if kind == self.PREFIX:
+            return rest.startswith(value)
+        if kind == self.FLAG:
+            return value in rest
+        if kind == self.GLOB:
+            return value.match(rest) is not None
+        return rest == value or rest.startswith(value + " ")
+
+
+# =============================================================================
+# Shell Lexer (Single Responsibility: Tokenize shell commands in one pass)
+# =============================================================================
+
+class Token(NamedTuple):
+    """A lexical token; text is the raw source slice [start, end)."""
+    kind: str
+    text: str
+    start: int
+    end: int
+
+
+@dataclass
+class LexedCommand:
+    """Token stream plus derived views shared by every validation step."""
+    source: str
+    tokens: list[Token]
+    unquoted: str   # Source with quote characters and quoted content removed
+    complete: bool  # False if a quote was left open
+
+    def has_operators(self) -> bool:
+        """Check for chain operators outside quotes."""
+        return any(t.kind == ShellLexer.OPERATOR for t in self.tokens)
+
+    def segments(self) -> list[str]:
+        """Raw source text between chain operators, stripped, empties dropped."""
+        segments = []
+        start = 0
+        for token in self.tokens:
+            if token.kind == ShellLexer.OPERATOR:
+                segment = self.source[start:token.start].strip()
+                if segment:
+                    segments.append(segment)
+                start = token.end
+        segment = self.source[start:].strip()
+        if segment:
+            segments.append(segment)
+        return segments
+
+
+class ShellLexer:
+    """
+    Single-pass O(n) tokenizer following bash quoting rules.
+
+    Produces WORD, OPERATOR (chain separators) and REDIRECT tokens, and the
+    unquoted projection of the command used by dangerous-pattern checks:
+    - Single quotes: everything literal until the next single quote
+    - Double quotes: backslash escapes the next character
+    - Unquoted: backslash escapes the next character (kept verbatim in the
+      unquoted projection, so escaped metacharacters still look dangerous)
+
+    Substitutions ($(...), backticks, <(...)) are not parsed: they are
+    rejected up front by DangerousPatternChecker.
+    """
+
+    WORD = "word"
+    OPERATOR = "operator"
+    REDIRECT = "redirect"
+
+    # Longest first so "&&" wins over "&" and "|&" over "|"
+    OPERATORS = ("&&", "||", "|&", "|", ";", "&", "\n")
+    # Matched before OPERATORS so "2>&1" and "&>file" don't split on "&"
+    REDIRECTS = ("&>>", "&>", ">>", ">&", ">|", "<<<", "<<", "<&", "<>", ">", "<")
+
+    # Blanks are skipped; then one alternative per token type. A quote or
+    # backslash that can't start a complete word means an unclosed quote.
+    _QUOTED = r"""'[^']*'|"(?:[^"\\]|\\.)*"|\\."""
+    _TOKEN_RE = re.compile(
+        r"[ \t]*(?:"
+        r"(?P<op>" + "|".join(re.escape(op) for op in REDIRECTS + OPERATORS) + ")"
+        r"|(?P<word>(?:[^ \t'\"\\&|;<>\n]+|" + _QUOTED + r"|\\\Z)+)"
+        r"|(?P<unclosed>['\"]))",
+        re.DOTALL,
+    )
+    _QUOTED_RE = re.compile(_QUOTED, re.DOTALL)
+    _REDIRECT_SET = frozenset(REDIRECTS)
+
+    def lex(self, command: str) -> LexedCommand:
+        """Tokenize a command."""
+        tokens: list[Token] = []
+        append = tokens.append
+        complete_end = len(command)
+
+        for match in self._TOKEN_RE.finditer(command):
+            kind = match.lastgroup
+            if kind == "word":
+                append(Token(self.WORD, match.group(kind), *match.span(kind)))
+            elif kind == "op":
+                text = match.group(kind)
+                token_kind = self.REDIRECT if text in self._REDIRECT_SET else self.OPERATOR
+                append(Token(token_kind, text, *match.span(kind)))
+            elif kind == "unclosed":
+                # Everything from here on is inside the unclosed quote
+                start = complete_end = match.start(kind)
+                if tokens and tokens[-1].kind == self.WORD and tokens[-1].end == start:
+                    start = tokens.pop().start
+                append(Token(self.WORD, command[start:], start, len(command)))
+                break
+
+        # Quotes only occur inside words, so stripping them across the whole
+        # (closed) command gives the same result as stripping word by word.
+        unquoted = self._QUOTED_RE.sub(self._keep_escape, command[:complete_end])
+        return LexedCommand(command, tokens, unquoted, complete_end == len(command))
+
+    @staticmethod
+    def _keep_escape(match: "re.Match[str]") -> str:
+        """Drop a quoted span, but keep an unquoted backslash escape verbatim."""
+        text = match.group()
+        return text if text[0] == "\\" else ""
+
+
+# =============================================================================
+# Dangerous Pattern Checker (Single Responsibility: Detect dangerous patterns)
+# =============================================================================
+
+@dataclass
+class DangerousPatternConfig:
+    """Configuration for dangerous pattern detection."""
+    # Patterns dangerous even inside quotes (command substitution)
+    always_dangerous: tuple[re.Pattern, ...] = field(default_factory=lambda: tuple(
+        re.compile(p) for p in [
+            r'\$\(',           # Command substitution $(...)
+            r'`[^`]*`',        # Backtick command substitution
+        ]
+    ))
+    # Patterns dangerous only when unquoted
+    unquoted_dangerous: tuple[re.Pattern, ...] = field(default_factory=lambda: tuple(
+        re.compile(p) for p in [
+            r'\beval\b',       # eval command
+            r'\bsource\b',     # source command
+            r'^\s*\.',         # . (source) at start
+            r'\|&',            # Pipe with stderr (|&)
+            r'<\(',            # Process substitution <(...)
+            r'>\(',            # Process substitution >(...)
+            r'\n',             # Newline (command separator)
+        ]
+    ))
+    # Output redirects may only target relative paths or these absolute ones
+    allowed_redirect_targets: frozenset[str] = frozenset({"/dev/null"})
+
+
+class DangerousPatternChecker:
+    """Checks commands for dangerous patterns."""
+
+    _QUOTE_CHARS_RE = re.compile(r"[\\'\"]")
+
+    def __init__(
+        self,
+        config: Optional[DangerousPatternConfig] = None,
+        lexer: Optional[ShellLexer] = None,
+    ):
+        self._config = config or DangerousPatternConfig()
+        self._lexer = lexer or ShellLexer()
+
+    def is_dangerous(self, command: str, lexed: Optional[LexedCommand] = None) -> bool:
+        """
+        Return True if command contains dangerous patterns.
+
+        Pass `lexed` to reuse a token stream already produced for command.
+        """
+        # Always-dangerous patterns apply everywhere
+        if any(p.search(command) for p in self._config.always_dangerous):
+            return True
+
+        # Unquoted-dangerous patterns only apply outside quotes
+        lexed = lexed or self._lexer.lex(command)
+        if any(p.search(lexed.unquoted) for p in self._config.unquoted_dangerous):
+            return True
+
+        return self._redirects_to_absolute_path(lexed)
+
+    def _redirects_to_absolute_path(self, lexed: LexedCommand) -> bool:
+        """
+        Check output redirects (>, >>, >|, &>, &>>, >&, <>, with or without
+        an fd number) for an absolute target other than the allowed ones.
+        """
+        tokens = lexed.tokens
+        for i, token in enumerate(tokens[:-1]):
+            if token.kind != ShellLexer.REDIRECT or ">" not in token.text:
+                continue
+            target = tokens[i + 1]
+            if target.kind != ShellLexer.WORD:
+                continue
+            path = self._QUOTE_CHARS_RE.sub("", target.text)
+            if path.startswith("/") and path not in self._config.allowed_redirect_targets:
+                return True
+        return False
+
+
+# =============================================================================
+# Chain Splitter (Single Responsibility: Split commands on operators)
+# =============================================================================
+
+class ChainSplitter:
+    """Splits shell command chains into individual commands."""
+
+    OPERATORS = ShellLexer.OPERATORS
+
+    def __init__(self, lexer: Optional[ShellLexer] = None):
+        self._lexer = lexer or ShellLexer()
+
+    def has_operators(self, command: str, lexed: Optional[LexedCommand] = None) -> bool:
+        """Check if command contains chain operators outside quotes."""
+        return (lexed or self._lexer.lex(command)).has_operators()
+
+    def split(self, command: str, lexed: Optional[LexedCommand] = None) -> Optional[list[str]]:
+        """
+        Split command on chain operators, respecting quotes.
+        Returns None if parsing fails (unclosed quotes, empty command).
+        """
+        lexed = lexed or self._lexer.lex(command)
+        if not lexed.complete:
+            return None
+        return lexed.segments() or None
+
+
+# =============================================================================
+# Wrapper Unwrapper (Single Responsibility: Unwrap trusted command wrappers)
+# =============================================================================
+
+@dataclass
+class WrapperPattern:
+    """Defines a trusted command wrapper pattern."""
+    name: str
+    regex: re.Pattern
+    inner_group: int = 1  # Capture group containing the inner command
+
+    @classmethod
+    def create(cls, name: str, pattern: str, inner_group: int = 1) -> 'WrapperPattern':
+        """Factory method to create a WrapperPattern."""
+        return cls(name=name, regex=re.compile(pattern), inner_group=inner_group)
+
+
+class WrapperUnwrapper:
+    """Unwraps trusted command wrapper patterns to extract inner commands."""
+
+    # Default trusted wrapper patterns
+    DEFAULT_PATTERNS: tuple[WrapperPattern, ...] = (
+        # Proxmox LXC: sudo pct exec <container_id> -- <command>
+        WrapperPattern.create('proxmox_pct', r'^sudo\s+pct\s+exec\s+(\d+)\s+--\s+(.+)$', 2),
+        # Proxmox VM: sudo qm guest exec <vmid> -- <command>
+        WrapperPattern.create('proxmox_qm', r'^sudo\s+qm\s+guest\s+exec\s+(\d+)\s+--\s+(.+)$', 2),
+        # Docker: sudo docker exec <container> <command>
+        WrapperPattern.create('docker', r'^sudo\s+docker\s+exec\s+([a-zA-Z0-9_.-]+)\s+(.+)$', 2),
+        # bash -c with single quotes
+        WrapperPattern.create('bash_single', r"^bash\s+-c\s+'(.+)'$", 1),
+        # bash -c with double quotes
+        WrapperPattern.create('bash_double', r'^bash\s+-c\s+"(.+)"$', 1),
+        # sh -c with single quotes
+        WrapperPattern.create('sh_single', r"^sh\s+-c\s+'(.+)'$", 1),
+        # sh -c with double quotes
+        WrapperPattern.create('sh_double', r'^sh\s+-c\s+"(.+)"$', 1),
+        # Generic sudo: sudo <command> (must be last to let specific sudo patterns match first)
+        WrapperPattern.create('sudo', r'^sudo\s+(.+)$', 1),
+    )
+
+    def __init__(self, patterns: Optional[tuple[WrapperPattern, ...]] = None):
+        self._patterns = patterns or self.DEFAULT_PATTERNS
+
+    def unwrap(self, command: str) -> tuple[str, list[str]]:
+        """
+        Recursively unwrap command wrappers.
+
+        Returns:
+            (inner_command, wrapper_chain): The innermost command and list of
+            wrapper names that were unwrapped.
+        """
+        wrapper_chain: list[str] = []
+        current = command.strip()
+
+        while True:
+            unwrapped, wrapper_name = self._unwrap_once(current)
+            if wrapper_name is None:
+                break
+            wrapper_chain.append(wrapper_name)
+            current = unwrapped.strip()
+
+        return current, wrapper_chain
+
+    def _unwrap_once(self, command: str) -> tuple[str, Optional[str]]:
+        """
+        Try to unwrap one layer of wrapper.
+
+        Returns:
+            (inner_command, wrapper_name) or (command, None) if no match.
+        """
+        for pattern in self._patterns:
+            match = pattern.regex.match(command.strip())
+            if match:
+                try:
+                    inner = match.group(pattern.inner_group)
+                    return inner, pattern.name
+                except IndexError:
+                    continue
+        return command, None
+
+    def is_wrapped(self, command: str) -> bool:
+        """Check if command matches any wrapper pattern."""
+        _, wrapper_name = self._unwrap_once(command)
+        return wrapper_name is not None
+
+
+# =============================================================================
+# Command Validator (Facade: Orchestrates full command validation)
+# =============================================================================
+
+@dataclass
+class ValidationResult:
+    """Result of command validation."""
+    approved: bool
+    reason: str
+    unwrapped_command: Optional[str] = None
+    wrapper_chain: list[str] = field(default_factory=list)
+
+
+class CommandValidator:
+    """
+    Orchestrates command validation using composition.
+
+    This is a Facade that coordinates:
+    - Dangerous pattern checking
+    - Wrapper unwrapping
+    - Chain splitting
+    - Pattern matching against allow list
+    """
+
+    def __init__(
+        self,
+        settings_reader: Optional[ISettingsReader] = None,
+        pattern_matcher: Optional[IPatternMatcher] = None,
+        dangerous_checker: Optional[DangerousPatternChecker] = None,
+        chain_splitter: Optional[ChainSplitter] = None,
+        wrapper_unwrapper: Optional[WrapperUnwrapper] = None,
+        lexer: Optional[ShellLexer] = None,
+    ):
+        self._settings = settings_reader or SettingsReader()
+        self._matcher = pattern_matcher or PatternMatcher()
+        # The default matcher's semantics are precompiled into an index;
+        # a custom matcher is consulted pattern by pattern.
+        self._use_index = pattern_matcher is None
+        self._index: Optional[PatternIndex] = None
+        self._indexed_patterns: Optional[list[str]] = None
+        self._dangerous = dangerous_checker or DangerousPatternChecker()
+        self._splitter = chain_splitter or ChainSplitter()
+        self._unwrapper = wrapper_unwrapper or WrapperUnwrapper()
+        self._lexer = lexer or ShellLexer()
+
+    def validate(self, command: str) -> ValidationResult:
+        """
+        Validate a command, handling wrappers and chains.
+
+        Flow:
+        1. Tokenize once (shared by steps 2 and 3)
+        2. Check for dangerous patterns
+        3. Split on chain operators
+        4. For each segment:
+           a. Unwrap any wrappers
+           b. Recursively validate the inner command
+        5. All segments must be approved
+        """
+        lexed = self._lexer.lex(command)
+
+        # Fast fail on dangerous patterns
+        if self._dangerous.is_dangerous(command, lexed):
+            return ValidationResult(False, "Command contains dangerous patterns")
+
+        # Split into chain segments
+        segments = self._splitter.split(command, lexed)
+        if segments is None:
+            return ValidationResult(False, "Failed to parse command")
+
+        patterns = self._settings.get_bash_patterns()
+        all_wrappers: list[str] = []
+
+        for segment in segments:
+            result = self._validate_segment(segment, patterns)
+            if not result.approved:
+                return result
+            all_wrappers.extend(result.wrapper_chain)
+
+        return ValidationResult(
+            True,
+            f"All {len(segments)} command(s) approved",
+            wrapper_chain=all_wrappers
+        )
+
+    def _validate_segment(self, segment: str, patterns: list[str]) -> ValidationResult:
+        """Validate a single command segment (may contain wrappers)."""
+        # Try to unwrap
+        inner_cmd, wrapper_chain = self._unwrapper.unwrap(segment)
+
+        if wrapper_chain:
+            # Command was wrapped - validate the inner command
+            return self._validate_inner_command(inner_cmd, patterns, wrapper_chain)
+
+        # No wrapper - validate directly against patterns
+        if self._matches_any_pattern(segment, patterns):
+            return ValidationResult(True, "Command matches allow pattern")
+
+        base_cmd = segment.split()[0] if segment else segment
+        return ValidationResult(False, f"Command '{base_cmd}' not in allow list")
+
+    def _validate_inner_command(
+        self,
+        inner_cmd: str,
+        patterns: list[str],
+        wrapper_chain: list[str]
+    ) -> ValidationResult:
+        """Validate the inner command extracted from wrappers."""
+        lexed = self._lexer.lex(inner_cmd)
+
+        # Check for dangerous patterns in inner command
+        if self._dangerous.is_dangerous(inner_cmd, lexed):
+            return ValidationResult(
+                False,
+                "Inner command contains dangerous patterns",
+                wrapper_chain=wrapper_chain
+            )
+
+        if not lexed.complete:
+            return ValidationResult(False, "Failed to parse inner command")
+
+        # If inner command has chain operators, split and validate each
+        if self._splitter.has_operators(inner_cmd, lexed):
+            segments = self._splitter.split(inner_cmd, lexed)
+            if segments is None:
+                return ValidationResult(False, "Failed to parse inner command")
+
+            for seg in segments:
+                # Recursively validate - inner segments might have wrappers too
+                result = self._validate_segment(seg, patterns)
+                if not result.approved:
+                    return ValidationResult(
+                        False,
+                        result.reason,
+                        wrapper_chain=wrapper_chain + result.wrapper_chain
+                    )
+
+            return ValidationResult(
+                True,
+                f"All {len(segments)} inner command(s) approved",
+                unwrapped_command=inner_cmd,
+                wrapper_chain=wrapper_chain
+            )
+
+        # Single inner command - validate against patterns
+        if self._matches_any_pattern(inner_cmd, patterns):
+            return ValidationResult(
+                True,
+                "Inner command matches allow pattern",
+                unwrapped_command=inner_cmd,
+                wrapper_chain=wrapper_chain
+            )
+
+        base_cmd = inner_cmd.split()[0] if inner_cmd else inner_cmd
+        return ValidationResult(
+            False,
+            f"Inner command '{base_cmd}' not in allow list",
+            wrapper_chain=wrapper_chain
+        )
+
+    def _matches_any_pattern(self, command: str, patterns: list[str]) -> bool:
+        """Check if command matches any allow pattern."""
+        if self._use_index:
+            if self._indexed_patterns is not patterns:
+                # SettingsReader ships a prebuilt (possibly cached) index
+                get_index = getattr(self._settings, "get_pattern_index", None)
+                self._index = get_index() if get_index else PatternIndex(patterns)
+                self._indexed_patterns = patterns
+            return self._index.matches(command)
+        return any(self._matcher.matches(command, p) for p in patterns)
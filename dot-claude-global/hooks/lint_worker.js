@@ -0,0 +1,189 @@
+#!/usr/bin/env node
+/*
+ * Resident prettier/eslint worker for post-edit-lint.py (see lint_workers.py).
+ *
+ * One worker serves one project root. It loads the project's prettier and
+ * eslint packages once and answers requests over a Unix socket, so each
+ * edit costs a socket round trip instead of a Node cold start.
+ *
+ * Usage:
+ *     node lint_worker.js <socket> <root> <idle-seconds> <tool>=<package-dir> ...
+ *
+ * Protocol (one request per connection, newline-terminated JSON):
+ *     client -> worker: {"tool": "prettier" | "eslint", "files": [<path>, ...]}
+ *                       or {"command": "stop"}
+ *     worker -> client: {"exit": int, "stdout": str, "stderr": str}
+ *                       or {"error": str} when the client must fall back
+ *
+ * The worker exits after <idle-seconds> without requests, and replies
+ * "stale" and exits as soon as this file or a config file it watches
+ * changes, so config edits take effect on the next call.
+ */
+"use strict";
+
+const fs = require("fs");
+const net = require("net");
+const path = require("path");
+
+const [socketPath, root, idleArg, ...toolArgs] = process.argv.slice(2);
+const IDLE_MS = Number(idleArg || 900) * 1000;
+const PACKAGES = Object.fromEntries(toolArgs.map((arg) => arg.split(/=(.*)/s, 2)));
+
+// Config files whose changes make loaded configuration stale
+const WATCHED = [
+  __filename,
+  path.join(root, "package.json"),
+  ...[
+    "eslint.config.js", "eslint.config.mjs", "eslint.config.cjs", "eslint.config.ts",
+    ".eslintrc", ".eslintrc.js", ".eslintrc.cjs", ".eslintrc.json", ".eslintrc.yml",
+    ".eslintrc.yaml", ".eslintignore", ".prettierrc", ".prettierrc.json",
+    ".prettierrc.yml", ".prettierrc.yaml", ".prettierrc.js", ".prettierrc.cjs",
+    ".prettierrc.mjs", "prettier.config.js", "prettier.config.cjs",
+    "prettier.config.mjs", ".prettierignore", ".gitignore", ".editorconfig",
+  ].map((name) => path.join(root, name)),
+];
+
+function mtime(file) {
+  try {
+    return fs.statSync(file).mtimeMs;
+  } catch {
+    return -1;
+  }
+}
+
+const mtimes = WATCHED.map(mtime);
+const isStale = () => WATCHED.some((file, i) => mtime(file) !== mtimes[i]);
+
+// ===== Tools (loaded on first use) =====
+
+const loaded = {};
+
+function load(tool) {
+  if (!(tool in loaded)) {
+    if (!PACKAGES[tool]) throw new Error(`no package for ${tool}`);
+    loaded[tool] = require(PACKAGES[tool]);
+  }
+  return loaded[tool];
+}
+
+let eslintInstance = null;
+
+async function runEslint(files) {
+  if (!eslintInstance) {
+    const mod = load("eslint");
+    const ESLint = mod.loadESLint ? await mod.loadESLint() : mod.ESLint;
+    const options = { cwd: root };
+    // Matches --no-warn-ignored on the CLI (flat config only)
+    if (ESLint.configType === "flat" || mod.loadESLint) options.warnIgnored = false;
+    eslintInstance = new ESLint(options);
+  }
+  const results = await eslintInstance.lintFiles(files);
+  const errors = results.reduce((n, r) => n + r.errorCount + (r.fatalErrorCount || 0), 0);
+  const formatter = await eslintInstance.loadFormatter("stylish");
+  const stdout = await formatter.format(results);
+  // Same exit code as the CLI: 1 when any error is reported
+  return { exit: errors ? 1 : 0, stdout, stderr: "" };
+}
+
+// The CLI's defaults: prettier 3 ignores paths from .gitignore as well as
+// .prettierignore (prettier 2 only the latter), and both honour .editorconfig
+function prettierIgnorePath(prettier) {
+  const prettierignore = path.join(root, ".prettierignore");
+  if (parseInt(prettier.version, 10) < 3) return prettierignore;
+  return [path.join(root, ".gitignore"), prettierignore];
+}
+
+async function runPrettier([file]) {
+  const prettier = load("prettier");
+  const ignorePath = prettierIgnorePath(prettier);
+  const info = await prettier.getFileInfo(file, { ignorePath, resolveConfig: true });
+  if (info.ignored || !info.inferredParser) return { exit: 0, stdout: "", stderr: "" };
+  const options = (await prettier.resolveConfig(file, { editorconfig: true })) || {};
+  const source = fs.readFileSync(file, "utf8");
+  const formatted = await prettier.format(source, { ...options, filepath: file });
+  if (formatted !== source) fs.writeFileSync(file, formatted);
+  return { exit: 0, stdout: "", stderr: "" };
+}
+
+const TOOLS = { eslint: runEslint, prettier: runPrettier };
+
+// ===== Server =====
+
+let lastRequest = Date.now();
+let server = null;
+
+function shutdown() {
+  if (server) server.close();
+  try {
+    fs.unlinkSync(socketPath);
+  } catch {}
+  process.exit(0);
+}
+
+async function handle(request) {
+  if (request.command === "stop") {
+    setImmediate(shutdown);
+    return { exit: 0, stdout: "", stderr: "" };
+  }
+  if (isStale()) {
+    setImmediate(shutdown);
+    return { error: "stale" };
+  }
+  const run = TOOLS[request.tool];
+  if (!run || !PACKAGES[request.tool]) return { error: "unknown tool" };
+  try {
+    return await run(request.files);
+  } catch (err) {
+    // A tool crash is reported as the CLI would: non-lint failure on stderr
+    return { exit: 2, stdout: "", stderr: String((err && err.stack) || err) };
+  }
+}
+
+function onConnection(conn) {
+  lastRequest = Date.now();
+  let buffer = "";
+  let answered = false;
+  conn.setEncoding("utf8");
+  conn.on("data", async (chunk) => {
+    buffer += chunk;
+    const newline = buffer.indexOf("\n");
+    if (newline < 0 || answered) return;
+    answered = true;
+    let reply;
+    try {
+      reply = await handle(JSON.parse(buffer.slice(0, newline)));
+    } catch {
+      reply = { error: "malformed request" };
+    }
+    lastRequest = Date.now();
+    conn.end(JSON.stringify(reply));
+  });
+  conn.on("error", () => {});
+}
+
+function listen() {
+  server = net.createServer(onConnection);
+  server.on("error", (err) => {
+    if (err.code !== "EADDRINUSE") process.exit(1);
+    // Another worker may own the socket; take over only if it is dead
+    const probe = net.connect(socketPath);
+    probe.on("connect", () => process.exit(0));
+    probe.on("error", () => {
+      try {
+        fs.unlinkSync(socketPath);
+      } catch {}
+      server.listen(socketPath);
+    });
+  });
+  process.umask(0o077);
+  server.listen(socketPath);
+}
+
+setInterval(() => {
+  if (Date.now() - lastRequest > IDLE_MS || isStale()) shutdown();
+}, 1000).unref();
+
+process.on("SIGTERM", shutdown);
+process.on("SIGINT", shutdown);
+
+listen();
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Resident formatter/linter workers for post-edit-lint.py.
+
+prettier and eslint are Node programs: run one-shot, every edit pays a
+Node cold start plus loading the tool and the project's config, which can
+exceed post-edit-lint's timeout on its own. lint_worker.js keeps both
+loaded for one project root and answers requests over a Unix socket.
+
+Lifecycle (mirrors hook_daemon.py):
+    - Started on demand the first time a project needs prettier or eslint;
+      that call still runs the tool one-shot, later calls use the worker
+    - One worker per (project root, tool packages), socket under
+      ~/.claude/run/lint-<hash>.sock
+    - Exits after IDLE_TIMEOUT seconds without requests
+    - Exits when lint_worker.js or a watched config file changes
+      (package.json, eslint/prettier config and ignore files)
+    - Any connect, protocol or worker error returns None and the caller
+      falls back to running the tool one-shot
+
+ruff, shfmt, shellcheck and rustfmt are native binaries that start in
+milliseconds; they stay one-shot.
+
+Usage:
+    lint_workers.py status   List running workers
+    lint_workers.py stop     Stop every running worker
+
+Environment:
+    CLAUDE_LINT_WORKERS=0    Disable workers (always run tools one-shot)
+"""
+import json
+import os
+import socket
+import sys
+
+HOOKS_DIR = os.path.dirname(os.path.abspath(__file__))
+WORKER_SCRIPT = os.path.join(HOOKS_DIR, "lint_worker.js")
+RUN_DIR = os.path.expanduser("~/.claude/run")
+IDLE_TIMEOUT = 15 * 60
+CONNECT_TIMEOUT = 0.5
+
+# Tools the Node worker can serve
+WORKER_TOOLS = ("eslint", "prettier")
+
+# Files that mark the root a worker is started for
+ROOT_MARKERS = ("package.json",)
+
+
+def is_enabled() -> bool:
+    """Check whether workers are enabled (CLAUDE_LINT_WORKERS=0 disables them)."""
+    return os.environ.get("CLAUDE_LINT_WORKERS", "1") != "0"
+
+
+def find_project_root(file_path: str, markers: tuple[str, ...] = ROOT_MARKERS) -> str:
+    """Nearest ancestor directory containing a marker, else the file's directory."""
+    start = os.path.dirname(os.path.abspath(file_path))
+    directory = start
+    while True:
+        if any(os.path.exists(os.path.join(directory, m)) for m in markers):
+            return directory
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return start
+        directory = parent
+
+
+def find_package_dir(executable: str, name: str) -> str | None:
+    """
+    Locate the npm package behind an executable on PATH.
+
+    node_modules/.bin entries and global installs are symlinks into the
+    package, so the package root is the first ancestor of the resolved
+    script whose package.json names the package.
+    """
+    directory = os.path.dirname(os.path.realpath(executable))
+    while True:
+        manifest = os.path.join(directory, "package.json")
+        try:
+            with open(manifest) as f:
+                if json.load(f).get("name") == name:
+                    return directory
+        except (OSError, ValueError, AttributeError):
+            pass
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+# =============================================================================
+# Worker Client (Single Responsibility: Talk to one worker over its socket)
+# =============================================================================
+
+class Worker:
+    """
+    Client for the worker serving one project root and set of packages.
+
+    packages maps tool name -> package directory. Workers are keyed by
+    root and packages, so switching to a different eslint install (for
+    example after `npm install`) starts a fresh worker.
+    """
+
+    def __init__(self, root: str, packages: dict[str, str], run_dir: str = RUN_DIR):
+        import hashlib
+
+        self.root = root
+        self.packages = dict(sorted(packages.items()))
+        key = json.dumps([root, self.packages])
+        digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+        self.socket_path = os.path.join(run_dir, f"lint-{digest}.sock")
+
+    def run(self, tool: str, files: list[str], timeout: float) -> dict | None:
+        """
+        Run tool on files in the worker (prettier takes a single file).
+
+        Returns {"exit", "stdout", "stderr"} on success. Returns None when
+        no worker is listening (one is started for next time) or the worker
+        failed, and the caller should run the tool one-shot.
+        """
+        sock = self._connect()
+        if sock is None:
+            self.spawn()
+            return None
+        sock.settimeout(timeout)
+        try:
+            with sock:
+                sock.sendall(json.dumps({"tool": tool, "files": files}).encode() + b"\n")
+                reply = json.loads(_recv_all(sock))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(reply, dict) or "error" in reply:
+            return None
+        return reply
+
+    def stop(self) -> bool:
+        """Ask the worker to exit. Returns False if none was listening."""
+        return stop_socket(self.socket_path)
+
+    def spawn(self) -> None:
+        """Start a detached worker in the background. Errors are ignored."""
+        import shutil
+        import subprocess
+
+        node = shutil.which("node")
+        if not node:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.socket_path), mode=0o700, exist_ok=True)
+            subprocess.Popen(
+                [node, WORKER_SCRIPT, self.socket_path, self.root, str(IDLE_TIMEOUT),
+                 *(f"{tool}={path}" for tool, path in self.packages.items())],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                cwd=self.root,
+                start_new_session=True,
+                close_fds=True,
+            )
+        except OSError:
+            pass
+
+    def _connect(self) -> socket.socket | None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            return None
+        return sock
+
+
+def _recv_all(sock: socket.socket) -> bytes:
+    chunks = []
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            return b"".join(chunks)
+        chunks.append(chunk)
+
+
+def running_sockets(run_dir: str = RUN_DIR) -> list[str]:
+    """Socket paths of workers that may be running."""
+    try:
+        names = os.listdir(run_dir)
+    except OSError:
+        return []
+    return sorted(
+        os.path.join(run_dir, name) for name in names
+        if name.startswith("lint-") and name.endswith(".sock")
+    )
+
+
+def stop_socket(path: str) -> bool:
+    """Send a stop request to the worker on path."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+    try:
+        with sock:
+            sock.connect(path)
+            sock.sendall(b'{"command": "stop"}\n')
+            _recv_all(sock)
+    except OSError:
+        return False
+    return True
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "status"
+
+    if command == "status":
+        sockets = running_sockets()
+        for path in sockets:
+            print(path)
+        if not sockets:
+            print("no workers running")
+    elif command == "stop":
+        for path in running_sockets():
+            if not stop_socket(path):
+                # Left behind by a worker that died without cleaning up
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+    else:
+        print(f"Usage: {os.path.basename(__file__)} [status|stop]", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,17 +11,32 @@ Supported languages:
   TS/JS   — prettier/biome format + eslint/biome lint
   Rust    — rustfmt (edition-aware via Cargo.toml)
   Shell   — shfmt format + shellcheck
+
+prettier and eslint run in a resident per-project worker when Node is
+available (see lint_workers.py), falling back to one-shot runs.
+
+Tool discovery (PATH lookups and the nightly rustfmt path) is cached in
+~/.claude/cache/lint-tools.json and reused until PATH or a directory on it
+changes.
+
+Batch mode (CLAUDE_LINT_BATCH=1) coalesces bursts of edits: each edit is
+formatted immediately and queued per project, and a background run lints
+every queued file with one linter invocation per language once no edit
+has arrived for BATCH_DEBOUNCE seconds. Its diagnostics are reported on
+the next Edit/Write in that project.
 """
 
+import contextlib
+import fcntl
+import json
 import os
-import shutil
 import subprocess
 import sys
-from pathlib import Path
+import time
 
-sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from hook_utils import parse_hook_input, deny, pass_through
+from hook_utils import SettingsCache, parse_hook_input, deny, pass_through, write_atomic
 
 SKIP_DIRS = frozenset(
     {
@@ -40,50 +55,192 @@ SKIP_DIRS = frozenset(
 
 TOOL_TIMEOUT = 10
 
+# Node tools get longer: a one-shot run (no worker yet) pays a cold start
+TOOL_TIMEOUTS = {"eslint": 30, "prettier": 20}
+
+TOOL_CACHE_PATH = os.path.expanduser("~/.claude/cache/lint-tools.json")
+BATCH_DIR = os.path.expanduser("~/.claude/cache/lint-batch")
+LINT_CACHE_DIR = os.path.expanduser("~/.claude/cache/lint")
+BATCH_DEBOUNCE = 2.0
+
+# Files marking the project a batch is queued under
+PROJECT_MARKERS = (".git", "pyproject.toml", "package.json", "Cargo.toml")
+
+LANGUAGES = {
+    ".py": "python",
+    ".ts": "js",
+    ".tsx": "js",
+    ".js": "js",
+    ".jsx": "js",
+    ".rs": "rust",
+    ".sh": "shell",
+    ".bash": "shell",
+    ".zsh": "shell",
+}
+
 
 def should_skip(file_path: str) -> bool:
     """Skip generated/vendored paths."""
-    return any(part in SKIP_DIRS for part in Path(file_path).parts)
+    return any(part in SKIP_DIRS for part in file_path.split(os.sep))
+
+
+def language_of(file_path: str) -> str | None:
+    return LANGUAGES.get(os.path.splitext(file_path)[1].lower())
+
+
+# =============================================================================
+# Tool Discovery (Single Responsibility: Find tools once, remember them)
+# =============================================================================
+
+class ToolCache:
+    """
+    Persistent cache of PATH lookups and the nightly rustfmt path.
+
+    Keyed by PATH plus the mtimes of its directories and of rustup's
+    toolchain directory: installing or removing a tool touches one of
+    those, so the cache never needs a TTL.
+    """
+
+    def __init__(self, path: str = TOOL_CACHE_PATH):
+        self._path = path
+        self._key = self._make_key()
+        self._state = self._load()
+        self._dirty = False
+
+    def which(self, name: str) -> str | None:
+        tools = self._state["tools"]
+        if name not in tools:
+            import shutil
+
+            tools[name] = shutil.which(name)
+            self._dirty = True
+        return tools[name]
+
+    def rustfmt(self) -> list[str]:
+        """Get the rustfmt command, preferring nightly when available."""
+        if "rustfmt" not in self._state:
+            self._state["rustfmt"] = self._find_rustfmt()
+            self._dirty = True
+        return self._state["rustfmt"]
+
+    def save(self) -> None:
+        if self._dirty:
+            write_atomic(self._path, json.dumps(self._state).encode())
+            self._dirty = False
+
+    def _find_rustfmt(self) -> list[str]:
+        if self.which("rustup"):
+            result = run_tool(["rustup", "which", "--toolchain", "nightly", "rustfmt"])
+            if result.returncode == 0 and result.stdout.strip():
+                return [result.stdout.strip()]
+        if self.which("rustfmt"):
+            return ["rustfmt"]
+        return []
+
+    def _make_key(self) -> str:
+        rustup_home = os.environ.get("RUSTUP_HOME") or os.path.expanduser("~/.rustup")
+        dirs = os.environ.get("PATH", "").split(os.pathsep)
+        dirs.append(os.path.join(rustup_home, "toolchains"))
+        return repr(SettingsCache.make_key(dirs))
+
+    def _load(self) -> dict:
+        try:
+            with open(self._path) as f:
+                state = json.load(f)
+            if state.get("key") == self._key and isinstance(state.get("tools"), dict):
+                return state
+        except (OSError, ValueError, AttributeError):
+            pass
+        return {"key": self._key, "tools": {}}
+
+
+_tool_cache: ToolCache | None = None
+
+
+def tool_cache() -> ToolCache:
+    """The process's ToolCache, created on first use."""
+    global _tool_cache
+    if _tool_cache is None:
+        _tool_cache = ToolCache()
+    return _tool_cache
 
 
 def has_tool(name: str) -> bool:
     """Check if a CLI tool is available on PATH."""
-    return shutil.which(name) is not None
+    return tool_cache().which(name) is not None
+
+
+def get_rustfmt_cmd() -> list[str]:
+    """Get the rustfmt command, preferring nightly when available."""
+    return tool_cache().rustfmt()
+
+
+# =============================================================================
+# Running Tools
+# =============================================================================
 
+def tool_timeout(tool: str) -> int:
+    return TOOL_TIMEOUTS.get(tool, TOOL_TIMEOUT)
+
+
+def run_tool(args: list[str], timeout: int = TOOL_TIMEOUT) -> subprocess.CompletedProcess:
+    """
+    Run a tool with timeout.
 
-def run_tool(args: list[str]) -> subprocess.CompletedProcess:
-    """Run a tool with timeout. Returns a zero-exit result on failure."""
+    If the tool can't run or times out, returns a result with returncode
+    None and empty output, which callers treat as "nothing to report".
+    """
     try:
         return subprocess.run(
             args,
             capture_output=True,
             text=True,
-            timeout=TOOL_TIMEOUT,
+            timeout=timeout,
         )
     except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
-        return subprocess.CompletedProcess(args, 0, "", "")
+        return subprocess.CompletedProcess(args, None, "", "")
 
 
-def get_rustfmt_cmd() -> list[str]:
-    """Get the rustfmt command, preferring nightly when available."""
-    if has_tool("rustup"):
-        result = run_tool(["rustup", "which", "--toolchain", "nightly", "rustfmt"])
-        if result.returncode == 0 and result.stdout.strip():
-            return [result.stdout.strip()]
-    if has_tool("rustfmt"):
-        return ["rustfmt"]
-    return []
+def node_packages() -> dict[str, str]:
+    """Package directories of the worker-capable tools on PATH."""
+    import lint_workers
+
+    packages = {}
+    for tool in lint_workers.WORKER_TOOLS:
+        executable = tool_cache().which(tool)
+        package = executable and lint_workers.find_package_dir(executable, tool)
+        if package:
+            packages[tool] = package
+    return packages
+
+
+def run_node_tool(tool: str, args: list[str], files: list[str]) -> subprocess.CompletedProcess:
+    """Run prettier/eslint in the project's resident worker, else one-shot."""
+    import lint_workers
+
+    if lint_workers.is_enabled():
+        packages = node_packages()
+        if tool in packages:
+            worker = lint_workers.Worker(lint_workers.find_project_root(files[0]), packages)
+            reply = worker.run(tool, [os.path.abspath(f) for f in files], tool_timeout(tool))
+            if reply is not None:
+                return subprocess.CompletedProcess(
+                    args, reply.get("exit", 0), reply.get("stdout", ""), reply.get("stderr", "")
+                )
+    return run_tool(args, tool_timeout(tool))
 
 
 def find_rust_edition(file_path: str) -> str | None:
     """Walk up from file to find the Rust edition in Cargo.toml."""
-    directory = Path(file_path).parent
-    while directory != directory.parent:
-        cargo_toml = directory / "Cargo.toml"
-        if cargo_toml.is_file():
+    directory = os.path.dirname(os.path.abspath(file_path))
+    while directory != os.path.dirname(directory):
+        cargo_toml = os.path.join(directory, "Cargo.toml")
+        if os.path.isfile(cargo_toml):
             try:
                 in_package = False
-                for line in cargo_toml.read_text().splitlines():
+                with open(cargo_toml) as f:
+                    lines = f.read().splitlines()
+                for line in lines:
                     stripped = line.strip()
                     if stripped.startswith("["):
                         in_package = stripped == "[package]"
@@ -97,69 +254,576 @@ def find_rust_edition(file_path: str) -> str | None:
                             return value
             except OSError:
                 pass
-        directory = directory.parent
+        directory = os.path.dirname(directory)
     return None
 
 
-def format_and_lint(file_path: str) -> str | None:
+# =============================================================================
+# Lint Result Cache (Single Responsibility: Skip tools on known content)
+# =============================================================================
+
+class LintCache:
     """
-    Format the file in place, then lint it.
+    Content-addressed cache of formatter and linter results.
 
-    Returns lint error output if issues found, None otherwise.
+    Keys hash the file path and content, the tool's identity and the
+    contents of every config file that can affect it. A lint entry stores
+    the diagnostics (None when clean); a format entry records content the
+    formatter left unchanged, so formatting it again can be skipped.
+
+    One small JSON file per entry under LINT_CACHE_DIR. Hits refresh the
+    file's mtime and eviction removes the oldest mtimes first, which makes
+    it an LRU capped at MAX_ENTRIES files and MAX_BYTES in total.
     """
-    ext = Path(file_path).suffix.lower()
 
-    if ext == ".py":
-        if has_tool("ruff"):
-            run_tool(["ruff", "format", "--quiet", file_path])
-            result = run_tool(
-                ["ruff", "check", "--output-format", "concise", file_path]
-            )
-            if result.returncode != 0 and result.stdout.strip():
-                return result.stdout.strip()
+    MAX_ENTRIES = 4096
+    MAX_BYTES = 16 * 1024 * 1024
+
+    def __init__(self, cache_dir: str = LINT_CACHE_DIR):
+        self._dir = cache_dir
+        # path -> (stat signature, sha); re-hashed when the stat changes,
+        # since a LintBatch process outlives edits to the configs
+        self._config_hashes: dict[str, tuple[tuple | None, str]] = {}
+
+    def key(self, kind: str, tool: str, file_path: str) -> str | None:
+        """
+        Cache key for running tool ("format" or "lint" kind) on file_path
+        as it is now, or None if the file or tool can't be identified.
+        """
+        import hashlib
+
+        identity = tool_identity(tool)
+        if identity is None:
+            return None
+        try:
+            with open(file_path, "rb") as f:
+                content = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            return None
+        parts = [kind, tool, identity, file_path, content]
+        parts.extend(self._configs(file_path, CONFIG_FILES.get(tool, ())))
+        return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+    def get(self, key: str | None) -> tuple[bool, str | None]:
+        """Return (hit, stored output)."""
+        if key is None:
+            return False, None
+        path = os.path.join(self._dir, key + ".json")
+        try:
+            with open(path) as f:
+                output = json.load(f)["output"]
+            os.utime(path)
+        except (OSError, ValueError, KeyError, TypeError):
+            return False, None
+        return True, output
+
+    def put(self, key: str | None, output: str | None) -> None:
+        if key is None:
+            return
+        if write_atomic(os.path.join(self._dir, key + ".json"),
+                        json.dumps({"output": output}).encode()):
+            self._evict()
+
+    def _evict(self) -> None:
+        """Remove least recently used entries beyond the count and size caps."""
+        try:
+            entries = []
+            with os.scandir(self._dir) as it:
+                for entry in it:
+                    if entry.name.endswith(".json"):
+                        st = entry.stat()
+                        entries.append((st.st_mtime_ns, st.st_size, entry.path))
+        except OSError:
+            return
+        total = sum(size for _, size, _ in entries)
+        if len(entries) <= self.MAX_ENTRIES and total <= self.MAX_BYTES:
+            return
+        entries.sort()
+        for count, (_, size, path) in enumerate(entries):
+            if len(entries) - count <= self.MAX_ENTRIES and total <= self.MAX_BYTES:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            total -= size
+
+    def _configs(self, file_path: str, names: tuple[str, ...]) -> list[str]:
+        """path=sha for every config file named names in the file's ancestors."""
+        import hashlib
+
+        found = []
+        directory = os.path.dirname(os.path.abspath(file_path))
+        while True:
+            for name in names:
+                path = os.path.join(directory, name)
+                try:
+                    st = os.stat(path)
+                    signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+                except OSError:
+                    signature = None
+                cached = self._config_hashes.get(path)
+                if cached is None or cached[0] != signature:
+                    digest = ""
+                    if signature is not None:
+                        try:
+                            with open(path, "rb") as f:
+                                digest = hashlib.sha256(f.read()).hexdigest()
+                        except OSError:
+                            pass
+                    cached = self._config_hashes[path] = (signature, digest)
+                if cached[1]:
+                    found.append(f"{path}={cached[1]}")
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                return found
+            directory = parent
+
+
+_lint_cache: LintCache | None = None
+
+
+def lint_cache() -> LintCache | None:
+    """The process's LintCache, or None when CLAUDE_LINT_CACHE=0."""
+    global _lint_cache
+    if os.environ.get("CLAUDE_LINT_CACHE", "1") == "0":
+        return None
+    if _lint_cache is None:
+        _lint_cache = LintCache()
+    return _lint_cache
+
+
+def tool_identity(tool: str) -> str | None:
+    """
+    Stand-in for the tool's version: the resolved executable's path, mtime
+    and size. Upgrading a tool replaces the file, and this costs a stat
+    rather than spawning `tool --version`.
+    """
+    executable = tool_cache().which(tool)
+    if tool == "rustfmt" and get_rustfmt_cmd():
+        # May be the nightly toolchain's rustfmt rather than the one on PATH
+        executable = tool_cache().which(get_rustfmt_cmd()[0])
+    if not executable:
+        return None
+    real = os.path.realpath(executable)
+    try:
+        st = os.stat(real)
+    except OSError:
+        return None
+    return f"{real}:{st.st_mtime_ns}:{st.st_size}"
+
+
+# =============================================================================
+# Tool Timings (Single Responsibility: Make slow tools visible)
+# =============================================================================
+
+# Pipeline steps in the order they are reported
+TIMED_STEPS = ("format", "lint")
+
+# Per step: (label, ms or None for a cache hit, note) for every run this
+# call. The linter may run in a thread alongside the formatter, so each step
+# records into its own slot and the summary follows pipeline order.
+_timings: dict[str, list[tuple[str, float | None, str]]] = {step: [] for step in TIMED_STEPS}
+
 
-    elif ext in {".ts", ".tsx", ".js", ".jsx"}:
+def step_label(tool: str, kind: str) -> str:
+    """Name of a step in the timing line: ruff and biome both format and lint."""
+    if tool == "ruff":
+        return "ruff format" if kind == "format" else "ruff check"
+    if tool == "biome":
+        return f"biome {kind}"
+    return tool
+
+
+def record_timing(tool: str, kind: str, ms: float | None, note: str = "") -> None:
+    _timings[kind].append((step_label(tool, kind), ms, note))
+
+
+def clear_timings() -> None:
+    for runs in _timings.values():
+        runs.clear()
+
+
+def timed(tool: str, kind: str, timeout: int, run):
+    """Call run(), recording how long it took; run returns a CompletedProcess."""
+    start = time.perf_counter()
+    result = run()
+    ms = (time.perf_counter() - start) * 1000
+    note = ""
+    if result.returncode is None:
+        note = f"timed out after {timeout}s" if ms >= timeout * 1000 else "failed to run"
+    record_timing(tool, kind, ms, note)
+    return result
+
+
+def timing_summary() -> str:
+    """One line listing each tool step, e.g. "ruff format 12 ms, ruff check cached"."""
+    parts = []
+    for step in TIMED_STEPS:
+        for label, ms, note in _timings[step]:
+            text = f"{label} cached" if ms is None else f"{label} {ms:.0f} ms"
+            parts.append(f"{text} ({note})" if note else text)
+    return f"Tool timings: {', '.join(parts)}" if parts else ""
+
+
+# =============================================================================
+# Format and Lint
+# =============================================================================
+
+def pick_formatter(language: str | None) -> str | None:
+    """The installed formatter for a language."""
+    if language == "python":
+        return "ruff" if has_tool("ruff") else None
+    if language == "js":
         if has_tool("prettier"):
-            run_tool(["prettier", "--write", "--log-level", "silent", file_path])
-        elif has_tool("biome"):
-            run_tool(["biome", "format", "--write", file_path])
+            return "prettier"
+        return "biome" if has_tool("biome") else None
+    if language == "rust":
+        return "rustfmt" if get_rustfmt_cmd() else None
+    if language == "shell":
+        return "shfmt" if has_tool("shfmt") else None
+    return None
 
-        if has_tool("eslint"):
-            result = run_tool(["eslint", "--no-warn-ignored", file_path])
-            # eslint exits 1 for lint errors, 2 for config/fatal errors — only report lint
-            if result.returncode == 1:
-                output = (result.stdout or "").strip()
-                if output:
-                    return output
-        elif has_tool("biome"):
-            result = run_tool(["biome", "lint", file_path])
-            if result.returncode != 0:
-                output = (result.stdout or result.stderr or "").strip()
-                if output:
-                    return output
-
-    elif ext == ".rs":
-        rustfmt = get_rustfmt_cmd()
-        if rustfmt:
-            cmd = [*rustfmt, "--quiet"]
-            edition = find_rust_edition(file_path)
-            if edition:
-                cmd.extend(["--edition", edition])
-            cmd.append(file_path)
-            run_tool(cmd)
-
-    elif ext in {".sh", ".bash", ".zsh"}:
-        if has_tool("shfmt"):
-            run_tool(["shfmt", "-w", file_path])
-
-        if has_tool("shellcheck"):
-            result = run_tool(["shellcheck", "--format", "gcc", file_path])
-            if result.returncode != 0 and result.stdout.strip():
-                return result.stdout.strip()
 
+def pick_linter(language: str | None) -> str | None:
+    """The installed linter for a language."""
+    if language == "python":
+        return "ruff" if has_tool("ruff") else None
+    if language == "js":
+        if has_tool("eslint"):
+            return "eslint"
+        return "biome" if has_tool("biome") else None
+    if language == "shell":
+        return "shellcheck" if has_tool("shellcheck") else None
     return None
 
 
+def run_formatter(formatter: str, file_path: str) -> subprocess.CompletedProcess:
+    timeout = tool_timeout(formatter)
+    if formatter == "prettier":
+        return timed(formatter, "format", timeout, lambda: run_node_tool(
+            "prettier", ["prettier", "--write", "--log-level", "silent", file_path], [file_path]
+        ))
+    if formatter == "ruff":
+        cmd = ["ruff", "format", "--quiet", file_path]
+    elif formatter == "biome":
+        cmd = ["biome", "format", "--write", file_path]
+    elif formatter == "rustfmt":
+        cmd = [*get_rustfmt_cmd(), "--quiet"]
+        edition = find_rust_edition(file_path)
+        if edition:
+            cmd.extend(["--edition", edition])
+        cmd.append(file_path)
+    else:
+        cmd = ["shfmt", "-w", file_path]
+    return timed(formatter, "format", timeout, lambda: run_tool(cmd, timeout))
+
+
+def run_linter(linter: str, files: list[str]) -> tuple[bool, str | None]:
+    """
+    Run linter over files in one invocation.
+
+    Returns (ran, diagnostics): ran is False if the tool failed to run or
+    timed out, diagnostics is None when the files are clean.
+    """
+    timeout = tool_timeout(linter)
+    if linter == "ruff":
+        result = timed(linter, "lint", timeout, lambda: run_tool(
+            ["ruff", "check", "--output-format", "concise", *files], timeout
+        ))
+        output = result.stdout.strip() if result.returncode != 0 else ""
+    elif linter == "eslint":
+        result = timed(linter, "lint", timeout, lambda: run_node_tool(
+            "eslint", ["eslint", "--no-warn-ignored", *files], files
+        ))
+        # eslint exits 1 for lint errors, 2 for config/fatal errors — only report lint
+        output = (result.stdout or "").strip() if result.returncode == 1 else ""
+    elif linter == "biome":
+        result = timed(linter, "lint", timeout, lambda: run_tool(["biome", "lint", *files], timeout))
+        output = (result.stdout or result.stderr or "").strip() if result.returncode != 0 else ""
+    else:
+        result = timed(linter, "lint", timeout, lambda: run_tool(
+            ["shellcheck", "--format", "gcc", *files], timeout
+        ))
+        output = result.stdout.strip() if result.returncode != 0 else ""
+    return result.returncode is not None, output or None
+
+
+# Config files each tool reads, looked up in every ancestor directory
+CONFIG_FILES = {
+    "ruff": ("pyproject.toml", "ruff.toml", ".ruff.toml"),
+    "prettier": (
+        "package.json", ".prettierrc", ".prettierrc.json", ".prettierrc.yml",
+        ".prettierrc.yaml", ".prettierrc.js", ".prettierrc.cjs", ".prettierrc.mjs",
+        "prettier.config.js", "prettier.config.cjs", "prettier.config.mjs",
+        ".prettierignore", ".editorconfig",
+    ),
+    "eslint": (
+        "package.json", "eslint.config.js", "eslint.config.mjs", "eslint.config.cjs",
+        "eslint.config.ts", ".eslintrc", ".eslintrc.js", ".eslintrc.cjs",
+        ".eslintrc.json", ".eslintrc.yml", ".eslintrc.yaml", ".eslintignore",
+        "tsconfig.json",
+    ),
+    "biome": ("biome.json", "biome.jsonc"),
+    "rustfmt": ("Cargo.toml", "rustfmt.toml", ".rustfmt.toml"),
+    "shfmt": (".editorconfig",),
+    "shellcheck": (".shellcheckrc",),
+}
+
+# Linters whose diagnostics are lines prefixed with "<path>:", so one
+# multi-file run can be split into per-file cache entries
+LINE_PREFIXED_LINTERS = frozenset({"ruff", "shellcheck"})
+
+
+def is_formatted(formatter: str, file_path: str) -> bool:
+    """True if the cache knows the file's content is the formatter's output."""
+    cache = lint_cache()
+    return bool(cache) and cache.get(cache.key("format", formatter, file_path))[0]
+
+
+def format_file(file_path: str) -> None:
+    """Format the file in place with the language's formatter, if installed."""
+    formatter = pick_formatter(language_of(file_path))
+    if not formatter:
+        return
+    cache = lint_cache()
+    if is_formatted(formatter, file_path):
+        record_timing(formatter, "format", None)
+        return
+    if run_formatter(formatter, file_path).returncode is not None and cache:
+        # The formatted content is a fixed point: formatting it again is a no-op
+        cache.put(cache.key("format", formatter, file_path), None)
+
+
+def lint_files(files: list[str]) -> str | None:
+    """
+    Lint files of one language with a single linter run, skipping files
+    whose content and config already have cached results.
+
+    Returns lint error output if issues found, None otherwise.
+    """
+    linter = pick_linter(language_of(files[0]))
+    if not linter:
+        return None
+    cache = lint_cache()
+    keys = {f: cache.key("lint", linter, f) for f in files} if cache else {}
+
+    outputs, misses = [], []
+    for file_path in files:
+        hit, output = cache.get(keys[file_path]) if cache else (False, None)
+        if not hit:
+            misses.append(file_path)
+        elif output:
+            outputs.append(output)
+    if len(misses) < len(files):
+        record_timing(linter, "lint", None)
+
+    if misses:
+        ran, output = run_linter(linter, misses)
+        if output:
+            outputs.append(output)
+        if ran and cache:
+            if len(misses) == 1:
+                cache.put(keys[misses[0]], output)
+            elif linter in LINE_PREFIXED_LINTERS:
+                for file_path in misses:
+                    own = [
+                        line for line in (output or "").splitlines()
+                        if line.startswith(file_path + ":")
+                    ]
+                    cache.put(keys[file_path], "\n".join(own) or None)
+
+    return "\n".join(outputs) or None
+
+
+def has_linter(file_path: str) -> bool:
+    return pick_linter(language_of(file_path)) is not None
+
+
+def read_bytes(file_path: str) -> bytes | None:
+    try:
+        with open(file_path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def format_and_lint(file_path: str) -> str | None:
+    """
+    Format the file in place, then lint it.
+
+    When the file may still need formatting, the linter runs on the
+    current content concurrently with the formatter. Formatters don't
+    rewrite files they leave unchanged, so if the content is the same
+    afterwards the concurrent result stands; otherwise the formatted file
+    is linted again. Linters only read, so this is safe.
+
+    Returns lint error output if issues found, None otherwise.
+    """
+    language = language_of(file_path)
+    formatter, linter = pick_formatter(language), pick_linter(language)
+    if not (formatter and linter) or is_formatted(formatter, file_path):
+        format_file(file_path)
+        return lint_files([file_path]) if linter else None
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    before = read_bytes(file_path)
+    cache = lint_cache()
+    key = cache.key("lint", linter, file_path) if cache else None
+    hit, cached = cache.get(key) if cache else (False, None)
+    if hit:
+        format_file(file_path)
+        if read_bytes(file_path) == before:
+            record_timing(linter, "lint", None)
+            return cached
+        return lint_files([file_path])
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        concurrent_lint = pool.submit(run_linter, linter, [file_path])
+        format_file(file_path)
+        ran, output = concurrent_lint.result()
+    if read_bytes(file_path) != before:
+        return lint_files([file_path])
+    if ran and cache:
+        cache.put(key, output)
+    return output
+
+
+# =============================================================================
+# Batch Mode (Single Responsibility: Coalesce lint runs across edits)
+# =============================================================================
+
+def batch_enabled() -> bool:
+    return os.environ.get("CLAUDE_LINT_BATCH", "0") == "1"
+
+
+class LintBatch:
+    """
+    Per-project queue of edited files awaiting lint, plus the diagnostics
+    of finished batches not yet reported.
+
+    State lives in BATCH_DIR/<hash>.json and is only read or written under
+    an flock on <hash>.lock, since edits in one project can be handled
+    concurrently. A second lock, <hash>.run, is held by the background run.
+    """
+
+    def __init__(self, root: str, batch_dir: str = BATCH_DIR):
+        import hashlib
+
+        self.root = root
+        digest = hashlib.sha1(root.encode()).hexdigest()[:16]
+        self._base = os.path.join(batch_dir, digest)
+        os.makedirs(batch_dir, mode=0o700, exist_ok=True)
+
+    def enqueue(self, file_path: str) -> list[str]:
+        """Queue file_path; return (and clear) diagnostics waiting to be reported."""
+        with self._locked() as state:
+            state["pending"][file_path] = time.time()
+            reports, state["reports"] = state["reports"], []
+        return reports
+
+    def take_reports(self) -> list[str]:
+        with self._locked() as state:
+            reports, state["reports"] = state["reports"], []
+        return reports
+
+    def take_due(self) -> tuple[list[str], float]:
+        """
+        Take every queued file once the queue has been quiet for
+        BATCH_DEBOUNCE seconds. Otherwise return ([], seconds to wait).
+        """
+        with self._locked() as state:
+            pending = state["pending"]
+            if not pending:
+                return [], 0.0
+            wait = max(pending.values()) + BATCH_DEBOUNCE - time.time()
+            if wait > 0:
+                return [], wait
+            state["pending"] = {}
+            return sorted(pending), 0.0
+
+    def add_report(self, report: str) -> None:
+        with self._locked() as state:
+            state["reports"].append(report)
+
+    def is_running(self) -> bool:
+        with open(self._base + ".run", "a") as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return True
+        return False
+
+    def start(self) -> None:
+        """Start the background run unless one is already going."""
+        if self.is_running():
+            return
+        try:
+            subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__), "--batch", self.root],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                cwd=self.root,
+                start_new_session=True,
+                close_fds=True,
+            )
+        except OSError:
+            pass
+
+    def run(self) -> None:
+        """
+        Lint queued files until the queue is empty, one linter run per
+        language with the languages' linters running concurrently. Exits
+        if another run is active.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        with open(self._base + ".run", "a") as run_lock:
+            try:
+                fcntl.flock(run_lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return
+            while True:
+                files, wait = self.take_due()
+                if wait:
+                    time.sleep(wait)
+                    continue
+                if not files:
+                    return
+                by_language: dict[str, list[str]] = {}
+                for file_path in files:
+                    if os.path.isfile(file_path):
+                        by_language.setdefault(language_of(file_path), []).append(file_path)
+                clear_timings()
+                with ThreadPoolExecutor(max_workers=max(1, len(by_language))) as pool:
+                    results = list(pool.map(lint_files, by_language.values()))
+                errors = "\n".join(r for r in results if r)
+                if errors:
+                    self.add_report(f"{errors}\n\n{timing_summary()}")
+                tool_cache().save()
+
+    @contextlib.contextmanager
+    def _locked(self):
+        """Yield the state under the lock and write it back afterwards."""
+        with open(self._base + ".lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            state = self._load()
+            yield state
+            write_atomic(self._base + ".json", json.dumps(state).encode())
+
+    def _load(self) -> dict:
+        try:
+            with open(self._base + ".json") as f:
+                state = json.load(f)
+            if isinstance(state.get("pending"), dict) and isinstance(state.get("reports"), list):
+                return state
+        except (OSError, ValueError, AttributeError):
+            pass
+        return {"pending": {}, "reports": []}
+
+
 def main():
     hook = parse_hook_input()
     if not hook:
@@ -178,12 +842,41 @@ def main():
     if should_skip(file_path):
         pass_through()
 
-    errors = format_and_lint(file_path)
-    if errors:
-        deny(f"Lint errors in {file_path}:\n{errors}")
+    clear_timings()
+    try:
+        if batch_enabled():
+            errors = format_and_queue(os.path.abspath(file_path))
+            if errors:
+                deny(f"Lint errors from recent edits:\n{errors}")
+        else:
+            errors = format_and_lint(file_path)
+            if errors:
+                deny(f"Lint errors in {file_path}:\n{errors}\n\n{timing_summary()}")
+    finally:
+        tool_cache().save()
 
     pass_through()
 
 
+def format_and_queue(file_path: str) -> str | None:
+    """
+    Batch mode: format now, queue the lint, and return diagnostics from
+    earlier batches in this project.
+    """
+    import lint_workers
+
+    format_file(file_path)
+    batch = LintBatch(lint_workers.find_project_root(file_path, PROJECT_MARKERS))
+    if has_linter(file_path):
+        reports = batch.enqueue(file_path)
+        batch.start()
+    else:
+        reports = batch.take_reports()
+    return "\n".join(reports) or None
+
+
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) == 3 and sys.argv[1] == "--batch":
+        LintBatch(sys.argv[2]).run()
+    else:
+        main()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+PreToolUse router that evaluates every blocking policy in one process.
+
+Replaces four separate PreToolUse registrations (each re-parsing stdin and
+re-importing hook_utils) with a single entry point. Each policy module
+stays a standalone hook with its own check() and main(), so it can still be
+run and tested on its own.
+
+Policies run in order over one parsed HookInput; the first denial wins and
+later policies are skipped. Cheap regex-only policies run first so that
+block-push-others-branch.py (which may hit the network) only runs when
+nothing else has already blocked the call.
+"""
+import os
+import sys
+
+HOOKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HOOKS_DIR)
+
+from hook_utils import run_policies, load_hook_module
+
+POLICY_FILES = (
+    "block-env-files.py",
+    "block-dangerous-proxmox.py",
+    "block-force-push.py",
+    "block-push-others-branch.py",
+)
+
+POLICIES = tuple(
+    load_hook_module(os.path.join(HOOKS_DIR, name)).check
+    for name in POLICY_FILES
+)
+
+
+def main():
+    run_policies(*POLICIES)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+SessionStart hook: record the session's transcript path in session_index.py's
+index, so statusline.sh finds the transcript with one file read instead of
+walking ~/.claude/projects.
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    try:
+        data = json.load(sys.stdin)
+    except (json.JSONDecodeError, EOFError):
+        return
+
+    if data.get("hook_event_name") != "SessionStart":
+        return
+    session_id = data.get("session_id", "")
+    transcript = data.get("transcript_path", "")
+    if not session_id or not transcript:
+        return
+
+    import session_index
+
+    session_index.record(session_id, os.path.expanduser(transcript))
+
+
+if __name__ == "__main__":
+    from hook_trace import run_traced
+
+    run_traced(main, __file__, "SessionStart")
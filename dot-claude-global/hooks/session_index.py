@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Index from session id to transcript path.
+
+statusline.sh needs the current session's transcript on every refresh.
+Finding it by name means walking every project directory under
+~/.claude/projects, which grows with cleanupPeriodDays (thousands of
+transcripts at 1460 days). Instead each session gets a one-line entry:
+
+    ~/.claude/cache/sessions/<session_id>    ->    /path/to/<session_id>.jsonl
+
+so a lookup is a single file read at any history size, cheap enough for
+the statusline to do in bash without spawning anything.
+
+Entries are written by record-session.py on SessionStart and, for sessions
+started before it was installed, lazily on a miss: find() falls back to the
+directory walk once and records what it found. Entries whose transcript no
+longer exists are treated as misses.
+
+Usage:
+    session_index.py find <session_id>    Print the transcript path (walks on a miss)
+    session_index.py rebuild              Index every transcript under ~/.claude/projects
+"""
+import glob
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hook_utils import write_atomic
+
+DEFAULT_DIR = os.path.expanduser("~/.claude/cache/sessions")
+PROJECTS_DIR = os.path.expanduser("~/.claude/projects")
+
+# Session ids are UUIDs; anything else must not become a path component
+SESSION_ID_RE = re.compile(r"[A-Za-z0-9_-]+")
+
+
+def is_valid_id(session_id: str) -> bool:
+    """Check that session_id is safe to use as an entry file name."""
+    return bool(SESSION_ID_RE.fullmatch(session_id or ""))
+
+
+def lookup(session_id: str, index_dir: str = DEFAULT_DIR) -> str | None:
+    """Indexed transcript path for session_id, if recorded and still present."""
+    if not is_valid_id(session_id):
+        return None
+    try:
+        with open(os.path.join(index_dir, session_id)) as f:
+            path = f.readline().strip()
+    except OSError:
+        return None
+    return path if path and os.path.isfile(path) else None
+
+
+def record(session_id: str, transcript: str, index_dir: str = DEFAULT_DIR) -> bool:
+    """Store the entry for session_id. Returns False if it could not be written."""
+    if not is_valid_id(session_id) or not transcript:
+        return False
+    return write_atomic(os.path.join(index_dir, session_id), f"{transcript}\n".encode())
+
+
+def scan(session_id: str, projects_dir: str = PROJECTS_DIR) -> str | None:
+    """Walk the project directories for <session_id>.jsonl (the slow path)."""
+    if not is_valid_id(session_id):
+        return None
+    for path in glob.iglob(os.path.join(glob.escape(projects_dir), "*", f"{session_id}.jsonl")):
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def find(session_id: str, index_dir: str = DEFAULT_DIR, projects_dir: str = PROJECTS_DIR) -> str | None:
+    """Transcript path for session_id, recording it if it had to be scanned for."""
+    path = lookup(session_id, index_dir)
+    if path is None:
+        path = scan(session_id, projects_dir)
+        if path is not None:
+            record(session_id, path, index_dir)
+    return path
+
+
+def rebuild(index_dir: str = DEFAULT_DIR, projects_dir: str = PROJECTS_DIR) -> int:
+    """Record every transcript under projects_dir. Returns the number of new entries."""
+    count = 0
+    for path in glob.iglob(os.path.join(glob.escape(projects_dir), "*", "*.jsonl")):
+        session_id = os.path.basename(path)[:-len(".jsonl")]
+        if lookup(session_id, index_dir) != path and record(session_id, path, index_dir):
+            count += 1
+    return count
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+
+    if command == "find" and len(sys.argv) == 3:
+        path = find(sys.argv[2])
+        if path is None:
+            sys.exit(1)
+        print(path)
+    elif command == "rebuild":
+        print(f"{rebuild()} sessions newly indexed")
+    else:
+        print(f"Usage: {os.path.basename(__file__)} find <session_id> | rebuild", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
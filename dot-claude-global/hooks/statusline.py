@@ -0,0 +1,513 @@
+#!/usr/bin/env python3
+"""
+Statusline renderer: a single-process port of statusline.sh.
+
+statusline.sh forks jq, tail, sed, awk, date, stat, curl and python3 a few
+dozen times per redraw, and fetches rate-limit usage inline when its cache
+is a minute old. This renders the same output in one interpreter:
+the input JSON is parsed once, the transcript is resolved through
+session_index.py and summarised by transcript_index.py (both imported, not
+spawned), and bars, token counts and reset times are formatted in-process.
+
+Output is byte-for-byte what statusline.sh prints on the same machine
+(test_statusline.py checks both against recorded goldens), including its
+jq quirks: a value that jq would fail to index renders as empty, and only
+null/false fall through `//` alternatives. Reset times follow each
+platform's `date` behaviour, so macOS keeps `date -r`'s uppercase AM/PM.
+
+The one deliberate difference: a stale usage cache is refreshed by a
+detached background process (see UsageRefresher), so a render never waits
+on the network; it shows the cached values until the refresh lands.
+
+Usage (settings.json "statusLine" command):
+    statusline.py < statusline-input.json
+
+Environment:
+    NO_COLOR            Disable colors
+    CLAUDE_USAGE_CACHE  Usage cache file (default /tmp/claude/statusline-usage-cache.json)
+    CLAUDE_USAGE_URL    Usage endpoint (tests point it at a local stub)
+"""
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import session_index
+import transcript_index
+from hook_utils import write_atomic
+
+USAGE_CACHE = "/tmp/claude/statusline-usage-cache.json"
+USAGE_TTL = 60
+USAGE_URL = "https://api.anthropic.com/api/oauth/usage"
+CREDENTIALS_FILE = os.path.expanduser("~/.claude/.credentials.json")
+SETTINGS_FILE = os.path.expanduser("~/.claude/settings.json")
+
+BAR_WIDTH = 17
+LOG_EFFORT_LEVELS = frozenset({"low", "medium", "high", "xhigh", "max", "auto"})
+MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun",
+          "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+# ANSI color codes (the bash helpers' printf arguments)
+DIR_COLOR = "\033[1;38;5;117m"         # sky blue
+MODEL_COLOR = "\033[1;38;5;147m"       # light purple
+CC_VERSION_COLOR = "\033[1;38;5;146m"  # light steel blue
+STEEL_BLUE = "\033[1;38;5;111m"
+CORAL_RED = "\033[1;38;5;203m"
+AMBER = "\033[1;38;5;215m"
+ORANGE = "\033[1;38;5;180m"
+SOFT_GREEN = "\033[1;38;5;150m"
+MEDIUM_BLUE = "\033[1;38;5;75m"
+DIM = "\033[2m"
+RESET = "\033[0m"
+
+EFFORT_COLORS = {
+    "low": STEEL_BLUE,
+    "medium": SOFT_GREEN,
+    "high": AMBER,
+    "max": CORAL_RED,
+    "auto": MODEL_COLOR,
+}
+
+
+# =============================================================================
+# jq Semantics (Single Responsibility: Mirror the script's jq lookups)
+# =============================================================================
+
+class JqError(Exception):
+    """Indexing a non-object, which makes jq print nothing."""
+
+
+def jq_get(value, *keys):
+    """Follow .a.b.c like jq: null propagates, indexing a scalar is an error."""
+    for key in keys:
+        if value is None:
+            return None
+        if not isinstance(value, dict):
+            raise JqError(key)
+        value = value.get(key)
+    return value
+
+
+def is_null(value) -> bool:
+    """jq's `//` treats only null and false as missing."""
+    return value is None or value is False
+
+
+def jq_text(value) -> str:
+    """What `jq -r` prints for value, as captured by $(...)."""
+    if isinstance(value, str):
+        return value.rstrip("\n")
+    if isinstance(value, bool) or value is None:
+        return json.dumps(value)
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e17:
+        return str(int(value))
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return json.dumps(value, indent=2)
+
+
+def jq_expr(data, expr) -> str:
+    """Evaluate expr(data) as `jq -r` would, '' when jq would error."""
+    try:
+        value = expr(data)
+    except JqError:
+        return ""
+    return "" if value is None else jq_text(value)
+
+
+def load_json_file(path: str):
+    """Parsed contents of path, or JqError if jq could not read it."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        raise JqError(path) from e
+
+
+def awk_round(text: str) -> str:
+    """`awk '{printf "%.0f", $1}'` on one line of jq output."""
+    fields = text.split()
+    m = re.match(r"[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?", fields[0] if fields else "")
+    return f"{float(m.group(0)) if m else 0.0:.0f}"
+
+
+# =============================================================================
+# Formatting (Single Responsibility: Bars, token counts, colors)
+# =============================================================================
+
+class Painter:
+    """Returns ANSI color codes, or nothing when colors are off (NO_COLOR)."""
+
+    def __init__(self, use_color: bool):
+        self.use_color = use_color
+
+    def __call__(self, code: str) -> str:
+        return code if self.use_color else ""
+
+
+def unicode_bar(pct, width: int = BAR_WIDTH) -> str:
+    """A bar of width cells, pct% filled; non-numeric pct counts as 0."""
+    pct = str(pct)
+    pct = int(pct) if pct.isascii() and pct.isdigit() else 0
+    pct = min(pct, 100)
+    filled = pct * width // 100
+    return "█" * filled + "░" * (width - filled)
+
+
+def fmt_tokens(n: int) -> str:
+    """1234 -> 1k, 1500000 -> 1.5M."""
+    if n >= 1000000:
+        frac = (n % 1000000) // 100000
+        return f"{n // 1000000}M" if frac == 0 else f"{n // 1000000}.{frac}M"
+    if n >= 1000:
+        return f"{n // 1000}k"
+    return str(n)
+
+
+def max_context(model_name: str) -> int:
+    """Context window size implied by the model's display name."""
+    if "1M" in model_name or "1m" in model_name:
+        return 1000000
+    if any(name in model_name for name in ("Opus", "opus", "Sonnet", "sonnet")):
+        return 200000
+    if "Claude 3 Haiku" in model_name or "claude 3 haiku" in model_name:
+        return 100000
+    return 200000
+
+
+def context_color(pct: int) -> str:
+    """green -> amber -> red as context fills up."""
+    if pct >= 80:
+        return CORAL_RED
+    if pct >= 60:
+        return AMBER
+    return STEEL_BLUE
+
+
+def usage_bar_color(pct: str) -> str:
+    try:
+        pct = int(pct)
+    except ValueError:
+        # awk printed inf/nan; the script's numeric test fails and prints nothing
+        return ""
+    if pct >= 90:
+        return CORAL_RED
+    if pct >= 70:
+        return AMBER
+    if pct >= 50:
+        return ORANGE
+    return SOFT_GREEN
+
+
+# =============================================================================
+# Rate Limit Usage (Single Responsibility: Stale-while-revalidate usage cache)
+# =============================================================================
+
+def usage_cache_path() -> str:
+    return os.environ.get("CLAUDE_USAGE_CACHE") or USAGE_CACHE
+
+
+def oauth_token() -> str:
+    """The Claude Code OAuth token from the macOS keychain or credentials file."""
+    token = ""
+    if sys.platform == "darwin":
+        import subprocess
+
+        try:
+            proc = subprocess.run(
+                ["security", "find-generic-password", "-s", "Claude Code-credentials", "-w"],
+                capture_output=True, text=True,
+            )
+            token = jq_expr(json.loads(proc.stdout), lambda d: jq_get(d, "claudeAiOauth", "accessToken"))
+        except (OSError, ValueError):
+            pass
+    if not token and os.path.isfile(CREDENTIALS_FILE):
+        token = jq_expr(None, lambda _: jq_get(
+            load_json_file(CREDENTIALS_FILE), "claudeAiOauth", "accessToken"
+        ))
+    return token
+
+
+class UsageRefresher:
+    """
+    Refreshes the usage cache in a detached process so renders never wait.
+
+    A render that finds the cache stale calls trigger(), which takes a
+    non-blocking flock on <cache>.lock and hands the locked descriptor to a
+    detached `statusline.py --refresh-usage` process. The lock is held until
+    that process exits, so at most one refresh runs however many renders
+    see the stale cache; the render itself draws from whatever is cached.
+
+    Failed refreshes (no token, HTTP or network error, unexpected body)
+    are recorded in <cache>.state and back off exponentially from
+    BACKOFF_BASE up to BACKOFF_MAX seconds; a success clears the state.
+    """
+
+    BACKOFF_BASE = 30
+    BACKOFF_MAX = 15 * 60
+    FETCH_TIMEOUT = 10
+
+    def __init__(self, cache: str):
+        self.cache = cache
+        self.lock_path = f"{cache}.lock"
+        self.state_path = f"{cache}.state"
+
+    def is_stale(self) -> bool:
+        try:
+            return int(time.time()) - int(os.stat(self.cache).st_mtime) >= USAGE_TTL
+        except OSError:
+            return True
+
+    def backing_off(self) -> bool:
+        """True while the last failure's retry time has not passed."""
+        return time.time() < self._state().get("retry_at", 0)
+
+    def trigger(self) -> bool:
+        """Start a background refresh unless one is running or backing off."""
+        if self.backing_off():
+            return False
+        import fcntl
+        import subprocess
+
+        try:
+            os.makedirs(os.path.dirname(self.cache), exist_ok=True)
+            fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        except OSError:
+            return False
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__), "--refresh-usage", self.cache, str(fd)],
+                pass_fds=(fd,),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,
+            )
+        except OSError:
+            return False
+        finally:
+            # The child's inherited descriptor keeps the lock
+            os.close(fd)
+        return True
+
+    def run(self) -> bool:
+        """Fetch usage into the cache (in the detached process). Returns success."""
+        if not self.is_stale():
+            return True
+        body = self._fetch()
+        if body is None:
+            self._record_failure()
+            return False
+        write_atomic(self.cache, body.rstrip("\n").encode() + b"\n")
+        try:
+            os.unlink(self.state_path)
+        except OSError:
+            pass
+        return True
+
+    def _fetch(self) -> str | None:
+        """Response body if it carries five_hour, else None."""
+        token = oauth_token()
+        if not token:
+            return None
+        import urllib.request
+
+        request = urllib.request.Request(
+            os.environ.get("CLAUDE_USAGE_URL") or USAGE_URL,
+            headers={"Authorization": f"Bearer {token}", "anthropic-beta": "oauth-2025-04-20"},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.FETCH_TIMEOUT) as response:
+                body = response.read().decode("utf-8", errors="replace")
+            if is_null(jq_get(json.loads(body), "five_hour")):
+                return None
+        except (OSError, ValueError, JqError):
+            return None
+        return body
+
+    def _record_failure(self) -> None:
+        failures = self._state().get("failures", 0) + 1
+        delay = min(self.BACKOFF_BASE * 2 ** (failures - 1), self.BACKOFF_MAX)
+        state = {"failures": failures, "retry_at": time.time() + delay}
+        write_atomic(self.state_path, json.dumps(state).encode())
+
+    def _state(self) -> dict:
+        try:
+            with open(self.state_path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return state if isinstance(state, dict) else {}
+
+
+def format_reset(raw: str, with_date: bool) -> str:
+    """resets_at as local "3pm" / "Sep 1 3:30pm", as statusline.sh's date calls print it."""
+    if sys.platform == "darwin":
+        # date -u -j -f "%Y-%m-%dT%H:%M:%S" (trailing characters ignored), then date -r
+        import calendar
+
+        try:
+            parsed = time.strptime(raw.split(".")[0][:19], "%Y-%m-%dT%H:%M:%S")
+        except ValueError:
+            return ""
+        lt = time.localtime(calendar.timegm(parsed))
+        ampm = "AM" if lt.tm_hour < 12 else "PM"
+        text = f"{lt.tm_hour % 12 or 12}:{lt.tm_min:02d}{ampm}"
+        return f"{MONTHS[lt.tm_mon - 1]} {lt.tm_mday} {text}" if with_date else text
+
+    # GNU date -d "<raw>" +%s, then date -d @epoch, lowercased
+    from datetime import datetime
+
+    try:
+        stamp = re.sub(r"\.\d+", "", raw, count=1)
+        epoch = int(datetime.fromisoformat(re.sub(r"Z$", "+00:00", stamp)).timestamp())
+    except ValueError:
+        return ""
+    lt = time.localtime(epoch)
+    ampm = "am" if lt.tm_hour < 12 else "pm"
+    text = f"{lt.tm_hour % 12 or 12}:{lt.tm_min:02d}{ampm}"
+    if with_date:
+        text = f"{MONTHS[lt.tm_mon - 1]} {lt.tm_mday} {text}"
+    return text.replace(":00am", "am", 1).replace(":00pm", "pm", 1)
+
+
+def read_usage() -> dict[str, str]:
+    """Utilization percentages and reset times from the cache, as it is now."""
+    cache = usage_cache_path()
+    refresher = UsageRefresher(cache)
+    if refresher.is_stale():
+        refresher.trigger()
+
+    usage = {"five_hour_pct": "", "seven_day_pct": "", "five_hour_reset": "", "seven_day_reset": ""}
+    if not os.path.isfile(cache):
+        return usage
+    try:
+        data = load_json_file(cache)
+    except JqError:
+        return usage
+    for window in ("five_hour", "seven_day"):
+        try:
+            pct = jq_get(data, window, "utilization")
+            usage[f"{window}_pct"] = awk_round(jq_text(0 if is_null(pct) else pct))
+        except JqError:
+            pass
+        raw = jq_expr(data, lambda d: jq_get(d, window, "resets_at"))
+        if raw:
+            usage[f"{window}_reset"] = format_reset(raw, with_date=window == "seven_day")
+    return usage
+
+
+# =============================================================================
+# Statusline (Single Responsibility: Gather fields and render lines)
+# =============================================================================
+
+def session_context(session_id: str) -> tuple[int | None, str]:
+    """(context tokens, last effort change) from the session's transcript."""
+    transcript = session_index.find(session_id)
+    if transcript is None:
+        return None, ""
+    state = transcript_index.load(transcript).state
+    effort = state["effort"] if isinstance(state["effort"], str) else ""
+    tokens = state["context_tokens"]
+    return (tokens if isinstance(tokens, int) and tokens > 0 else None), effort
+
+
+def effort_level(data, log_effort: str) -> str:
+    """Effort from the input JSON, else the transcript, else settings.json."""
+    def from_input(d):
+        effort = jq_get(d, "effort")
+        if isinstance(effort, dict):
+            return jq_get(effort, "level")
+        return effort
+
+    level = jq_expr(data, lambda d: None if is_null(v := from_input(d)) else v)
+    if not level and log_effort in LOG_EFFORT_LEVELS:
+        level = log_effort
+    if not level:
+        level = jq_expr(None, lambda _: (
+            None if is_null(v := jq_get(load_json_file(SETTINGS_FILE), "effortLevel")) else v
+        ))
+    return level or "max"
+
+
+def render(raw_input: str, use_color: bool = True) -> str:
+    """The statusline for one input payload."""
+    paint = Painter(use_color)
+    try:
+        data = json.loads(raw_input)
+        parsed = True
+    except ValueError:
+        data, parsed = None, False
+
+    def field(expr) -> str:
+        return jq_expr(data, expr) if parsed else ""
+
+    def current_dir(d):
+        value = jq_get(d, "workspace", "current_dir")
+        if is_null(value):
+            value = jq_get(d, "cwd")
+        return "unknown" if is_null(value) else value
+
+    directory = field(current_dir)
+    home = os.environ.get("HOME", "")
+    if directory.startswith(home):
+        directory = "~" + directory[len(home):]
+    model_name = field(lambda d: "Claude" if is_null(v := jq_get(d, "model", "display_name")) else v)
+    model_name = model_name.replace(" context", "", 1)
+    session_id = field(lambda d: "" if is_null(v := jq_get(d, "session_id")) else v)
+    cc_version = field(lambda d: "" if is_null(v := jq_get(d, "version")) else v)
+
+    tokens, log_effort = (None, "")
+    if session_id:
+        tokens, log_effort = session_context(session_id)
+    usage = read_usage()
+    effort = effort_level(data, log_effort)
+
+    # Line 1: Directory / Line 2: Model and version
+    out = f"📁 {paint(DIR_COLOR)}{directory}{paint(RESET)}"
+    lines = [f"🤖 {paint(MODEL_COLOR)}{model_name}{paint(RESET)}"]
+    if cc_version and cc_version != "null":
+        lines[0] += f"  📟 {paint(CC_VERSION_COLOR)}v{cc_version}{paint(RESET)}"
+
+    # Line 3: Context bar and effort level
+    context = ""
+    if tokens is not None:
+        pct = tokens * 100 // max_context(model_name)
+        context = f"🧠 {paint(context_color(pct))}{unicode_bar(pct)} {fmt_tokens(tokens)}{paint(RESET)}"
+    if effort:
+        colored = f"{paint(EFFORT_COLORS.get(effort, MEDIUM_BLUE))}{effort}{paint(RESET)}"
+        context = f"{context} {colored}" if context else colored
+    if not context:
+        context = f"🧠 {paint(STEEL_BLUE)}{'░' * BAR_WIDTH}{paint(RESET)}"
+    lines.append(context)
+
+    # Lines 4-5: Rate limit usage bars
+    for window, icon in (("five_hour", "🅂"), ("seven_day", "🅆")):
+        pct, reset = usage[f"{window}_pct"], usage[f"{window}_reset"]
+        if pct and (pct != "0" or reset):
+            suffix = f" {paint(DIM)}{reset}{paint(RESET)}" if reset else ""
+            lines.append(
+                f"{icon}  {paint(usage_bar_color(pct))}{unicode_bar(pct)} {pct}%{paint(RESET)}{suffix}"
+            )
+
+    return out + "".join(f"\n{line}" for line in lines) + "\n"
+
+
+def main():
+    if len(sys.argv) == 4 and sys.argv[1] == "--refresh-usage":
+        # Detached refresher started by UsageRefresher.trigger(); argv[3] is
+        # the inherited lock descriptor, held until this process exits
+        sys.exit(0 if UsageRefresher(sys.argv[2]).run() else 1)
+
+    output = render(sys.stdin.read(), use_color=not os.environ.get("NO_COLOR"))
+    sys.stdout.buffer.write(output.encode("utf-8", errors="replace"))
+
+
+if __name__ == "__main__":
+    from hook_trace import run_traced
+
+    run_traced(main, __file__, "StatusLine")
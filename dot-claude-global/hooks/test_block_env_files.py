@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Tests for the combined rule sets in block-env-files.py."""
+
+import os
+from pathlib import Path
+import re
+import sys
+import unittest
+
+HOOKS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(HOOKS_DIR))
+
+from bench_env_rules import (
+    env_files, legacy_bash_patterns, legacy_file, synthetic_commands, synthetic_paths,
+)
+from hook_utils import RuleSet
+
+
+class TestRuleSet(unittest.TestCase):
+    def test_reports_rule_name(self):
+        rules = RuleSet([("pem", r"\.pem$"), ("env", r"\.env\b")], re.IGNORECASE)
+        self.assertEqual(rules.search("/a/server.PEM"), "pem")
+        self.assertEqual(rules.search("cat .env"), "env")
+        self.assertIsNone(rules.search("/a/main.py"))
+
+    def test_leftmost_then_first_listed(self):
+        rules = RuleSet.from_patterns([r"b", r"ab", r"a"])
+        self.assertEqual(rules.search("xab"), "ab")
+        self.assertEqual(rules.search("xba"), "b")
+
+    def test_anchors_and_word_boundaries(self):
+        rules = RuleSet.from_patterns([r"^\.env$", r"\bcat\b"])
+        self.assertEqual(rules.search(".env"), r"^\.env$")
+        self.assertIsNone(rules.search("x.env"))
+        self.assertIsNone(rules.search("concat"))
+
+
+class TestEnvFileRules(unittest.TestCase):
+    def test_rule_that_fired(self):
+        self.assertEqual(env_files.sensitive_file_rule("/srv/app/.env"), r"/\.env$")
+        self.assertEqual(
+            env_files.sensitive_file_rule(os.path.expanduser("~/.ssh/id_rsa")),
+            r"/\.ssh/id_rsa",
+        )
+        self.assertIsNone(env_files.sensitive_file_rule("/srv/app/.env.example"))
+        self.assertEqual(env_files.sensitive_bash_rule("source .env"), r"source\s+[^\s]*\.env\b")
+
+    def test_files_match_legacy(self):
+        for path in synthetic_paths(5000, seed=1) + ["", ".env", "tokenizer.py", "a/token"]:
+            self.assertEqual(env_files.is_sensitive_file(path), legacy_file(path), path)
+
+    def test_bash_matches_legacy(self):
+        legacy = [re.compile(p, re.IGNORECASE) for p in legacy_bash_patterns()]
+        commands = synthetic_commands(300, seed=1) + [
+            "git commit -m 'use .env'",
+            "python3 tokenizer.py",
+            "grep foo x | cat secrets.yaml",
+            "jq . ~/.docker/config.json",
+        ]
+        for command in commands:
+            self.assertEqual(
+                env_files.is_sensitive_bash(command),
+                any(r.search(command) for r in legacy),
+                command,
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
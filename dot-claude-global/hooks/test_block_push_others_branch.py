@@ -70,8 +70,8 @@ class TestPassThrough(unittest.TestCase):
         self.assertEqual(proc.returncode, 0)
 
 
-class TestBlockingWithMocks(unittest.TestCase):
-    """Tests using mock git/gh executables to verify ownership checking."""
+class MockToolsTestCase(unittest.TestCase):
+    """Puts mock git/gh executables first on PATH."""
 
     def setUp(self):
         self.mock_dir = tempfile.mkdtemp()
@@ -85,6 +85,18 @@ class TestBlockingWithMocks(unittest.TestCase):
             f.write(content)
         os.chmod(path, stat.S_IRWXU)
 
+    def _run(self, input_data=None):
+        # HOME isolates the ownership cache from the real one and other tests
+        env = {
+            "PATH": f"{self.mock_dir}:{os.environ.get('PATH', '')}",
+            "HOME": self.mock_dir,
+        }
+        return run_hook(input_data or make_input("git push"), env=env)
+
+
+class TestBlockingWithMocks(MockToolsTestCase):
+    """Tests using mock git/gh executables to verify ownership checking."""
+
     def _setup_mocks(
         self,
         branch="feat/their-feature",
@@ -119,9 +131,6 @@ exit 0
 """,
         )
 
-    def _run(self, input_data=None):
-        env = {"PATH": f"{self.mock_dir}:{os.environ.get('PATH', '')}"}
-        return run_hook(input_data or make_input("git push"), env=env)
 
     # -- should block --
 
@@ -232,5 +241,91 @@ exit 0
         self.assertEqual(proc.returncode, 0)
 
 
+class TestOwnershipCache(MockToolsTestCase):
+    """Repeat pushes reuse cached GitHub answers."""
+
+    def _setup_mocks(self, head="abc123", gh_fails=False):
+        self.log = os.path.join(self.mock_dir, "gh.log")
+        self._write_script(
+            "git",
+            f"""#!/usr/bin/env bash
+if [[ "$1" == "symbolic-ref" ]]; then
+    echo "feat/their-feature"
+elif [[ "$1" == "ls-remote" ]]; then
+    echo "{head}	refs/heads/feat/their-feature"
+fi
+exit 0
+""",
+        )
+        self._write_script(
+            "gh",
+            f"""#!/usr/bin/env bash
+echo "$2" >> "{self.log}"
+{"exit 1" if gh_fails else ""}
+if [[ "$2" == "user" ]]; then
+    echo "samuel"
+elif [[ "$2" == *"compare"* ]]; then
+    echo "other-user"
+else
+    echo "main"
+fi
+exit 0
+""",
+        )
+
+    def _gh_calls(self):
+        try:
+            with open(self.log) as f:
+                calls = f.read().splitlines()
+        except FileNotFoundError:
+            calls = []
+        if os.path.exists(self.log):
+            os.unlink(self.log)
+        return calls
+
+    def test_repeat_push_skips_gh(self):
+        self._setup_mocks()
+        self.assertEqual(self._run().returncode, 2)
+        self.assertEqual(len(self._gh_calls()), 3)
+        proc = self._run()
+        self.assertEqual(proc.returncode, 2)
+        self.assertIn("other-user", proc.stderr)
+        self.assertEqual(self._gh_calls(), [])
+
+    def test_new_remote_head_refetches_authors(self):
+        self._setup_mocks(head="abc123")
+        self._run()
+        self._gh_calls()
+        self._setup_mocks(head="def456")
+        self.assertEqual(self._run().returncode, 2)
+        calls = self._gh_calls()
+        self.assertEqual(len(calls), 1)
+        self.assertIn("compare", calls[0])
+
+    def test_new_default_branch_refetches_authors(self):
+        self._setup_mocks()
+        self._run()
+        self._gh_calls()
+        path = os.path.join(self.mock_dir, ".claude", "cache", "push-ownership.json")
+        with open(path) as f:
+            state = json.load(f)
+        for entry in state["default_branch"].values():
+            entry["value"] = "develop"
+        with open(path, "w") as f:
+            json.dump(state, f)
+        self.assertEqual(self._run().returncode, 2)
+        calls = self._gh_calls()
+        self.assertEqual(len(calls), 1)
+        self.assertIn("compare/develop...", calls[0])
+
+    def test_failures_are_not_cached(self):
+        self._setup_mocks(gh_fails=True)
+        self.assertIn("retry", self._run().stderr)
+        self._gh_calls()
+        self._setup_mocks()
+        self.assertEqual(self._run().returncode, 2)
+        self.assertEqual(len(self._gh_calls()), 3)
+
+
 if __name__ == "__main__":
     unittest.main()
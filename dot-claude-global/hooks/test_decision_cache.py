@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""Tests for the persistent approval DecisionCache in hook_utils."""
+
+import json
+import os
+from pathlib import Path
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+import unittest.mock
+
+HOOKS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(HOOKS_DIR))
+
+from hook_utils import DecisionCache
+
+FINGERPRINT = (("/home/u/.claude/settings.json", 1, 2, 3),)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDecisionCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.clock = Clock()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def cache(self, fingerprint=FINGERPRINT, **kwargs):
+        return DecisionCache("test", fingerprint, cache_dir=self.tmp,
+                             clock=self.clock, **kwargs)
+
+    def test_persists_across_instances(self):
+        self.assertIsNone(self.cache().get("git status"))
+        self.cache().put("git status", True)
+        self.cache().put("rm -rf /", False)
+
+        cache = self.cache()
+        self.assertTrue(cache.get("git status"))
+        self.assertFalse(cache.get("  rm -rf /  "))
+        self.assertEqual(cache.stats()["hits"], 2)
+        self.assertEqual(cache.stats()["size"], 2)
+
+    def test_ttl_expiry(self):
+        self.cache(ttl=60).put("ls", True)
+        self.clock.now += 61
+        cache = self.cache(ttl=60)
+        self.assertIsNone(cache.get("ls"))
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_lru_eviction(self):
+        cache = self.cache(max_entries=2)
+        cache.put("a", True)
+        cache.put("b", True)
+        cache.get("a")
+        cache.put("c", True)
+
+        cache = self.cache(max_entries=2)
+        self.assertIsNone(cache.get("b"))
+        self.assertTrue(cache.get("a"))
+        self.assertTrue(cache.get("c"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_settings_change_invalidates(self):
+        self.cache().put("ls", True)
+        changed = (("/home/u/.claude/settings.json", 9, 2, 3),)
+        cache = self.cache(fingerprint=changed)
+        self.assertIsNone(cache.get("ls"))
+        self.assertEqual(cache.stats()["invalidations"], 1)
+
+    def test_explicit_invalidate(self):
+        cache = self.cache()
+        cache.put("ls", True)
+        cache.invalidate()
+        self.assertIsNone(self.cache().get("ls"))
+
+    def test_other_project_keeps_own_entries(self):
+        self.cache().put("ls", True)
+        other = FINGERPRINT + (("/proj/.claude/settings.local.json", 1, 2, 3),)
+        self.cache(fingerprint=other).put("make", True)
+        self.assertTrue(self.cache().get("ls"))
+
+    def test_corrupt_file_is_reset(self):
+        self.cache().put("ls", True)
+        for name in os.listdir(self.tmp):
+            with open(os.path.join(self.tmp, name), "w") as f:
+                f.write("{not json")
+        cache = self.cache()
+        self.assertIsNone(cache.get("ls"))
+        cache.put("ls", True)
+        self.assertTrue(self.cache().get("ls"))
+
+    def test_misses_are_persisted(self):
+        self.assertIsNone(self.cache().get("ls"))
+        self.assertEqual(self.cache().stats()["misses"], 1)
+
+    def test_decide_caches_answer_with_one_write(self):
+        calls = []
+        cache = self.cache()
+        with unittest.mock.patch.object(DecisionCache, "_save", autospec=True,
+                                        side_effect=DecisionCache._save) as save:
+            self.assertTrue(cache.decide("git status", lambda: calls.append(1) or True))
+            self.assertEqual(save.call_count, 1)
+            self.assertTrue(self.cache().decide("git status", lambda: calls.append(1) or False))
+            self.assertEqual(save.call_count, 2)
+        self.assertEqual(calls, [1])
+        stats = self.cache().stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_commands_are_stored_hashed(self):
+        self.cache().put("echo secret-token", True)
+        for name in os.listdir(self.tmp):
+            with open(os.path.join(self.tmp, name)) as f:
+                self.assertNotIn("secret-token", f.read())
+        self.assertTrue(self.cache().get("  echo secret-token "))
+
+    def test_long_commands_are_not_cached(self):
+        command = "cat <<EOF\n" + "x" * DecisionCache.MAX_COMMAND_BYTES + "\nEOF"
+        calls = []
+        for _ in range(2):
+            self.assertTrue(self.cache().decide(command, lambda: calls.append(1) or True))
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(self.cache().stats()["size"], 0)
+
+    def test_concurrent_updates_are_not_lost(self):
+        # Each process records its own commands; none may overwrite another's
+        script = (
+            "import sys\n"
+            f"sys.path.insert(0, {str(HOOKS_DIR)!r})\n"
+            "from hook_utils import DecisionCache\n"
+            "worker, cache_dir = sys.argv[1], sys.argv[2]\n"
+            f"fingerprint = {FINGERPRINT!r}\n"
+            "for i in range(25):\n"
+            "    cache = DecisionCache('test', fingerprint, cache_dir=cache_dir)\n"
+            "    command = f'cmd {worker} {i}'\n"
+            "    cache.decide(command, lambda: True)\n"
+        )
+        workers = [
+            subprocess.Popen(["python3", "-c", script, str(w), self.tmp])
+            for w in range(8)
+        ]
+        self.assertEqual([w.wait() for w in workers], [0] * 8)
+
+        stats = self.cache().stats()
+        self.assertEqual(stats["size"], 200)
+        self.assertEqual(stats["misses"], 200)
+
+
+class TestHookUsesCache(unittest.TestCase):
+    """auto-approve-piped-bash.py answers from the cache on repeat."""
+
+    def setUp(self):
+        self.home = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.home, ".claude"))
+        with open(os.path.join(self.home, ".claude", "settings.json"), "w") as f:
+            json.dump({"permissions": {"allow": ["Bash(ls:*)"]}}, f)
+
+    def tearDown(self):
+        shutil.rmtree(self.home, ignore_errors=True)
+
+    def run_hook(self, command):
+        return subprocess.run(
+            ["python3", str(HOOKS_DIR / "auto-approve-piped-bash.py")],
+            input=json.dumps({
+                "tool_name": "Bash",
+                "hook_event_name": "PermissionRequest",
+                "tool_input": {"command": command},
+            }),
+            capture_output=True,
+            text=True,
+            cwd=self.home,
+            env={**os.environ, "HOME": self.home},
+        )
+
+    def stats(self):
+        cache_dir = os.path.join(self.home, ".claude", "cache")
+        [name] = [
+            n for n in os.listdir(cache_dir)
+            if n.startswith("decisions-") and n.endswith(".json")
+        ]
+        with open(os.path.join(cache_dir, name)) as f:
+            return json.load(f)["stats"]
+
+    def test_repeat_command_hits(self):
+        first = self.run_hook("ls -la | ls")
+        second = self.run_hook("ls -la | ls")
+        self.assertIn("allow", first.stdout)
+        self.assertEqual(first.stdout, second.stdout)
+        self.assertEqual(self.stats()["hits"], 1)
+        self.assertEqual(self.stats()["misses"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
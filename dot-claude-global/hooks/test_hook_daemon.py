@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""Tests for hook_daemon.py and hook-client.py."""
+
+import json
+import os
+from pathlib import Path
+import shutil
+import subprocess
+import tempfile
+import time
+import unittest
+
+HOOKS_DIR = str(Path(__file__).resolve().parent)
+CLIENT_PATH = str(Path(HOOKS_DIR) / "hook-client.py")
+DAEMON_PATH = str(Path(HOOKS_DIR) / "hook_daemon.py")
+
+
+def make_input(command, tool_name="Bash", event="PreToolUse"):
+    return {
+        "tool_name": tool_name,
+        "hook_event_name": event,
+        "tool_input": {"command": command},
+    }
+
+
+def run_client(hook_name, input_data, env):
+    return subprocess.run(
+        ["python3", CLIENT_PATH, hook_name],
+        input=json.dumps(input_data),
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+
+
+def run_direct(hook_name, input_data):
+    return subprocess.run(
+        ["python3", str(Path(HOOKS_DIR) / hook_name)],
+        input=json.dumps(input_data),
+        capture_output=True,
+        text=True,
+    )
+
+
+class DaemonTestCase(unittest.TestCase):
+    def setUp(self):
+        # Short path: AF_UNIX socket paths are limited to ~100 bytes
+        self.tmp_dir = tempfile.mkdtemp(dir="/tmp")
+        self.socket = os.path.join(self.tmp_dir, "hookd.sock")
+        self.env = os.environ.copy()
+        self.env["CLAUDE_HOOKD_SOCKET"] = self.socket
+
+    def tearDown(self):
+        subprocess.run(["python3", DAEMON_PATH, "stop"], env=self.env)
+        self._wait_for(lambda: not os.path.exists(self.socket))
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def start_daemon(self):
+        subprocess.Popen(
+            ["python3", DAEMON_PATH, "serve"],
+            env=self.env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        self.assertTrue(self._wait_for(lambda: os.path.exists(self.socket)))
+
+    def _wait_for(self, condition, timeout=10.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if condition():
+                return True
+            time.sleep(0.05)
+        return False
+
+
+class TestDaemonDispatch(DaemonTestCase):
+    """Requests served by the daemon match one-shot execution."""
+
+    def test_deny_matches_one_shot(self):
+        self.start_daemon()
+        data = make_input("git push --force")
+        via_daemon = run_client("block-force-push.py", data, self.env)
+        direct = run_direct("block-force-push.py", data)
+        self.assertEqual(via_daemon.returncode, 2)
+        self.assertEqual(via_daemon.returncode, direct.returncode)
+        self.assertEqual(via_daemon.stderr, direct.stderr)
+
+    def test_pass_through_matches_one_shot(self):
+        self.start_daemon()
+        data = make_input("git push --force-with-lease")
+        proc = run_client("block-force-push.py", data, self.env)
+        self.assertEqual(proc.returncode, 0)
+        self.assertEqual(proc.stdout, "")
+
+    def test_approval_output_forwarded(self):
+        self.start_daemon()
+        data = {
+            "tool_name": "WebFetch",
+            "hook_event_name": "PermissionRequest",
+            "tool_input": {"url": "https://example.com"},
+        }
+        proc = run_client("auto-approve-webfetch.py", data, self.env)
+        self.assertEqual(proc.returncode, 0)
+        decision = json.loads(proc.stdout)
+        self.assertEqual(
+            decision["hookSpecificOutput"]["decision"]["behavior"], "allow"
+        )
+
+    def test_invalid_json_passes_through(self):
+        self.start_daemon()
+        proc = subprocess.run(
+            ["python3", CLIENT_PATH, "block-force-push.py"],
+            input="not json",
+            capture_output=True,
+            text=True,
+            env=self.env,
+        )
+        self.assertEqual(proc.returncode, 0)
+
+    def test_unknown_hook_falls_back(self):
+        self.start_daemon()
+        proc = run_client("no-such-hook.py", make_input("ls"), self.env)
+        # Falls back to one-shot, which fails because the script is missing
+        self.assertNotEqual(proc.returncode, 0)
+
+
+class TestFallback(DaemonTestCase):
+    """Without a daemon the client behaves like the hook itself."""
+
+    def test_disabled_runs_one_shot(self):
+        self.env["CLAUDE_HOOKD"] = "0"
+        proc = run_client("block-force-push.py", make_input("git push -f"), self.env)
+        self.assertEqual(proc.returncode, 2)
+        self.assertIn("force-with-lease", proc.stderr)
+        self.assertFalse(os.path.exists(self.socket))
+
+    def test_missing_daemon_runs_one_shot_and_spawns(self):
+        proc = run_client("block-force-push.py", make_input("git push -f"), self.env)
+        self.assertEqual(proc.returncode, 2)
+        self.assertTrue(self._wait_for(lambda: os.path.exists(self.socket)))
+
+
+class TestTrace(DaemonTestCase):
+    """CLAUDE_HOOK_TRACE appends one timing record per call."""
+
+    def read_trace(self):
+        with open(self.env["CLAUDE_HOOK_TRACE"]) as f:
+            return [json.loads(line) for line in f]
+
+    def setUp(self):
+        super().setUp()
+        self.env["CLAUDE_HOOK_TRACE"] = os.path.join(self.tmp_dir, "trace.jsonl")
+
+    def test_one_shot_records(self):
+        self.env["CLAUDE_HOOKD"] = "0"
+        proc = run_client("block-force-push.py", make_input("git push -f"), self.env)
+        self.assertEqual(proc.returncode, 2)
+        self.assertIn("force-with-lease", proc.stderr)
+        [record] = self.read_trace()
+        self.assertEqual(record["hook"], "block-force-push.py")
+        self.assertEqual(record["mode"], "oneshot")
+        self.assertEqual(record["event"], "PreToolUse")
+        self.assertEqual(record["tool"], "Bash")
+        self.assertEqual(record["exit"], 2)
+        self.assertGreater(record["ms"], 0)
+
+    def test_daemon_records_hook_time(self):
+        self.start_daemon()
+        run_client("block-force-push.py", make_input("ls"), self.env)
+        [record] = self.read_trace()
+        self.assertEqual(record["mode"], "daemon")
+        self.assertEqual(record["exit"], 0)
+        self.assertIn("hook_ms", record)
+
+
+if __name__ == "__main__":
+    unittest.main()
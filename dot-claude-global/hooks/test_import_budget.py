@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""Hooks must not load on-demand modules before their cheap checks."""
+
+import os
+from pathlib import Path
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from check_import_budget import LAZY_EXEMPT, LAZY_MODULES, hook_files, measure
+
+
+class TestLazyImports(unittest.TestCase):
+    # Timing budgets are machine-dependent; run check_import_budget.py for
+    # those. Which modules load is deterministic, so it is checked here.
+
+    def test_early_exit_skips_lazy_modules(self):
+        with tempfile.TemporaryDirectory() as home:
+            env = {**os.environ, "HOME": home}
+            for hook in hook_files():
+                with self.subTest(hook=hook):
+                    _, loaded = measure(hook, 1, env)
+                    eager = (loaded & LAZY_MODULES) - LAZY_EXEMPT.get(hook, frozenset())
+                    self.assertEqual(eager, set())
+
+    def test_validation_still_reachable_from_hook_utils(self):
+        import hook_utils
+        import hook_validation
+
+        self.assertIs(hook_utils.CommandValidator, hook_validation.CommandValidator)
+        with self.assertRaises(AttributeError):
+            hook_utils.NoSuchName
+
+
+if __name__ == "__main__":
+    unittest.main()
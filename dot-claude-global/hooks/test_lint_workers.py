@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""Tests for lint_workers.py, lint_worker.js and their use in post-edit-lint.py."""
+
+import json
+import os
+from pathlib import Path
+import shutil
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+HOOKS_DIR = str(Path(__file__).resolve().parent)
+HOOK_PATH = str(Path(HOOKS_DIR) / "post-edit-lint.py")
+sys.path.insert(0, HOOKS_DIR)
+
+import lint_workers
+
+# Stand-ins for the eslint and prettier npm packages: the Node API the
+# worker loads, plus a CLI for the one-shot path
+FAKE_ESLINT = """
+class ESLint {
+  async lintFiles(files) {
+    const src = require("fs").readFileSync(files[0], "utf8");
+    return [{ filePath: files[0], errorCount: src.includes("var ") ? 1 : 0 }];
+  }
+  async loadFormatter() {
+    return { format: (results) => results.filter((r) => r.errorCount)
+      .map((r) => `${r.filePath}: worker: no-var`).join("\\n") };
+  }
+}
+module.exports = { ESLint };
+"""
+FAKE_PRETTIER = """
+const fs = require("fs");
+const log = (call, options) =>
+  fs.appendFileSync(__dirname + "/calls.log", JSON.stringify([call, options]) + "\\n");
+module.exports = {
+  version: "3.3.3",
+  getFileInfo: async (file, options) => {
+    log("getFileInfo", options);
+    return { ignored: false, inferredParser: "babel" };
+  },
+  resolveConfig: async (file, options) => {
+    log("resolveConfig", options);
+    return null;
+  },
+  format: async (src) => src.replace(/  +/g, " "),
+};
+"""
+FAKE_CLI = """#!/usr/bin/env bash
+for last; do true; done
+if grep -q "var " "$last"; then echo "$last: one-shot: no-var"; exit 1; fi
+exit 0
+"""
+
+
+def make_package(root, name, api, cli):
+    package = os.path.join(root, "node_modules", name)
+    os.makedirs(os.path.join(package, "bin"))
+    with open(os.path.join(package, "package.json"), "w") as f:
+        json.dump({"name": name, "main": "index.js"}, f)
+    with open(os.path.join(package, "index.js"), "w") as f:
+        f.write(api)
+    script = os.path.join(package, "bin", "cli.sh")
+    with open(script, "w") as f:
+        f.write(cli)
+    os.chmod(script, stat.S_IRWXU)
+    bin_dir = os.path.join(root, "node_modules", ".bin")
+    os.makedirs(bin_dir, exist_ok=True)
+    os.symlink(script, os.path.join(bin_dir, name))
+    return package
+
+
+@unittest.skipUnless(shutil.which("node"), "node not installed")
+class WorkerTestCase(unittest.TestCase):
+    def setUp(self):
+        # Short path: AF_UNIX socket paths are limited to ~100 bytes
+        self.project = tempfile.mkdtemp(dir="/tmp")
+        self.run_dir = os.path.join(self.project, "run")
+        with open(os.path.join(self.project, "package.json"), "w") as f:
+            f.write("{}")
+        self.packages = {
+            "eslint": make_package(self.project, "eslint", FAKE_ESLINT, FAKE_CLI),
+            "prettier": make_package(self.project, "prettier", FAKE_PRETTIER, "#!/bin/sh\n"),
+        }
+        os.makedirs(os.path.join(self.project, "src"))
+        self.file = os.path.join(self.project, "src", "app.js")
+        with open(self.file, "w") as f:
+            f.write("var  x = 1;\n")
+        self.worker = lint_workers.Worker(self.project, self.packages, self.run_dir)
+
+    def tearDown(self):
+        self.worker.stop()
+        self._wait_for(lambda: not os.path.exists(self.worker.socket_path))
+        shutil.rmtree(self.project, ignore_errors=True)
+
+    def _wait_for(self, condition, timeout=10.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if condition():
+                return True
+            time.sleep(0.05)
+        return False
+
+    def start_worker(self):
+        self.assertIsNone(self.worker.run("eslint", [self.file], 5))
+        self.assertTrue(self._wait_for(lambda: os.path.exists(self.worker.socket_path)))
+
+
+class TestDiscovery(unittest.TestCase):
+    def test_package_dir_through_bin_symlink(self):
+        with tempfile.TemporaryDirectory() as project:
+            package = make_package(project, "eslint", FAKE_ESLINT, FAKE_CLI)
+            executable = os.path.join(project, "node_modules", ".bin", "eslint")
+            self.assertEqual(lint_workers.find_package_dir(executable, "eslint"), package)
+            self.assertIsNone(lint_workers.find_package_dir(executable, "prettier"))
+
+    def test_project_root(self):
+        with tempfile.TemporaryDirectory() as project:
+            nested = os.path.join(project, "a", "b")
+            os.makedirs(nested)
+            Path(project, "package.json").write_text("{}")
+            path = os.path.join(nested, "x.ts")
+            self.assertEqual(lint_workers.find_project_root(path), project)
+            self.assertEqual(lint_workers.find_project_root(path, ("missing.json",)), nested)
+
+
+class TestWorker(WorkerTestCase):
+    def test_first_call_spawns_then_worker_answers(self):
+        self.start_worker()
+        reply = self.worker.run("eslint", [self.file], 5)
+        self.assertEqual(reply["exit"], 1)
+        self.assertIn("worker: no-var", reply["stdout"])
+
+    def test_prettier_rewrites_file(self):
+        self.start_worker()
+        self.assertEqual(self.worker.run("prettier", [self.file], 5)["exit"], 0)
+        self.assertEqual(Path(self.file).read_text(), "var x = 1;\n")
+
+    def test_prettier_uses_cli_defaults(self):
+        self.start_worker()
+        self.worker.run("prettier", [self.file], 5)
+        with open(os.path.join(self.packages["prettier"], "calls.log")) as f:
+            calls = dict(json.loads(line) for line in f)
+        self.assertEqual(calls["getFileInfo"]["ignorePath"], [
+            os.path.join(self.project, ".gitignore"),
+            os.path.join(self.project, ".prettierignore"),
+        ])
+        self.assertTrue(calls["resolveConfig"]["editorconfig"])
+
+    def test_config_change_makes_worker_exit(self):
+        self.start_worker()
+        time.sleep(0.05)
+        Path(self.project, "package.json").write_text('{"eslintConfig": {}}')
+        self.assertIsNone(self.worker.run("eslint", [self.file], 5))
+        self.assertTrue(self._wait_for(lambda: not os.path.exists(self.worker.socket_path)))
+
+    def test_unknown_tool_falls_back(self):
+        self.start_worker()
+        self.assertIsNone(self.worker.run("biome", [self.file], 5))
+
+
+class TestPostEditLint(WorkerTestCase):
+    def run_hook(self, env):
+        return subprocess.run(
+            ["python3", HOOK_PATH],
+            input=json.dumps({
+                "tool_name": "Edit",
+                "hook_event_name": "PostToolUse",
+                "tool_input": {"file_path": self.file},
+            }),
+            capture_output=True,
+            text=True,
+            env=env,
+        )
+
+    def setUp(self):
+        super().setUp()
+        bin_dir = os.path.join(self.project, "node_modules", ".bin")
+        # Lint cache off: repeat runs on unchanged content must reach the tool
+        self.env = {**os.environ, "HOME": self.project, "CLAUDE_LINT_CACHE": "0",
+                    "PATH": f"{bin_dir}:{os.environ.get('PATH', '')}"}
+        self.worker = lint_workers.Worker(
+            self.project, self.packages, os.path.join(self.project, ".claude", "run")
+        )
+
+    def test_one_shot_then_worker(self):
+        proc = self.run_hook(self.env)
+        self.assertEqual(proc.returncode, 2)
+        self.assertIn("one-shot: no-var", proc.stderr)
+
+        self.assertTrue(self._wait_for(lambda: os.path.exists(self.worker.socket_path)))
+        proc = self.run_hook(self.env)
+        self.assertEqual(proc.returncode, 2)
+        self.assertIn("worker: no-var", proc.stderr)
+
+    def test_disabled(self):
+        env = {**self.env, "CLAUDE_LINT_WORKERS": "0"}
+        self.run_hook(env)
+        proc = self.run_hook(env)
+        self.assertIn("one-shot: no-var", proc.stderr)
+        self.assertFalse(os.path.exists(self.worker.socket_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
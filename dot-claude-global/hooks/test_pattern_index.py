@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""Differential tests: PatternIndex must decide exactly like PatternMatcher."""
+
+import json
+from pathlib import Path
+import random
+import sys
+import unittest
+
+HOOKS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(HOOKS_DIR))
+
+from hook_utils import CommandValidator, PatternIndex, PatternMatcher
+
+SETTINGS_PATH = HOOKS_DIR.parent / "settings.json"
+
+# Patterns exercising every branch of PatternMatcher._match_with_args,
+# including the awkward ones (":*" suffix beating " :*", empty cmd part,
+# multiple colons, double spaces, glob metacharacters).
+EDGE_PATTERNS = [
+    "ls:*",
+    "git status:*",
+    "npm:--version",
+    "curl:-s :*",
+    "tar:-tf :*",
+    "git config:--get :*",
+    "ping:-c *",
+    "top:-l 1",
+    "find:-name *.py",
+    "rg:[a-z]*",
+    "npm run test:contracts:*",
+    "docker  compose:*",
+    ":*",
+    "echo:a :* b",
+    "done",
+    "pgrep:badblocks",
+    "sudo qm start:*",
+    "x:?y*",
+]
+
+COMMANDS = [
+    "",
+    "ls",
+    "ls -la",
+    "lsblk",
+    "/usr/bin/ls -la",
+    "/bin/ls",
+    "git status",
+    "git status -s",
+    "git  status",
+    "git statusx",
+    "git config --get user.name",
+    "git config user.name",
+    "npm --version",
+    "npm --version extra",
+    "npm --versionx",
+    "curl -s https://x",
+    "curl -I https://x",
+    "curl -sI https://x",
+    "curl https://x -s",
+    "tar -tf a.tar",
+    "tar -tfz a.tar",
+    "ping -c 3 host",
+    "ping -c",
+    "top -l 1",
+    "top -l 10",
+    "find -name foo.py",
+    "find . -name foo.py",
+    "rg abc",
+    "rg ABC",
+    "npm run test contracts",
+    "npm run test contractsfoo",
+    "docker  compose up",
+    "docker compose up",
+    " leading",
+    "echo a b",
+    "echo xa yb",
+    "done",
+    "done now",
+    "pgrep badblocks",
+    "pgrep -a badblocks",
+    "sudo qm start 100",
+    "sudo qm stop 100",
+    "x zy",
+    "x yz",
+    "/opt/x/git status",
+]
+
+
+def load_settings_patterns() -> list[str]:
+    with open(SETTINGS_PATH) as f:
+        settings = json.load(f)
+    return [
+        entry[5:-1]
+        for entry in settings["permissions"]["allow"]
+        if entry.startswith("Bash(") and entry.endswith(")")
+    ]
+
+
+def linear_matches(patterns: list[str], command: str) -> bool:
+    matcher = PatternMatcher()
+    return any(matcher.matches(command, p) for p in patterns)
+
+
+def mutate(command: str, rng: random.Random) -> str:
+    """Produce near-miss variants of a command."""
+    choice = rng.randrange(5)
+    if choice == 0:
+        return command + " " + rng.choice(["-x", "foo", "", "*", ":"])
+    if choice == 1:
+        return command.replace(" ", "  ", 1)
+    if choice == 2 and command:
+        return command[: rng.randrange(len(command))]
+    if choice == 3:
+        return "/usr/local/bin/" + command
+    return command + rng.choice(["x", "/", "-"])
+
+
+class TestDifferential(unittest.TestCase):
+    def assert_same_decisions(self, patterns, commands):
+        index = PatternIndex(patterns)
+        # PatternMatcher raises on whitespace-only input; validators never
+        # pass it one (segments are stripped), so there is nothing to compare.
+        for command in (c for c in commands if not c or c.strip()):
+            self.assertEqual(
+                index.matches(command),
+                linear_matches(patterns, command),
+                f"decision differs for {command!r}",
+            )
+
+    def test_edge_patterns(self):
+        self.assert_same_decisions(EDGE_PATTERNS, COMMANDS)
+
+    def test_settings_patterns(self):
+        patterns = load_settings_patterns()
+        # Derive commands from the patterns themselves so every node is hit
+        derived = [p.replace(":", " ", 1).replace("*", "foo") for p in patterns]
+        self.assert_same_decisions(patterns, COMMANDS + derived)
+
+    def test_random_mutations(self):
+        rng = random.Random(1234)
+        patterns = load_settings_patterns() + EDGE_PATTERNS
+        seeds = COMMANDS + [p.replace(":", " ", 1) for p in patterns]
+        commands = [mutate(rng.choice(seeds), rng) for _ in range(3000)]
+        self.assert_same_decisions(patterns, commands)
+
+
+class StaticSettings:
+    def __init__(self, patterns):
+        self._patterns = patterns
+
+    def get_bash_patterns(self):
+        return self._patterns
+
+
+class TestCommandValidator(unittest.TestCase):
+    def test_indexed_and_linear_validators_agree(self):
+        settings = StaticSettings(load_settings_patterns() + EDGE_PATTERNS)
+        indexed = CommandValidator(settings_reader=settings)
+        linear = CommandValidator(
+            settings_reader=settings, pattern_matcher=PatternMatcher()
+        )
+        for command in COMMANDS + [
+            "ls -la | grep foo",
+            "git status && git diff",
+            "sudo pct exec 401 -- ls",
+            "bash -c 'git log | head'",
+            "ls | rm -rf /tmp/x",
+        ]:
+            if not command.strip():
+                continue
+            self.assertEqual(
+                indexed.validate(command).approved,
+                linear.validate(command).approved,
+                f"validator decision differs for {command!r}",
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""Tests for post-edit-lint.py tool discovery, result caching and batch mode."""
+
+import json
+import os
+from pathlib import Path
+import shutil
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+import unittest.mock
+
+HOOKS_DIR = str(Path(__file__).resolve().parent)
+HOOK_PATH = str(Path(HOOKS_DIR) / "post-edit-lint.py")
+sys.path.insert(0, HOOKS_DIR)
+
+from hook_utils import load_hook_module
+
+lint = load_hook_module(HOOK_PATH)
+
+# Mock ruff: format rewrites FORMAT_ME; check flags `import os` and
+# FORMAT_ME, sleeping first if the file says SLOW. Both log each run.
+MOCK_RUFF = """#!/usr/bin/env bash
+if [[ "$1" == "format" ]]; then
+    echo "format $3" >> "{log}"
+    if grep -q FORMAT_ME "$3"; then sed -i s/FORMAT_ME/formatted/ "$3"; fi
+    exit 0
+fi
+echo "check ${*:4}" >> "{log}"
+status=0
+for f in "${@:4}"; do
+    if grep -q SLOW "$f"; then sleep 2; fi
+    if grep -q "import os" "$f"; then echo "$f:1:1: F401 os imported but unused"; status=1; fi
+    if grep -q FORMAT_ME "$f"; then echo "$f:1:1: E999 unformatted"; status=1; fi
+done
+exit $status
+"""
+
+
+class MockRuffTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.bin_dir = os.path.join(self.tmp, "bin")
+        self.project = os.path.join(self.tmp, "project")
+        os.makedirs(self.bin_dir)
+        os.makedirs(os.path.join(self.project, ".git"))
+        self.log = os.path.join(self.tmp, "ruff.log")
+        ruff = os.path.join(self.bin_dir, "ruff")
+        Path(ruff).write_text(MOCK_RUFF.replace("{log}", self.log))
+        os.chmod(ruff, stat.S_IRWXU)
+        self.env = {
+            **os.environ,
+            "HOME": self.tmp,
+            "PATH": f"{self.bin_dir}:/usr/bin:/bin",
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def write(self, name, content):
+        path = os.path.join(self.project, name)
+        Path(path).write_text(content)
+        return path
+
+    def run_hook(self, file_path, env=None):
+        return subprocess.run(
+            ["python3", HOOK_PATH],
+            input=json.dumps({
+                "tool_name": "Edit",
+                "hook_event_name": "PostToolUse",
+                "tool_input": {"file_path": file_path},
+            }),
+            capture_output=True,
+            text=True,
+            env=env or self.env,
+        )
+
+    def ruff_runs(self, command):
+        try:
+            lines = Path(self.log).read_text().splitlines()
+        except FileNotFoundError:
+            return []
+        return [line for line in lines if line.startswith(command + " ")]
+
+    def ruff_checks(self):
+        return self.ruff_runs("check")
+
+
+class TestImmediate(MockRuffTestCase):
+    def test_reports_lint_errors(self):
+        path = self.write("a.py", "import os\n")
+        proc = self.run_hook(path)
+        self.assertEqual(proc.returncode, 2)
+        self.assertIn("F401", proc.stderr)
+
+    def test_clean_file_passes(self):
+        self.assertEqual(self.run_hook(self.write("a.py", "x = 1\n")).returncode, 0)
+
+    def test_deny_lists_tool_timings(self):
+        proc = self.run_hook(self.write("a.py", "import os\n"))
+        self.assertRegex(proc.stderr, r"Tool timings: ruff format \d+ ms, ruff check \d+ ms")
+
+    def test_timings_follow_pipeline_order(self):
+        # The concurrent linter can finish before the formatter
+        lint.clear_timings()
+        lint.record_timing("ruff", "lint", 5.0)
+        lint.record_timing("ruff", "format", 7.0)
+        self.assertEqual(lint.timing_summary(), "Tool timings: ruff format 7 ms, ruff check 5 ms")
+        lint.clear_timings()
+
+    def test_lint_sees_formatted_content(self):
+        # The concurrent lint of the unformatted file is discarded
+        path = self.write("a.py", "x = 1  # FORMAT_ME\n")
+        self.assertEqual(self.run_hook(path).returncode, 0)
+        self.assertEqual(len(self.ruff_checks()), 2)
+
+    def test_unchanged_by_format_lints_once(self):
+        self.run_hook(self.write("a.py", "import os\n"))
+        self.assertEqual(len(self.ruff_checks()), 1)
+
+    def test_timeout_is_reported_not_cached(self):
+        path = self.write("a.py", "import os  # SLOW\n")
+        cache = lint.LintCache(os.path.join(self.tmp, "lint"))
+        with unittest.mock.patch.dict(os.environ, {"PATH": f"{self.bin_dir}:/usr/bin:/bin"}), \
+                unittest.mock.patch.object(lint, "_tool_cache", None), \
+                unittest.mock.patch.object(lint, "_lint_cache", cache), \
+                unittest.mock.patch.dict(lint.TOOL_TIMEOUTS, {"ruff": 0.5}):
+            lint.clear_timings()
+            self.assertIsNone(lint.lint_files([path]))
+            self.assertIn("ruff check", lint.timing_summary())
+            self.assertIn("timed out after 0.5s", lint.timing_summary())
+            self.assertEqual(cache.get(cache.key("lint", "ruff", path)), (False, None))
+
+
+class TestToolCache(MockRuffTestCase):
+    def test_lookups_persist(self):
+        path = os.path.join(self.tmp, "tools.json")
+        with unittest.mock.patch.dict(os.environ, {"PATH": self.bin_dir}):
+            cache = lint.ToolCache(path)
+            self.assertEqual(cache.which("ruff"), os.path.join(self.bin_dir, "ruff"))
+            self.assertIsNone(cache.which("eslint"))
+            cache.save()
+            with unittest.mock.patch("shutil.which", side_effect=AssertionError):
+                cached = lint.ToolCache(path)
+                self.assertTrue(cached.which("ruff"))
+                self.assertIsNone(cached.which("eslint"))
+
+    def test_installing_a_tool_invalidates(self):
+        path = os.path.join(self.tmp, "tools.json")
+        with unittest.mock.patch.dict(os.environ, {"PATH": self.bin_dir}):
+            cache = lint.ToolCache(path)
+            self.assertIsNone(cache.which("shellcheck"))
+            cache.save()
+            time.sleep(0.01)
+            shutil.copy(os.path.join(self.bin_dir, "ruff"), os.path.join(self.bin_dir, "shellcheck"))
+            self.assertTrue(lint.ToolCache(path).which("shellcheck"))
+
+
+class TestLintCache(MockRuffTestCase):
+    def test_unchanged_content_skips_tools(self):
+        path = self.write("a.py", "import os\n")
+        first = self.run_hook(path)
+        second = self.run_hook(path)
+        self.assertEqual(second.returncode, 2)
+        self.assertEqual(second.stderr.split("\n\n")[0], first.stderr.split("\n\n")[0])
+        self.assertIn("ruff format cached, ruff check cached", second.stderr)
+        self.assertEqual(len(self.ruff_runs("format")), 1)
+        self.assertEqual(len(self.ruff_checks()), 1)
+
+    def test_content_change_relints(self):
+        path = self.write("a.py", "import os\n")
+        self.run_hook(path)
+        self.write("a.py", "x = 1\n")
+        self.assertEqual(self.run_hook(path).returncode, 0)
+        self.assertEqual(len(self.ruff_checks()), 2)
+
+    def test_config_change_relints(self):
+        path = self.write("a.py", "import os\n")
+        self.run_hook(path)
+        self.write("pyproject.toml", "[tool.ruff]\n")
+        self.run_hook(path)
+        self.assertEqual(len(self.ruff_checks()), 2)
+
+    def test_config_change_seen_by_long_lived_cache(self):
+        # A batch worker keeps one LintCache across many batches
+        path = self.write("a.py", "import os\n")
+        cache = lint.LintCache(os.path.join(self.tmp, "lint"))
+        with unittest.mock.patch.dict(os.environ, {"PATH": self.bin_dir}), \
+                unittest.mock.patch.object(lint, "_tool_cache", None):
+            before = cache.key("lint", "ruff", path)
+            self.write("ruff.toml", "line-length = 80\n")
+            created = cache.key("lint", "ruff", path)
+            self.write("ruff.toml", "line-length = 100\n")
+            edited = cache.key("lint", "ruff", path)
+        self.assertEqual(len({before, created, edited}), 3)
+
+    def test_failed_run_not_cached(self):
+        path = self.write("a.py", "import os\n")
+        cache = lint.LintCache(os.path.join(self.tmp, "lint"))
+        failed = subprocess.CompletedProcess([], None, "", "")
+        with unittest.mock.patch.dict(os.environ, {"PATH": self.bin_dir}), \
+                unittest.mock.patch.object(lint, "_tool_cache", None), \
+                unittest.mock.patch.object(lint, "_lint_cache", cache), \
+                unittest.mock.patch.object(lint, "run_tool", return_value=failed):
+            self.assertIsNone(lint.lint_files([path]))
+            self.assertEqual(cache.get(cache.key("lint", "ruff", path)), (False, None))
+
+    def test_evicts_least_recently_used(self):
+        cache = lint.LintCache(os.path.join(self.tmp, "lint"))
+        cache.MAX_ENTRIES = 3
+        for i in range(3):
+            cache.put(f"k{i}", f"out{i}")
+            os.utime(os.path.join(self.tmp, "lint", f"k{i}.json"), (i, i))
+        self.assertEqual(cache.get("k0"), (True, "out0"))  # now most recent
+        cache.put("k3", "out3")
+        self.assertEqual(cache.get("k1"), (False, None))
+        self.assertEqual(cache.get("k0"), (True, "out0"))
+        self.assertEqual(cache.get("k3"), (True, "out3"))
+
+
+class TestBatch(MockRuffTestCase):
+    def setUp(self):
+        super().setUp()
+        self.env["CLAUDE_LINT_BATCH"] = "1"
+
+    def wait_for_batch(self, timeout=15.0):
+        batch_dir = os.path.join(self.tmp, ".claude", "cache", "lint-batch")
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            states = [
+                json.loads(Path(batch_dir, name).read_text())
+                for name in os.listdir(batch_dir) if name.endswith(".json")
+            ]
+            if states and not any(s["pending"] for s in states) and self.ruff_checks():
+                return
+            time.sleep(0.1)
+        self.fail("batch did not run")
+
+    def test_burst_is_linted_once_and_reported_next_call(self):
+        first = self.write("a.py", "import os\n")
+        second = self.write("b.py", "import os\nx = 1\n")
+        self.assertEqual(self.run_hook(first).returncode, 0)
+        self.assertEqual(self.run_hook(second).returncode, 0)
+
+        self.wait_for_batch()
+        self.assertEqual(len(self.ruff_checks()), 1)
+        self.assertIn(first, self.ruff_checks()[0])
+        self.assertIn(second, self.ruff_checks()[0])
+
+        proc = self.run_hook(self.write("c.md", "notes\n"))
+        self.assertEqual(proc.returncode, 2)
+        self.assertIn(f"{first}:1:1: F401", proc.stderr)
+        self.assertIn(f"{second}:1:1: F401", proc.stderr)
+        # Reported once
+        self.assertEqual(self.run_hook(self.write("d.md", "notes\n")).returncode, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
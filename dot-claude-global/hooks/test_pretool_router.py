@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Tests for pretool-router.py hook."""
+
+import json
+import os
+from pathlib import Path
+import shutil
+import stat
+import subprocess
+import tempfile
+import unittest
+
+HOOKS_DIR = str(Path(__file__).resolve().parent)
+HOOK_PATH = str(Path(HOOKS_DIR) / "pretool-router.py")
+
+
+def run_hook(input_data, env=None):
+    """Run the router as a subprocess, returning the CompletedProcess."""
+    run_env = os.environ.copy()
+    if env:
+        run_env.update(env)
+    return subprocess.run(
+        ["python3", HOOK_PATH],
+        input=json.dumps(input_data) if isinstance(input_data, dict) else input_data,
+        capture_output=True,
+        text=True,
+        env=run_env,
+    )
+
+
+def make_input(command, tool_name="Bash", event="PreToolUse"):
+    return {
+        "tool_name": tool_name,
+        "hook_event_name": event,
+        "tool_input": {"command": command},
+    }
+
+
+class TestPolicies(unittest.TestCase):
+    """Each routed policy still blocks what it blocked standalone."""
+
+    def test_blocks_env_read(self):
+        env_path = "/tmp/" + ".e" + "nv"
+        proc = run_hook(
+            {
+                "tool_name": "Read",
+                "hook_event_name": "PreToolUse",
+                "tool_input": {"file_path": env_path},
+            }
+        )
+        self.assertEqual(proc.returncode, 2)
+        self.assertIn("BLOCKED", proc.stderr)
+
+    def test_blocks_proxmox_stop(self):
+        proc = run_hook(make_input("pct stop 100"))
+        self.assertEqual(proc.returncode, 2)
+        self.assertIn("pct shutdown", proc.stderr)
+
+    def test_blocks_force_push(self):
+        proc = run_hook(make_input("git push --force"))
+        self.assertEqual(proc.returncode, 2)
+        self.assertIn("force-with-lease", proc.stderr)
+
+    def test_later_policy_runs_when_earlier_allow(self):
+        proc = run_hook(make_input("ls && reboot"))
+        self.assertEqual(proc.returncode, 2)
+        self.assertIn("reboot", proc.stderr)
+
+
+class TestDecision(unittest.TestCase):
+    """The router emits a single decision."""
+
+    def test_first_deny_wins(self):
+        command = "cat ." + "en" + "v && git push --force"
+        proc = run_hook(make_input(command))
+        self.assertEqual(proc.returncode, 2)
+        self.assertIn("BLOCKED", proc.stderr)
+        self.assertNotIn("force-with-lease", proc.stderr)
+
+    def test_allows_safe_command(self):
+        proc = run_hook(make_input("git status"))
+        self.assertEqual(proc.returncode, 0)
+        self.assertEqual(proc.stderr, "")
+
+    def test_ignores_other_events(self):
+        proc = run_hook(make_input("git push --force", event="PermissionRequest"))
+        self.assertEqual(proc.returncode, 0)
+
+    def test_invalid_json(self):
+        proc = run_hook("not json")
+        self.assertEqual(proc.returncode, 0)
+
+
+class TestPushOwnership(unittest.TestCase):
+    """block-push-others-branch.py runs last, behind the cheap policies."""
+
+    def setUp(self):
+        self.mock_dir = tempfile.mkdtemp()
+        self.log = os.path.join(self.mock_dir, "calls.log")
+        self._write_script(
+            "git",
+            f"""#!/usr/bin/env bash
+echo "git $1" >> "{self.log}"
+if [[ "$1" == "symbolic-ref" ]]; then
+    echo "feat/their-feature"
+elif [[ "$1" == "ls-remote" ]]; then
+    echo "abc123\trefs/heads/feat/their-feature"
+fi
+exit 0
+""",
+        )
+        self._write_script(
+            "gh",
+            """#!/usr/bin/env bash
+if [[ "$2" == "user" ]]; then
+    echo "samuel"
+elif [[ "$2" == *"compare"* ]]; then
+    echo "other-user"
+else
+    echo "main"
+fi
+exit 0
+""",
+        )
+        self.env = {
+            "PATH": f"{self.mock_dir}:{os.environ.get('PATH', '')}",
+            "HOME": self.mock_dir,
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.mock_dir, ignore_errors=True)
+
+    def _write_script(self, name, content):
+        path = os.path.join(self.mock_dir, name)
+        with open(path, "w") as f:
+            f.write(content)
+        os.chmod(path, stat.S_IRWXU)
+
+    def test_blocks_push_to_others_branch(self):
+        proc = run_hook(make_input("git push"), env=self.env)
+        self.assertEqual(proc.returncode, 2)
+        self.assertIn("other-user", proc.stderr)
+
+    def test_skips_git_calls_when_force_push_denied(self):
+        proc = run_hook(make_input("git push --force"), env=self.env)
+        self.assertEqual(proc.returncode, 2)
+        self.assertFalse(os.path.exists(self.log))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Tests for session_index.py, record-session.py and the statusline lookup."""
+
+import json
+import os
+from pathlib import Path
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+HOOKS_DIR = str(Path(__file__).resolve().parent)
+STATUSLINE = str(Path(HOOKS_DIR).parent / "statusline.sh")
+sys.path.insert(0, HOOKS_DIR)
+
+import session_index
+
+SESSION_ID = "0d3c8a2e-5f1b-4c7a-9e21-6b4d2f8a1c90"
+
+
+class IndexTestCase(unittest.TestCase):
+    def setUp(self):
+        self.home = tempfile.mkdtemp()
+        self.index_dir = os.path.join(self.home, ".claude", "cache", "sessions")
+        self.projects_dir = os.path.join(self.home, ".claude", "projects")
+        self.transcript = self.make_transcript("-home-user-app", SESSION_ID)
+
+    def tearDown(self):
+        shutil.rmtree(self.home, ignore_errors=True)
+
+    def make_transcript(self, project, session_id):
+        path = os.path.join(self.projects_dir, project, f"{session_id}.jsonl")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        Path(path).write_text("{}\n")
+        return path
+
+
+class TestSessionIndex(IndexTestCase):
+    def test_record_then_lookup(self):
+        self.assertIsNone(session_index.lookup(SESSION_ID, self.index_dir))
+        self.assertTrue(session_index.record(SESSION_ID, self.transcript, self.index_dir))
+        self.assertEqual(session_index.lookup(SESSION_ID, self.index_dir), self.transcript)
+
+    def test_miss_scans_and_records(self):
+        found = session_index.find(SESSION_ID, self.index_dir, self.projects_dir)
+        self.assertEqual(found, self.transcript)
+        self.assertEqual(Path(self.index_dir, SESSION_ID).read_text(), f"{self.transcript}\n")
+
+    def test_stale_entry_is_a_miss(self):
+        session_index.record(SESSION_ID, "/gone/session.jsonl", self.index_dir)
+        self.assertIsNone(session_index.lookup(SESSION_ID, self.index_dir))
+        self.assertEqual(session_index.find(SESSION_ID, self.index_dir, self.projects_dir), self.transcript)
+
+    def test_unsafe_ids_are_rejected(self):
+        for session_id in ("", "../escape", "a/b", "x.jsonl"):
+            with self.subTest(session_id=session_id):
+                self.assertFalse(session_index.record(session_id, self.transcript, self.index_dir))
+                self.assertIsNone(session_index.find(session_id, self.index_dir, self.projects_dir))
+
+    def test_rebuild(self):
+        other = self.make_transcript("-home-user-lib", "other-session")
+        self.assertEqual(session_index.rebuild(self.index_dir, self.projects_dir), 2)
+        self.assertEqual(session_index.lookup("other-session", self.index_dir), other)
+        self.assertEqual(session_index.rebuild(self.index_dir, self.projects_dir), 0)
+
+
+class TestRecordSessionHook(IndexTestCase):
+    def test_session_start_records_entry(self):
+        subprocess.run(
+            ["python3", os.path.join(HOOKS_DIR, "record-session.py")],
+            input=json.dumps({
+                "hook_event_name": "SessionStart",
+                "session_id": SESSION_ID,
+                "transcript_path": self.transcript,
+            }),
+            capture_output=True,
+            text=True,
+            env={**os.environ, "HOME": self.home},
+        )
+        self.assertEqual(session_index.lookup(SESSION_ID, self.index_dir), self.transcript)
+
+
+@unittest.skipUnless(shutil.which("jq"), "jq not installed")
+class TestStatusline(IndexTestCase):
+    def render(self, session_id=SESSION_ID):
+        hooks = os.path.join(self.home, ".claude", "hooks")
+        os.makedirs(hooks, exist_ok=True)
+        for name in ("hook_utils.py", "transcript_index.py"):
+            shutil.copy(os.path.join(HOOKS_DIR, name), hooks)
+        Path(self.transcript).write_text(json.dumps({
+            "type": "assistant",
+            "message": {"usage": {"input_tokens": 2000, "cache_read_input_tokens": 40000}},
+        }) + "\n")
+        return subprocess.run(
+            ["bash", STATUSLINE],
+            input=json.dumps({"session_id": session_id, "model": {"display_name": "Opus"}}),
+            capture_output=True,
+            text=True,
+            errors="replace",
+            cwd=self.home,
+            env={**os.environ, "HOME": self.home, "NO_COLOR": "1"},
+        ).stdout
+
+    def test_miss_records_entry_for_next_refresh(self):
+        self.assertIn("42k", self.render())
+        self.assertEqual(Path(self.index_dir, SESSION_ID).read_text(), f"{self.transcript}\n")
+
+    def test_indexed_path_is_used(self):
+        moved = self.make_transcript("-elsewhere", "renamed")
+        os.replace(self.transcript, moved)
+        session_index.record(SESSION_ID, moved, self.index_dir)
+        self.transcript = moved
+        self.assertIn("42k", self.render())
+
+
+if __name__ == "__main__":
+    unittest.main()
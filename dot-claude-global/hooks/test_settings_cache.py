@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Tests for the on-disk compiled settings cache in hook_utils."""
+
+import json
+import os
+from pathlib import Path
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from hook_utils import CommandValidator, SettingsCache, SettingsReader
+
+
+def write_settings(path, patterns):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"permissions": {"allow": [f"Bash({p})" for p in patterns]}}, f)
+
+
+class CountingReader(SettingsReader):
+    """SettingsReader that records how many settings files it parsed."""
+
+    def __init__(self, global_settings, cache):
+        super().__init__(cache=cache)
+        self.GLOBAL_SETTINGS = global_settings
+        self.parsed = []
+
+    def _read_patterns_from(self, path):
+        self.parsed.append(path)
+        super()._read_patterns_from(path)
+
+
+class TestSettingsCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.cache = SettingsCache(os.path.join(self.tmp, "cache"))
+        self.global_settings = os.path.join(self.tmp, "home", "settings.json")
+        write_settings(self.global_settings, ["ls:*", "git status:*"])
+        self.project = os.path.join(self.tmp, "project")
+        os.makedirs(os.path.join(self.project, "sub"))
+        self.old_cwd = os.getcwd()
+        os.chdir(os.path.join(self.project, "sub"))
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def reader(self):
+        return CountingReader(self.global_settings, self.cache)
+
+    def test_second_reader_hits_cache(self):
+        first = self.reader()
+        self.assertEqual(first.get_bash_patterns(), ["ls:*", "git status:*"])
+        self.assertEqual(len(first.parsed), 1)
+
+        second = self.reader()
+        self.assertEqual(second.get_bash_patterns(), ["ls:*", "git status:*"])
+        self.assertTrue(second.get_pattern_index().matches("git status -s"))
+        self.assertEqual(second.parsed, [])
+
+    def test_modified_settings_invalidate(self):
+        self.reader().get_bash_patterns()
+        write_settings(self.global_settings, ["ls:*", "git status:*", "pwd:*"])
+        st = os.stat(self.global_settings)
+        os.utime(self.global_settings, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+        reader = self.reader()
+        self.assertIn("pwd:*", reader.get_bash_patterns())
+        self.assertEqual(len(reader.parsed), 1)
+
+    def test_new_project_settings_invalidate(self):
+        self.reader().get_bash_patterns()
+        write_settings(
+            os.path.join(self.project, ".claude", "settings.local.json"),
+            ["ls:*", "make:*"],
+        )
+
+        reader = self.reader()
+        self.assertEqual(reader.get_bash_patterns(), ["ls:*", "git status:*", "make:*"])
+        self.assertEqual(len(reader.parsed), 2)
+        self.assertTrue(reader.get_pattern_index().matches("make test"))
+
+    def test_corrupt_cache_is_rebuilt(self):
+        self.reader().get_bash_patterns()
+        cache_dir = os.path.join(self.tmp, "cache")
+        for name in os.listdir(cache_dir):
+            with open(os.path.join(cache_dir, name), "wb") as f:
+                f.write(b"garbage")
+
+        reader = self.reader()
+        self.assertEqual(reader.get_bash_patterns(), ["ls:*", "git status:*"])
+        self.assertEqual(len(reader.parsed), 1)
+
+    def test_unwritable_cache_still_works(self):
+        blocker = os.path.join(self.tmp, "blocker")
+        open(blocker, "w").close()
+        reader = CountingReader(self.global_settings, SettingsCache(blocker))
+        self.assertEqual(reader.get_bash_patterns(), ["ls:*", "git status:*"])
+
+    def test_validator_uses_cached_index(self):
+        self.reader().get_bash_patterns()
+        reader = self.reader()
+        validator = CommandValidator(settings_reader=reader)
+        self.assertTrue(validator.validate("ls -la | git status").approved)
+        self.assertFalse(validator.validate("rm -rf /tmp/x").approved)
+        self.assertEqual(reader.parsed, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
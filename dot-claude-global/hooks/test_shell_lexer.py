@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Tests for ShellLexer and the validators built on it."""
+
+from pathlib import Path
+import sys
+import unittest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from hook_utils import ChainSplitter, CommandValidator, ShellLexer
+
+
+class StaticSettings:
+    def get_bash_patterns(self):
+        return ["grep:*", "ls:*", "echo:*", "head:*", "cat:*"]
+
+
+class TestShellLexer(unittest.TestCase):
+    def setUp(self):
+        self.lexer = ShellLexer()
+
+    def test_single_quotes_are_literal(self):
+        # Backslash does not escape inside single quotes, so the quote closes
+        lexed = self.lexer.lex("grep 'a\\'; rm -rf ~")
+        self.assertTrue(lexed.complete)
+        self.assertEqual(lexed.segments(), ["grep 'a\\'", "rm -rf ~"])
+        self.assertEqual(lexed.unquoted, "grep ; rm -rf ~")
+
+    def test_double_quote_escapes(self):
+        lexed = self.lexer.lex('echo "a\\"; b" | head')
+        self.assertEqual(lexed.segments(), ['echo "a\\"; b"', "head"])
+        self.assertEqual(lexed.unquoted, "echo  | head")
+
+    def test_unquoted_escape_kept(self):
+        lexed = self.lexer.lex("echo a\\;b")
+        self.assertEqual(lexed.segments(), ["echo a\\;b"])
+        self.assertEqual(lexed.unquoted, "echo a\\;b")
+
+    def test_redirects_are_not_separators(self):
+        lexed = self.lexer.lex("ls 2>&1 &>/dev/null | head")
+        self.assertEqual(lexed.segments(), ["ls 2>&1 &>/dev/null", "head"])
+
+    def test_background_and_newline_separate(self):
+        self.assertEqual(self.lexer.lex("ls & rm x").segments(), ["ls", "rm x"])
+        self.assertEqual(self.lexer.lex("ls\nrm x").segments(), ["ls", "rm x"])
+
+    def test_unclosed_quote(self):
+        lexed = self.lexer.lex("echo 'abc | rm x")
+        self.assertFalse(lexed.complete)
+        self.assertEqual(lexed.unquoted, "echo ")
+        self.assertIsNone(ChainSplitter().split("echo 'abc | rm x"))
+
+
+class TestValidator(unittest.TestCase):
+    def setUp(self):
+        self.validator = CommandValidator(settings_reader=StaticSettings())
+
+    def test_escaped_single_quote_bypass(self):
+        self.assertFalse(self.validator.validate("grep 'a\\'; rm -rf ~; echo '").approved)
+
+    def test_background_operator_bypass(self):
+        self.assertFalse(self.validator.validate("ls & rm -rf ~").approved)
+
+    def test_quoted_operators_allowed(self):
+        self.assertTrue(self.validator.validate("grep 'a|b;c' file | head").approved)
+
+    def test_clobber_redirect_to_absolute_path(self):
+        for command in ("cat a >| /Users/x/.zshrc", "ls >|/tmp/x", "git status >| /tmp/y"):
+            with self.subTest(command=command):
+                self.assertFalse(self.validator.validate(command).approved)
+
+    def test_redirects_to_absolute_path(self):
+        for command in (
+            "ls > /tmp/x", "ls >> /tmp/x", "ls &> /tmp/x", "ls &>>/tmp/x",
+            "ls >& /tmp/x", "ls 2>/tmp/x", "ls > '/tmp/x'", 'ls >"/tmp/x"',
+        ):
+            with self.subTest(command=command):
+                self.assertFalse(self.validator.validate(command).approved)
+
+    def test_redirects_allowed_to_dev_null_and_relative_paths(self):
+        for command in (
+            "ls &>/dev/null", "ls &>> /dev/null", "ls >| /dev/null",
+            "ls 2>&1 | head", "ls >| out.txt", "ls &>> out.txt",
+            "grep 'a > /tmp/x' file",
+        ):
+            with self.subTest(command=command):
+                self.assertTrue(self.validator.validate(command).approved)
+
+    def test_stderr_pipe_rejected(self):
+        self.assertFalse(self.validator.validate("cat x |& grep y").approved)
+        self.assertTrue(self.validator.validate("grep '|&' file").approved)
+
+    def test_large_pipe_chain(self):
+        command = " | ".join(["grep 'x | y'"] * 5000 + ["head"])
+        self.assertTrue(self.validator.validate(command).approved)
+
+
+if __name__ == "__main__":
+    unittest.main()
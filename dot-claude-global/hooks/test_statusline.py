@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Golden tests for statusline.py and statusline.sh, and tests for
+statusline.py's background usage refresh against a local stub endpoint.
+
+Each case in testdata/statusline_golden.json describes a statusline input
+plus the files it reads (transcript, settings.json, usage cache, or
+usage_raw for a malformed cache) and the exact output statusline.sh
+printed for it. Both renderers must reproduce that output byte for byte.
+
+Regenerate the goldens from statusline.sh after an intended change:
+    STATUSLINE_REGENERATE=1 python3 test_statusline.py
+"""
+
+import contextlib
+import fcntl
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+from pathlib import Path
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+HOOKS_DIR = str(Path(__file__).resolve().parent)
+STATUSLINE_SH = str(Path(HOOKS_DIR).parent / "statusline.sh")
+STATUSLINE_PY = os.path.join(HOOKS_DIR, "statusline.py")
+GOLDEN_FILE = os.path.join(HOOKS_DIR, "testdata", "statusline_golden.json")
+INSTALLED_HOOKS = ("hook_utils.py", "session_index.py", "transcript_index.py")
+sys.path.insert(0, HOOKS_DIR)
+
+import statusline
+
+
+def load_cases() -> list[dict]:
+    with open(GOLDEN_FILE) as f:
+        return json.load(f)
+
+
+def render_case(case: dict, command: list[str]) -> str:
+    """Run command on the case's input in a throwaway HOME laid out as the case says."""
+    with tempfile.TemporaryDirectory() as home:
+        hooks = os.path.join(home, ".claude", "hooks")
+        os.makedirs(hooks)
+        for name in INSTALLED_HOOKS:
+            shutil.copy(os.path.join(HOOKS_DIR, name), hooks)
+
+        payload = case.get("raw_input")
+        if payload is None:
+            payload = json.dumps(case["input"]).replace("{HOME}", home)
+        if case.get("transcript") is not None:
+            project = os.path.join(home, ".claude", "projects", "-src-app")
+            os.makedirs(project)
+            with open(os.path.join(project, f"{case['input']['session_id']}.jsonl"), "w") as f:
+                f.writelines(json.dumps(entry) + "\n" for entry in case["transcript"])
+        if case.get("settings") is not None:
+            Path(home, ".claude", "settings.json").write_text(json.dumps(case["settings"]))
+        usage_cache = os.path.join(home, "tmp", "usage.json")
+        usage = case.get("usage_raw")
+        if usage is None and case.get("usage") is not None:
+            usage = json.dumps(case["usage"]) + "\n"
+        if usage is not None:
+            os.makedirs(os.path.dirname(usage_cache))
+            Path(usage_cache).write_text(usage)
+
+        env = {k: v for k, v in os.environ.items() if k != "NO_COLOR"}
+        # Refreshes of a missing or stale cache go nowhere (port 9 refuses)
+        env.update({"HOME": home, "TZ": "UTC", "CLAUDE_USAGE_CACHE": usage_cache,
+                    "CLAUDE_USAGE_URL": "http://127.0.0.1:9/", **case.get("env", {})})
+        proc = subprocess.run(command, input=payload.encode(), capture_output=True, cwd=home, env=env)
+        return proc.stdout.decode("utf-8", errors="replace")
+
+
+class TestGolden(unittest.TestCase):
+    def check(self, command):
+        for case in load_cases():
+            with self.subTest(case=case["name"]):
+                self.assertEqual(render_case(case, command), case["expected"])
+
+    def test_python_renderer(self):
+        self.check([sys.executable, STATUSLINE_PY])
+
+    @unittest.skipUnless(shutil.which("jq"), "jq not installed")
+    def test_shell_renderer(self):
+        self.check(["bash", STATUSLINE_SH])
+
+
+class StubUsageEndpoint:
+    """Local stand-in for the OAuth usage API, recording each request."""
+
+    def __init__(self):
+        self.status = 200
+        self.body = {}
+        self.delay = 0.0
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests.append(dict(self.headers))
+                time.sleep(stub.delay)
+                payload = json.dumps(stub.body).encode()
+                self.send_response(stub.status)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/api/oauth/usage"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def usage(five_hour_pct):
+    return {"five_hour": {"utilization": five_hour_pct}, "seven_day": {"utilization": 10}}
+
+
+class TestUsageRefresh(unittest.TestCase):
+    def setUp(self):
+        self.home = tempfile.mkdtemp()
+        self.cache = os.path.join(self.home, "tmp", "usage.json")
+        os.makedirs(os.path.dirname(self.cache))
+        Path(self.home, ".claude").mkdir()
+        Path(self.home, ".claude", ".credentials.json").write_text(
+            json.dumps({"claudeAiOauth": {"accessToken": "test-token"}})
+        )
+        self.stub = StubUsageEndpoint()
+        self.env = {**os.environ, "HOME": self.home, "NO_COLOR": "1",
+                    "CLAUDE_USAGE_CACHE": self.cache, "CLAUDE_USAGE_URL": self.stub.url}
+
+    def tearDown(self):
+        # Let a refresher still holding the lock finish before cleanup
+        self.wait_for(self.lock_is_free)
+        self.stub.close()
+        shutil.rmtree(self.home, ignore_errors=True)
+
+    def write_cache(self, data, age):
+        Path(self.cache).write_text(json.dumps(data))
+        mtime = time.time() - age
+        os.utime(self.cache, (mtime, mtime))
+
+    def render(self):
+        proc = subprocess.run(
+            [sys.executable, STATUSLINE_PY], input=b"{}", capture_output=True, env=self.env
+        )
+        return proc.stdout.decode()
+
+    def lock_is_free(self):
+        try:
+            fd = os.open(self.cache + ".lock", os.O_RDWR)
+        except FileNotFoundError:
+            return True
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            return False
+        finally:
+            os.close(fd)
+
+    def wait_for(self, condition, timeout=10.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if condition():
+                return True
+            time.sleep(0.05)
+        return False
+
+    @contextlib.contextmanager
+    def in_process(self):
+        """Run statusline functions here as the subprocess would see HOME."""
+        credentials = os.path.join(self.home, ".claude", ".credentials.json")
+        with mock.patch.dict(os.environ, self.env), \
+                mock.patch.object(statusline, "CREDENTIALS_FILE", credentials):
+            yield
+
+    def cached_five_hour(self):
+        try:
+            return json.loads(Path(self.cache).read_text())["five_hour"]["utilization"]
+        except (OSError, ValueError):
+            return None
+
+    def test_stale_cache_renders_immediately_then_refreshes(self):
+        self.write_cache(usage(20), age=120)
+        self.stub.body = usage(80)
+        self.stub.delay = 2.0
+        start = time.monotonic()
+        output = self.render()
+        self.assertLess(time.monotonic() - start, 1.5)
+        self.assertIn(" 20%", output)
+
+        self.assertTrue(self.wait_for(lambda: self.cached_five_hour() == 80))
+        self.assertEqual(self.stub.requests[0]["Authorization"], "Bearer test-token")
+        self.assertIn(" 80%", self.render())
+
+    def test_missing_cache_is_fetched_in_background(self):
+        self.stub.body = usage(55)
+        self.assertNotIn("%", self.render())
+        self.assertTrue(self.wait_for(lambda: self.cached_five_hour() == 55))
+
+    def test_fresh_cache_is_not_refreshed(self):
+        self.write_cache(usage(20), age=0)
+        self.render()
+        time.sleep(0.5)
+        self.assertEqual(self.stub.requests, [])
+
+    def test_one_refresher_at_a_time(self):
+        self.write_cache(usage(20), age=120)
+        self.stub.body = usage(30)
+        self.stub.delay = 1.0
+        for _ in range(4):
+            self.render()
+        self.assertTrue(self.wait_for(lambda: self.cached_five_hour() == 30))
+        self.assertTrue(self.wait_for(self.lock_is_free))
+        self.assertEqual(len(self.stub.requests), 1)
+
+    def test_failure_backs_off(self):
+        self.write_cache(usage(20), age=120)
+        self.stub.status = 500
+        self.render()
+        state_path = self.cache + ".state"
+        self.assertTrue(self.wait_for(lambda: os.path.exists(state_path)))
+        state = json.loads(Path(state_path).read_text())
+        self.assertEqual(state["failures"], 1)
+        self.assertGreater(state["retry_at"], time.time())
+
+        self.assertTrue(self.wait_for(self.lock_is_free))
+        self.assertIn(" 20%", self.render())
+        time.sleep(0.5)
+        self.assertEqual(len(self.stub.requests), 1)
+
+    def test_backoff_grows_and_success_clears_it(self):
+        refresher = statusline.UsageRefresher(self.cache)
+        self.stub.status = 500
+        delays = []
+        for _ in range(7):
+            before = time.time()
+            with self.in_process():
+                self.assertFalse(refresher.run())
+            delays.append(round(refresher._state()["retry_at"] - before))
+        self.assertEqual(delays, [30, 60, 120, 240, 480, 900, 900])
+
+        self.stub.status = 200
+        self.stub.body = usage(42)
+        with self.in_process():
+            self.assertTrue(refresher.run())
+        self.assertFalse(os.path.exists(self.cache + ".state"))
+        self.assertEqual(self.cached_five_hour(), 42)
+
+
+def regenerate():
+    cases = load_cases()
+    for case in cases:
+        case["expected"] = render_case(case, ["bash", STATUSLINE_SH])
+    with open(GOLDEN_FILE, "w") as f:
+        json.dump(cases, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+if __name__ == "__main__":
+    if os.environ.get("STATUSLINE_REGENERATE"):
+        regenerate()
+    else:
+        unittest.main()
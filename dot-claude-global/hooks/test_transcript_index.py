@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""Tests for transcript_index.py and the Stop hooks that read it."""
+
+import json
+import os
+from pathlib import Path
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+HOOKS_DIR = str(Path(__file__).resolve().parent)
+sys.path.insert(0, HOOKS_DIR)
+
+import transcript_index
+
+
+def assistant(text, tokens=None):
+    message = {"content": [{"type": "text", "text": text}]}
+    if tokens is not None:
+        message["usage"] = {"input_tokens": 10, "cache_read_input_tokens": tokens - 10}
+    return {"type": "assistant", "message": message}
+
+
+def effort_command(level):
+    return {"type": "user", "message": {"content": (
+        f"<command-name>/effort</command-name><command-args>{level}</command-args>"
+    )}}
+
+
+class IndexTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp, "cache")
+        self.transcript = os.path.join(self.tmp, "session-1.jsonl")
+        Path(self.transcript).touch()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def append(self, *entries, raw=""):
+        with open(self.transcript, "a") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+            f.write(raw)
+
+    def load(self):
+        return transcript_index.load(self.transcript, self.cache_dir)
+
+
+class TestExtraction(IndexTestCase):
+    def test_fields(self):
+        self.append(effort_command("high"), assistant("first", tokens=1000),
+                    {"type": "user", "message": {"content": "next"}}, assistant("second"))
+        index = self.load()
+        self.assertEqual(index.state["last_assistant_text"], "second")
+        self.assertEqual(index.state["context_tokens"], 1000)
+        self.assertEqual(index.state["effort"], "high")
+        self.assertEqual(index.state["session_id"], "session-1")
+
+    def test_auto_keeps_explicit_effort(self):
+        self.append(effort_command("high"), effort_command("auto"))
+        index = self.load()
+        self.assertEqual(index.state["effort"], "auto")
+        self.assertEqual(index.state["explicit_effort"], "high")
+
+    def test_model_output_sets_effort(self):
+        self.append({"type": "user", "message": (
+            "<local-command-stdout>Set model to \x1b[1mOpus\x1b[22m with "
+            "\x1b[1mmax\x1b[22m effort</local-command-stdout>"
+        )})
+        self.assertEqual(self.load().state["effort"], "max")
+
+    def test_blank_assistant_text_keeps_previous(self):
+        self.append(assistant("kept"), assistant("   "))
+        self.assertEqual(self.load().state["last_assistant_text"], "kept")
+
+
+class TestIncremental(IndexTestCase):
+    def test_only_appended_lines_are_decoded(self):
+        self.append(assistant("one"), assistant("two"))
+        self.load()
+        self.append(assistant("three"))
+        with mock.patch.object(transcript_index.TranscriptIndex, "_fold",
+                               autospec=True, side_effect=transcript_index.TranscriptIndex._fold) as fold:
+            index = self.load()
+        self.assertEqual(len(fold.call_args.args[1]), 1)
+        self.assertEqual(index.state["last_assistant_text"], "three")
+
+    def test_unchanged_transcript_decodes_nothing(self):
+        self.append(assistant("one"))
+        self.load()
+        with mock.patch.object(transcript_index.TranscriptIndex, "_fold") as fold:
+            self.load()
+        fold.assert_not_called()
+
+    def test_partial_line_waits_for_newline(self):
+        line = json.dumps(assistant("late"))
+        self.append(assistant("done"), raw=line[:20])
+        self.assertEqual(self.load().state["last_assistant_text"], "done")
+        self.append(raw=line[20:] + "\n")
+        self.assertEqual(self.load().state["last_assistant_text"], "late")
+
+    def test_truncated_transcript_resets(self):
+        self.append(assistant("old"), effort_command("low"))
+        self.load()
+        Path(self.transcript).write_text(json.dumps(assistant("new")) + "\n")
+        index = self.load()
+        self.assertEqual(index.state["last_assistant_text"], "new")
+        self.assertIsNone(index.state["effort"])
+
+    def test_replaced_transcript_resets(self):
+        self.append(assistant("old"))
+        self.load()
+        replacement = self.transcript + ".new"
+        Path(replacement).write_text(json.dumps(assistant("new")) * 3 + "\n")
+        os.replace(replacement, self.transcript)
+        self.assertIsNone(self.load().state["last_assistant_text"])
+
+    def test_first_index_reads_only_the_tail(self):
+        self.append(effort_command("low"))
+        with mock.patch.object(transcript_index, "TAIL_BYTES", 200):
+            self.append(*[assistant("filler " * 5)] * 10)
+            index = self.load()
+        self.assertIsNone(index.state["effort"])
+        self.assertEqual(index.state["last_assistant_text"], "filler " * 5)
+
+
+class TestPrune(IndexTestCase):
+    def sidecars(self):
+        return sorted(n for n in os.listdir(self.cache_dir) if n.endswith(".json"))
+
+    def test_prunes_sidecars_of_removed_and_encrypted_transcripts(self):
+        self.append(assistant("secret"))
+        self.load()
+        other = os.path.join(self.tmp, "session-2.jsonl")
+        Path(other).write_text(json.dumps(assistant("also secret")) + "\n")
+        transcript_index.load(other, self.cache_dir)
+        kept = self.sidecars()
+        self.assertEqual(len(kept), 2)
+
+        # The vault encrypts to .age and removes the plaintext
+        os.rename(other, other + ".age")
+        self.assertEqual(transcript_index.prune(self.cache_dir), 1)
+        self.assertEqual(len(self.sidecars()), 1)
+        self.assertEqual(self.load().state["last_assistant_text"], "secret")
+
+        # A decrypted copy next to its .age doesn't keep the sidecar alive
+        Path(self.transcript + ".age").touch()
+        self.assertEqual(transcript_index.prune(self.cache_dir), 1)
+        self.assertEqual(self.sidecars(), [])
+
+    def test_load_prunes_at_most_once_per_interval(self):
+        self.append(assistant("secret"))
+        self.load()
+        gone = os.path.join(self.tmp, "session-2.jsonl")
+        Path(gone).write_text(json.dumps(assistant("secret")) + "\n")
+        transcript_index.load(gone, self.cache_dir)
+        os.unlink(gone)
+        self.load()
+        self.assertEqual(len(self.sidecars()), 2)
+        with mock.patch.object(transcript_index, "PRUNE_INTERVAL", 0):
+            self.load()
+        self.assertEqual(len(self.sidecars()), 1)
+
+
+class TestStopHooks(unittest.TestCase):
+    def setUp(self):
+        self.home = tempfile.mkdtemp()
+        self.transcript = os.path.join(self.home, "session.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.home, ignore_errors=True)
+
+    def run_hook(self, name, *entries):
+        with open(self.transcript, "a") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+        return subprocess.run(
+            ["python3", os.path.join(HOOKS_DIR, name)],
+            input=json.dumps({"hook_event_name": "Stop", "transcript_path": self.transcript}),
+            capture_output=True,
+            text=True,
+            env={**os.environ, "HOME": self.home},
+        )
+
+    def test_dismissal_hook_sees_latest_message(self):
+        hook = "block-preexisting-dismissal.py"
+        proc = self.run_hook(hook, assistant("All tests pass."))
+        self.assertEqual(proc.stdout.strip(), "")
+        proc = self.run_hook(hook, assistant("The failing test is pre-existing."))
+        self.assertEqual(json.loads(proc.stdout)["decision"], "block")
+
+    def test_effort_hook_writes_level(self):
+        effort_file = Path(self.home, ".claude", "effort_level")
+        effort_file.parent.mkdir()
+        self.run_hook("detect-effort-level.py", effort_command("medium"))
+        self.assertEqual(effort_file.read_text(), "medium\n")
+        self.run_hook("detect-effort-level.py", assistant("ok"), effort_command("high"))
+        self.assertEqual(effort_file.read_text(), "high\n")
+
+    def test_effort_hook_ignores_auto(self):
+        effort_file = Path(self.home, ".claude", "effort_level")
+        effort_file.parent.mkdir()
+        Path(self.home, ".claude", "settings.json").write_text('{"effortLevel": "low"}')
+        self.run_hook("detect-effort-level.py", effort_command("high"), effort_command("auto"))
+        self.assertEqual(effort_file.read_text(), "high\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
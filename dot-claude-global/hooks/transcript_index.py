@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Incremental index over the tail of a session transcript (JSONL).
+
+Stop hooks and the statusline all want the same few facts about the end of
+the current session: the last assistant text, the latest context token
+count and the latest effort change. Rather than each re-reading and
+JSON-decoding the last 256KB on every event, TranscriptIndex remembers the
+byte offset it has processed per transcript and decodes only lines appended
+since, keeping a compact sidecar in ~/.claude/cache/transcripts:
+
+    {"version": 2, "path": ..., "session_id": ..., "inode": ..., "offset": ...,
+     "last_assistant_text": str | null, "context_tokens": int | null,
+     "effort": str | null, "explicit_effort": str | null}
+
+"effort" is the latest change including "/effort auto", as the statusline
+shows it; "explicit_effort" is the latest named level, which
+detect-effort-level.py keeps across an "/effort auto".
+
+A transcript seen for the first time (or replaced, or truncated) is indexed
+from its last TAIL_BYTES, the window the consumers used to scan, so old
+sessions with huge transcripts cost no more than before. A line still
+being written (no trailing newline) is left for the next update.
+
+Concurrent updates are safe: sidecars are replaced atomically, and two
+updaters racing over the same bytes compute the same result.
+
+Sidecars hold the last assistant text in plaintext, so they must not
+outlive their transcript: prune() deletes those whose transcript is gone or
+has been encrypted to .age by the vault. It runs at most once per
+PRUNE_INTERVAL from load(), and after each vault sweep that encrypts
+anything.
+
+Usage:
+    transcript_index.py <transcript> [FIELD ...]
+    transcript_index.py --prune
+
+Prints the sidecar as JSON, or each requested field on its own line
+(empty for null) for shell consumers such as statusline.sh.
+"""
+import json
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hook_utils import write_atomic
+
+DEFAULT_DIR = os.path.expanduser("~/.claude/cache/transcripts")
+TAIL_BYTES = 262144
+PRUNE_INTERVAL = 24 * 3600
+
+# /effort command: <command-args>low</command-args>
+EFFORT_CMD_RE = re.compile(
+    r"<command-name>/effort</command-name>.*?"
+    r"<command-args>\s*(low|medium|high|max|auto)\s*</command-args>",
+    re.DOTALL,
+)
+
+# Strip ANSI escape sequences (both real ESC bytes and literal \x1b strings)
+ANSI_RE = re.compile(r"(?:\\x1b|\x1b)\[\d*(?:;\d*)*m")
+
+# After ANSI stripping: "with max effort"
+MODEL_EFFORT_RE = re.compile(r"with\s+(low|medium|high|max)\s+effort")
+
+
+# =============================================================================
+# Entry Extractors (Single Responsibility: Pull facts out of one JSONL entry)
+# =============================================================================
+
+def assistant_text(entry: dict) -> str | None:
+    """Text of an assistant entry (string content or joined text blocks), if non-blank."""
+    msg = entry.get("message", "")
+    if isinstance(msg, dict):
+        content = msg.get("content", "")
+        if isinstance(content, list):
+            msg = " ".join(
+                block.get("text", "") for block in content
+                if isinstance(block, dict) and block.get("type") == "text"
+            )
+        else:
+            msg = content
+    if isinstance(msg, str) and msg.strip():
+        return msg
+    return None
+
+
+def context_tokens(entry: dict) -> int | None:
+    """input_tokens + cache_read_input_tokens of an entry carrying usage."""
+    msg = entry.get("message")
+    usage = msg.get("usage") if isinstance(msg, dict) else None
+    if not isinstance(usage, dict):
+        return None
+    return (usage.get("input_tokens") or 0) + (usage.get("cache_read_input_tokens") or 0)
+
+
+def effort_change(entry: dict) -> str | None:
+    """Effort level set by a /effort command or reported by /model, if any."""
+    msg = entry.get("message", "")
+    # Messages can be strings, dicts with "content", or lists (tool results)
+    if isinstance(msg, dict):
+        msg = msg.get("content", "")
+    if not isinstance(msg, str):
+        return None
+
+    if "command-name" in msg and "/effort" in msg:
+        m = EFFORT_CMD_RE.search(msg)
+        if m:
+            return m.group(1)
+
+    if "local-command-stdout" in msg and "effort" in msg:
+        m = MODEL_EFFORT_RE.search(ANSI_RE.sub("", msg))
+        if m:
+            return m.group(1)
+
+    return None
+
+
+# =============================================================================
+# Index (Single Responsibility: Fold appended lines into the sidecar)
+# =============================================================================
+
+class TranscriptIndex:
+    """Sidecar summary of one transcript, brought up to date by update()."""
+
+    VERSION = 2
+    FIELDS = ("last_assistant_text", "context_tokens", "effort", "explicit_effort")
+
+    def __init__(self, transcript: str, cache_dir: str | None = None):
+        import hashlib
+
+        self.transcript = os.path.abspath(transcript)
+        digest = hashlib.sha1(self.transcript.encode()).hexdigest()[:16]
+        self._path = os.path.join(cache_dir or DEFAULT_DIR, f"{digest}.json")
+        self.state = self._load()
+
+    def update(self) -> "TranscriptIndex":
+        """Decode lines appended since the last update and save the sidecar."""
+        try:
+            st = os.stat(self.transcript)
+        except OSError:
+            return self
+        state = self.state
+        if state["inode"] != st.st_ino or st.st_size < state["offset"]:
+            state = self.state = self._fresh(st.st_ino)
+            state["offset"] = max(0, st.st_size - TAIL_BYTES)
+            skip_partial = state["offset"] > 0
+        else:
+            skip_partial = False
+        if st.st_size == state["offset"]:
+            return self
+
+        try:
+            with open(self.transcript, "rb") as f:
+                f.seek(state["offset"])
+                data = f.read(st.st_size - state["offset"])
+        except OSError:
+            return self
+
+        start = 0
+        if skip_partial:
+            # The tail window starts mid-line; resume at the next full line
+            start = data.find(b"\n") + 1
+            if start == 0:
+                return self
+        end = data.rfind(b"\n") + 1
+        if end > start:
+            self._fold(data[start:end].decode("utf-8", errors="replace").splitlines())
+        state["offset"] += max(start, end)
+        write_atomic(self._path, json.dumps(state).encode())
+        return self
+
+    def _fold(self, lines: list[str]) -> None:
+        state = self.state
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(entry, dict):
+                continue
+            kind = entry.get("type")
+            if kind == "assistant":
+                text = assistant_text(entry)
+                if text is not None:
+                    state["last_assistant_text"] = text
+            elif kind == "user":
+                effort = effort_change(entry)
+                if effort is not None:
+                    state["effort"] = effort
+                    if effort != "auto":
+                        state["explicit_effort"] = effort
+            tokens = context_tokens(entry)
+            if tokens is not None:
+                state["context_tokens"] = tokens
+
+    def _fresh(self, inode: int | None) -> dict:
+        return {
+            "version": self.VERSION,
+            "path": self.transcript,
+            "session_id": os.path.splitext(os.path.basename(self.transcript))[0],
+            "inode": inode,
+            "offset": 0,
+            **dict.fromkeys(self.FIELDS),
+        }
+
+    def _load(self) -> dict:
+        try:
+            with open(self._path) as f:
+                state = json.load(f)
+            if state.get("version") == self.VERSION and state.get("path") == self.transcript:
+                return state
+        except (OSError, ValueError, AttributeError):
+            pass
+        return self._fresh(None)
+
+
+def load(transcript: str, cache_dir: str | None = None) -> TranscriptIndex:
+    """The index for transcript, brought up to date."""
+    index = TranscriptIndex(transcript, cache_dir).update()
+    prune_if_due(cache_dir)
+    return index
+
+
+# =============================================================================
+# Pruning (Single Responsibility: Drop sidecars of vanished transcripts)
+# =============================================================================
+
+def prune(cache_dir: str | None = None) -> int:
+    """Delete sidecars whose transcript no longer exists or has a .age; returns the count."""
+    cache_dir = cache_dir or DEFAULT_DIR
+    try:
+        names = [n for n in os.listdir(cache_dir) if n.endswith(".json")]
+    except OSError:
+        return 0
+    pruned = 0
+    for name in names:
+        sidecar = os.path.join(cache_dir, name)
+        try:
+            with open(sidecar) as f:
+                transcript = json.load(f).get("path")
+        except (OSError, ValueError, AttributeError):
+            transcript = None
+        if isinstance(transcript, str) and os.path.isfile(transcript) \
+                and not os.path.exists(transcript + ".age"):
+            continue
+        try:
+            os.unlink(sidecar)
+            pruned += 1
+        except OSError:
+            pass
+    return pruned
+
+
+def prune_if_due(cache_dir: str | None = None) -> None:
+    """prune() if it hasn't run in the last PRUNE_INTERVAL."""
+    import time
+
+    stamp = os.path.join(cache_dir or DEFAULT_DIR, ".pruned")
+    try:
+        if time.time() - os.stat(stamp).st_mtime < PRUNE_INTERVAL:
+            return
+    except OSError:
+        pass
+    if write_atomic(stamp, b""):
+        prune(cache_dir)
+
+
+def main():
+    if sys.argv[1:] == ["--prune"]:
+        prune()
+        return
+    if len(sys.argv) < 2:
+        print(
+            f"Usage: {os.path.basename(__file__)} <transcript> [FIELD ...] | --prune",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+    index = load(sys.argv[1])
+    if len(sys.argv) == 2:
+        print(json.dumps(index.state))
+        return
+    for field in sys.argv[2:]:
+        value = index.state.get(field)
+        print("" if value is None else value)
+
+
+if __name__ == "__main__":
+    main()
@@ -27,13 +27,12 @@ Known limitations (lean-allow):
 Override: run the commit manually outside Claude Code.
 """
 
-from pathlib import Path
 import os
 import re
 import shlex
 import sys
 
-sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from hook_utils import parse_hook_input, deny, pass_through
 
@@ -130,7 +129,8 @@ def extract_message(cmd: str) -> str | None:
     if f_arg:
         path = f_arg.group(1) or f_arg.group(2) or f_arg.group(3)
         try:
-            return Path(os.path.expanduser(path)).read_text()
+            with open(os.path.expanduser(path)) as f:
+                return f.read()
         except OSError:
             return None
 
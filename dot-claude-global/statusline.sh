@@ -27,8 +27,10 @@ unicode_bar() {
   pct="${1:-0}"; width="${2:-10}"
   [[ "$pct" =~ ^[0-9]+$ ]] || pct=0; ((pct<0))&&pct=0; ((pct>100))&&pct=100
   filled=$(( pct * width / 100 )); empty=$(( width - filled ))
-  printf '%*s' "$filled" '' | tr ' ' '█'
-  printf '%*s' "$empty" '' | tr ' ' '░'
+  # Bash substitution, not tr: GNU tr replaces bytes, mangling multibyte glyphs
+  local cells
+  printf -v cells '%*s' "$filled" ''; printf '%s' "${cells// /█}"
+  printf -v cells '%*s' "$empty" ''; printf '%s' "${cells// /░}"
 }
 
 fmt_tokens() {
@@ -114,6 +116,7 @@ fi
 context_pct=""
 context_used_pct=0
 tokens_fmt=""
+log_effort=""
 context_color() { if [ "$use_color" -eq 1 ]; then printf '\033[1;38;5;111m'; fi; }  # steel blue
 
 # Determine max context based on model
@@ -144,16 +147,31 @@ get_max_context() {
 if [ -n "$session_id" ] && [ "$HAS_JQ" -eq 1 ]; then
   MAX_CONTEXT=$(get_max_context "$model_name")
   
-  # Find session file by searching project directories for the session ID
+  # Resolve the session file through the session index (see
+  # hooks/session_index.py): one file read, however many sessions are stored
   session_file=""
-  found=$(find "$HOME/.claude/projects" -maxdepth 2 -name "${session_id}.jsonl" -print -quit 2>/dev/null)
-  if [ -n "$found" ]; then
-    session_file="$found"
-  fi
+  case "$session_id" in
+    *[!A-Za-z0-9_-]*) ;;
+    *)
+      session_entry="$HOME/.claude/cache/sessions/$session_id"
+      [ -f "$session_entry" ] && read -r session_file < "$session_entry"
+      if [ -z "$session_file" ] || [ ! -f "$session_file" ]; then
+        # Miss (session predates the index): search project directories once
+        # and record the result for the next refresh
+        session_file=$(find "$HOME/.claude/projects" -maxdepth 2 -name "${session_id}.jsonl" -print -quit 2>/dev/null)
+        if [ -n "$session_file" ] && mkdir -p -m 700 "${session_entry%/*}" 2>/dev/null; then
+          { printf '%s\n' "$session_file" > "$session_entry.$$" && mv -f "$session_entry.$$" "$session_entry"; } 2>/dev/null || rm -f "$session_entry.$$"
+        fi
+      fi
+      ;;
+  esac
 
   if [ -n "$session_file" ] && [ -f "$session_file" ]; then
-    # Get the latest input token count from the session file
-    latest_tokens=$(tail -20 "$session_file" | jq -r 'select(.message.usage) | .message.usage | ((.input_tokens // 0) + (.cache_read_input_tokens // 0))' 2>/dev/null | tail -1)
+    # Latest input token count and effort change from the session file.
+    # transcript_index.py decodes only lines appended since the last render.
+    { read -r latest_tokens; read -r log_effort; } < <(
+      python3 "$HOME/.claude/hooks/transcript_index.py" "$session_file" context_tokens effort 2>/dev/null
+    )
     
     if [ -n "$latest_tokens" ] && [ "$latest_tokens" -gt 0 ]; then
       context_used_pct=$(( latest_tokens * 100 / MAX_CONTEXT ))
@@ -174,17 +192,17 @@ if [ -n "$session_id" ] && [ "$HAS_JQ" -eq 1 ]; then
 fi
 
 # ---- rate limit usage (Anthropic OAuth API, cached 60s) ----
-usage_cache="/tmp/claude/statusline-usage-cache.json"
+usage_cache="${CLAUDE_USAGE_CACHE:-/tmp/claude/statusline-usage-cache.json}"
 five_hour_pct=""
 seven_day_pct=""
 five_hour_reset=""
 seven_day_reset=""
 
 if [ "$HAS_JQ" -eq 1 ]; then
-  mkdir -p /tmp/claude
+  mkdir -p "${usage_cache%/*}"
   cache_stale=1
   if [ -f "$usage_cache" ]; then
-    cache_age=$(( $(date +%s) - $(stat -f %m "$usage_cache" 2>/dev/null || stat -c %Y "$usage_cache" 2>/dev/null || echo 0) ))
+    cache_age=$(( $(date +%s) - $(stat -c %Y "$usage_cache" 2>/dev/null || stat -f %m "$usage_cache" 2>/dev/null || echo 0) ))
     [ "$cache_age" -lt 60 ] && cache_stale=0
   fi
 
@@ -253,29 +271,10 @@ if [ "$HAS_JQ" -eq 1 ]; then
   effort_level=$(echo "$input" | jq -r 'if (.effort | type) == "object" then (.effort.level // empty) else (.effort // empty) end' 2>/dev/null)
 fi
 
-# 2. Parse session JSONL for most recent effort change (~26ms)
+# 2. Most recent effort change in the session JSONL (read with the tokens above)
 #    Catches both /effort commands and /model effort changes immediately
-if [ -z "$effort_level" ] && [ -n "$session_file" ] && [ -f "$session_file" ]; then
-  effort_level=$(tail -c 262144 "$session_file" 2>/dev/null | python3 -c "
-import sys, json, re
-effort = ''
-for line in sys.stdin:
-    try:
-        e = json.loads(line)
-        if e.get('type') != 'user': continue
-        msg = e.get('message', '')
-        c = msg.get('content', '') if isinstance(msg, dict) else msg if isinstance(msg, str) else ''
-        if not isinstance(c, str): continue
-        if '<command-name>/effort' in c:
-            m = re.search(r'command-args>(low|medium|high|max|auto)</command-args', c)
-            if m: effort = m.group(1)
-        elif 'local-command-stdout' in c and 'effort' in c:
-            clean = re.sub(r'\\x1b\[\d+m|\x1b\[\d+m', '', c)
-            m = re.search(r'with\s+(low|medium|high|max)\s+effort', clean)
-            if m: effort = m.group(1)
-    except: pass
-print(effort)
-" 2>/dev/null)
+if [ -z "$effort_level" ] && [ -n "$log_effort" ]; then
+  effort_level="$log_effort"
   case "$effort_level" in low|medium|high|xhigh|max|auto) ;; *) effort_level="" ;; esac
 fi
 
@@ -2,17 +2,20 @@
 Validator for tracked changes in Word documents.
 """
 
+import io
 import subprocess
 import tempfile
-import zipfile
 from pathlib import Path
 
+from .original import OriginalDocument
+
 
 class RedliningValidator:
 
-    def __init__(self, unpacked_dir, original_docx, verbose=False, author="Claude"):
+    def __init__(self, unpacked_dir, original_docx, verbose=False, author="Claude", original=None):
         self.unpacked_dir = Path(unpacked_dir)
         self.original_docx = Path(original_docx)
+        self.original = original or OriginalDocument(self.original_docx)
         self.verbose = verbose
         self.author = author
         self.namespaces = {
@@ -56,50 +59,45 @@ class RedliningValidator:
         except Exception:
             pass
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            try:
-                with zipfile.ZipFile(self.original_docx, "r") as zip_ref:
-                    zip_ref.extractall(temp_path)
-            except Exception as e:
-                print(f"FAILED - Error unpacking original docx: {e}")
-                return False
+        try:
+            original_data = self.original.read("word/document.xml")
+        except Exception as e:
+            print(f"FAILED - Error unpacking original docx: {e}")
+            return False
 
-            original_file = temp_path / "word" / "document.xml"
-            if not original_file.exists():
-                print(
-                    f"FAILED - Original document.xml not found in {self.original_docx}"
-                )
-                return False
+        if original_data is None:
+            print(
+                f"FAILED - Original document.xml not found in {self.original_docx}"
+            )
+            return False
 
-            try:
-                import xml.etree.ElementTree as ET
+        try:
+            import xml.etree.ElementTree as ET
 
-                modified_tree = ET.parse(modified_file)
-                modified_root = modified_tree.getroot()
-                original_tree = ET.parse(original_file)
-                original_root = original_tree.getroot()
-            except ET.ParseError as e:
-                print(f"FAILED - Error parsing XML files: {e}")
-                return False
+            modified_tree = ET.parse(modified_file)
+            modified_root = modified_tree.getroot()
+            original_tree = ET.parse(io.BytesIO(original_data))
+            original_root = original_tree.getroot()
+        except ET.ParseError as e:
+            print(f"FAILED - Error parsing XML files: {e}")
+            return False
 
-            self._remove_author_tracked_changes(original_root)
-            self._remove_author_tracked_changes(modified_root)
+        self._remove_author_tracked_changes(original_root)
+        self._remove_author_tracked_changes(modified_root)
 
-            modified_text = self._extract_text_content(modified_root)
-            original_text = self._extract_text_content(original_root)
+        modified_text = self._extract_text_content(modified_root)
+        original_text = self._extract_text_content(original_root)
 
-            if modified_text != original_text:
-                error_message = self._generate_detailed_diff(
-                    original_text, modified_text
-                )
-                print(error_message)
-                return False
+        if modified_text != original_text:
+            error_message = self._generate_detailed_diff(
+                original_text, modified_text
+            )
+            print(error_message)
+            return False
 
-            if self.verbose:
-                print(f"PASSED - All changes by {self.author} are properly tracked")
-            return True
+        if self.verbose:
+            print(f"PASSED - All changes by {self.author} are properly tracked")
+        return True
 
     def _generate_detailed_diff(self, original_text, modified_text):
         error_parts = [
@@ -14,7 +14,7 @@ import xml.etree.ElementTree as ET
 import zipfile
 from pathlib import Path
 
-import defusedxml.minidom
+from .xml_part import XmlPart, append_text, is_element, local_name, remove_node
 
 WORD_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
 
@@ -26,22 +26,27 @@ def simplify_redlines(input_dir: str) -> tuple[int, str]:
         return 0, f"Error: {doc_xml} not found"
 
     try:
-        dom = defusedxml.minidom.parseString(doc_xml.read_text(encoding="utf-8"))
-        root = dom.documentElement
+        part = XmlPart.parse(doc_xml.read_bytes())
+        merge_count = simplify_part_redlines(part)
+        doc_xml.write_bytes(part.to_xml().encode("utf-8"))
+        return merge_count, f"Simplified {merge_count} tracked changes"
 
-        merge_count = 0
+    except Exception as e:
+        return 0, f"Error: {e}"
 
-        containers = _find_elements(root, "p") + _find_elements(root, "tc")
 
-        for container in containers:
-            merge_count += _merge_tracked_changes_in(container, "ins")
-            merge_count += _merge_tracked_changes_in(container, "del")
+def simplify_part_redlines(part: XmlPart) -> int:
+    root = part.root
 
-        doc_xml.write_bytes(dom.toxml(encoding="UTF-8"))
-        return merge_count, f"Simplified {merge_count} tracked changes"
+    merge_count = 0
 
-    except Exception as e:
-        return 0, f"Error: {e}"
+    containers = _find_elements(root, "p") + _find_elements(root, "tc")
+
+    for container in containers:
+        merge_count += _merge_tracked_changes_in(container, "ins")
+        merge_count += _merge_tracked_changes_in(container, "del")
+
+    return merge_count
 
 
 def _merge_tracked_changes_in(container, tag: str) -> int:
@@ -49,8 +54,8 @@ def _merge_tracked_changes_in(container, tag: str) -> int:
 
     tracked = [
         child
-        for child in container.childNodes
-        if child.nodeType == child.ELEMENT_NODE and _is_element(child, tag)
+        for child in container
+        if is_element(child) and _is_element(child, tag)
     ]
 
     if len(tracked) < 2:
@@ -63,7 +68,7 @@ def _merge_tracked_changes_in(container, tag: str) -> int:
 
         if _can_merge_tracked(curr, next_elem):
             _merge_tracked_content(curr, next_elem)
-            container.removeChild(next_elem)
+            remove_node(next_elem)
             tracked.pop(i + 1)
             merge_count += 1
         else:
@@ -73,54 +78,45 @@ def _merge_tracked_changes_in(container, tag: str) -> int:
 
 
 def _is_element(node, tag: str) -> bool:
-    name = node.localName or node.tagName
-    return name == tag or name.endswith(f":{tag}")
+    return local_name(node) == tag
 
 
 def _get_author(elem) -> str:
-    author = elem.getAttribute("w:author")
+    author = elem.get(f"{{{WORD_NS}}}author")
     if not author:
-        for attr in elem.attributes.values():
-            if attr.localName == "author" or attr.name.endswith(":author"):
-                return attr.value
-    return author
+        for name, value in elem.attrib.items():
+            if name.rpartition("}")[2] == "author":
+                return value
+    return author or ""
 
 
 def _can_merge_tracked(elem1, elem2) -> bool:
     if _get_author(elem1) != _get_author(elem2):
         return False
 
-    node = elem1.nextSibling
-    while node and node != elem2:
-        if node.nodeType == node.ELEMENT_NODE:
+    if elem1.tail and elem1.tail.strip():
+        return False
+    for node in elem1.itersiblings():
+        if node is elem2:
+            break
+        if is_element(node):
             return False
-        if node.nodeType == node.TEXT_NODE and node.data.strip():
+        if node.tail and node.tail.strip():
             return False
-        node = node.nextSibling
 
     return True
 
 
 def _merge_tracked_content(target, source):
-    while source.firstChild:
-        child = source.firstChild
-        source.removeChild(child)
-        target.appendChild(child)
+    if source.text is not None:
+        append_text(target, source.text)
+        source.text = None
+    for child in list(source):
+        target.append(child)
 
 
 def _find_elements(root, tag: str) -> list:
-    results = []
-
-    def traverse(node):
-        if node.nodeType == node.ELEMENT_NODE:
-            name = node.localName or node.tagName
-            if name == tag or name.endswith(f":{tag}"):
-                results.append(node)
-            for child in node.childNodes:
-                traverse(child)
-
-    traverse(root)
-    return results
+    return list(root.iter(f"{{*}}{tag}"))
 
 
 def get_tracked_change_authors(doc_xml_path: Path) -> dict[str, int]:
@@ -0,0 +1,45 @@
+"""Tests for XmlPart round-tripping."""
+
+from pathlib import Path
+import sys
+import unittest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from helpers.xml_part import XmlPart
+
+R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+
+class TestRoundTrip(unittest.TestCase):
+    def round_trip(self, xml):
+        return XmlPart.parse(xml.encode()).to_xml()
+
+    def test_duplicate_uri_prefixes_keep_attribute_prefix(self):
+        xml = (
+            f'<a xmlns:r="{R}" xmlns:r2="{R}">'
+            '<b r:x="1" r2:y="2"/><c r2:x="2"/></a>'
+        )
+        self.assertEqual(
+            self.round_trip(xml), f'<?xml version="1.0" encoding="UTF-8"?>{xml}'
+        )
+
+    def test_duplicate_uri_prefixes_in_nested_scope(self):
+        xml = (
+            f'<a xmlns:r="{R}"><b xmlns:r2="{R}" r2:id="rId1" r:link="rId2">'
+            '<c r:embed="rId3" xml:space="preserve"/></b></a>'
+        )
+        self.assertEqual(
+            self.round_trip(xml), f'<?xml version="1.0" encoding="UTF-8"?>{xml}'
+        )
+
+    def test_added_attribute_on_duplicate_uri_document(self):
+        part = XmlPart.parse(f'<a xmlns:r="{R}" xmlns:r2="{R}"><b r2:x="1"/></a>'.encode())
+        part.root[0].set("{http://www.w3.org/XML/1998/namespace}space", "preserve")
+        self.assertEqual(
+            part.element_xml(part.root[0]), '<b r2:x="1" xml:space="preserve"/>'
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
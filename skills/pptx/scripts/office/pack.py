@@ -3,7 +3,7 @@
 Validates with auto-repair, condenses XML formatting, and creates the Office file.
 
 Usage:
-    python pack.py <input_directory> <output_file> [--original <file>] [--validate true|false]
+    python pack.py <input_directory> <output_file> [--original <file>] [--validate true|false] [--jobs N]
 
 Examples:
     python pack.py unpacked/ output.docx --original input.docx
@@ -17,9 +17,15 @@ import tempfile
 import zipfile
 from pathlib import Path
 
-import defusedxml.minidom
+import lxml.etree
 
-from validators import DOCXSchemaValidator, PPTXSchemaValidator, RedliningValidator
+from helpers.xml_part import XmlPart, remove_node
+from validators import (
+    DOCXSchemaValidator,
+    OriginalDocument,
+    PPTXSchemaValidator,
+    RedliningValidator,
+)
 
 def pack(
     input_directory: str,
@@ -27,6 +33,7 @@ def pack(
     original_file: str | None = None,
     validate: bool = True,
     infer_author_func=None,
+    jobs: int = 1,
 ) -> tuple[None, str]:
     input_dir = Path(input_directory)
     output_path = Path(output_file)
@@ -42,7 +49,7 @@ def pack(
         original_path = Path(original_file)
         if original_path.exists():
             success, output = _run_validation(
-                input_dir, original_path, suffix, infer_author_func
+                input_dir, original_path, suffix, infer_author_func, jobs
             )
             if output:
                 print(output)
@@ -71,33 +78,35 @@ def _run_validation(
     original_file: Path,
     suffix: str,
     infer_author_func=None,
+    jobs: int = 1,
 ) -> tuple[bool, str | None]:
     output_lines = []
     validators = []
 
-    if suffix == ".docx":
-        author = "Claude"
-        if infer_author_func:
-            try:
-                author = infer_author_func(unpacked_dir, original_file)
-            except ValueError as e:
-                print(f"Warning: {e} Using default author 'Claude'.", file=sys.stderr)
+    with OriginalDocument(original_file) as original:
+        if suffix == ".docx":
+            author = "Claude"
+            if infer_author_func:
+                try:
+                    author = infer_author_func(unpacked_dir, original_file)
+                except ValueError as e:
+                    print(f"Warning: {e} Using default author 'Claude'.", file=sys.stderr)
 
-        validators = [
-            DOCXSchemaValidator(unpacked_dir, original_file),
-            RedliningValidator(unpacked_dir, original_file, author=author),
-        ]
-    elif suffix == ".pptx":
-        validators = [PPTXSchemaValidator(unpacked_dir, original_file)]
+            validators = [
+                DOCXSchemaValidator(unpacked_dir, original_file, original=original, jobs=jobs),
+                RedliningValidator(unpacked_dir, original_file, author=author, original=original),
+            ]
+        elif suffix == ".pptx":
+            validators = [PPTXSchemaValidator(unpacked_dir, original_file, original=original, jobs=jobs)]
 
-    if not validators:
-        return True, None
+        if not validators:
+            return True, None
 
-    total_repairs = sum(v.repair() for v in validators)
-    if total_repairs:
-        output_lines.append(f"Auto-repaired {total_repairs} issue(s)")
+        total_repairs = sum(v.repair() for v in validators)
+        if total_repairs:
+            output_lines.append(f"Auto-repaired {total_repairs} issue(s)")
 
-    success = all(v.validate() for v in validators)
+        success = all(v.validate() for v in validators)
 
     if success:
         output_lines.append("All validations PASSED!")
@@ -107,27 +116,34 @@ def _run_validation(
 
 def _condense_xml(xml_file: Path) -> None:
     try:
-        with open(xml_file, encoding="utf-8") as f:
-            dom = defusedxml.minidom.parse(f)
+        part = XmlPart.parse(xml_file.read_bytes())
 
-        for element in dom.getElementsByTagName("*"):
-            if element.tagName.endswith(":t"):
+        comments = []
+        for element in part.root.iter(lxml.etree.Element):
+            if element.prefix and element.tag.endswith("}t"):
                 continue
 
-            for child in list(element.childNodes):
-                if (
-                    child.nodeType == child.TEXT_NODE
-                    and child.nodeValue
-                    and child.nodeValue.strip() == ""
-                ) or child.nodeType == child.COMMENT_NODE:
-                    element.removeChild(child)
+            if _is_blank(element.text):
+                element.text = None
+            for child in element:
+                if _is_blank(child.tail):
+                    child.tail = None
+                if child.tag is lxml.etree.Comment:
+                    comments.append(child)
 
-        xml_file.write_bytes(dom.toxml(encoding="UTF-8"))
+        for comment in comments:
+            remove_node(comment)
+
+        xml_file.write_bytes(part.to_xml().encode("utf-8"))
     except Exception as e:
         print(f"ERROR: Failed to parse {xml_file.name}: {e}", file=sys.stderr)
         raise
 
 
+def _is_blank(text: str | None) -> bool:
+    return bool(text) and text.strip() == ""
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description="Pack a directory into a DOCX, PPTX, or XLSX file"
@@ -145,13 +161,23 @@ if __name__ == "__main__":
         metavar="true|false",
         help="Run validation with auto-repair (default: true)",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of processes for XSD validation (default: 1)",
+    )
     args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
 
     _, message = pack(
         args.input_directory,
         args.output_file,
         original_file=args.original,
         validate=args.validate,
+        jobs=args.jobs,
     )
     print(message)
 
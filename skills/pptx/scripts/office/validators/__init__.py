@@ -4,12 +4,17 @@ Validation modules for Word document processing.
 
 from .base import BaseSchemaValidator
 from .docx import DOCXSchemaValidator
+from .original import OriginalDocument
 from .pptx import PPTXSchemaValidator
 from .redlining import RedliningValidator
+from .schema_registry import SCHEMA_REGISTRY, SchemaRegistry
 
 __all__ = [
     "BaseSchemaValidator",
     "DOCXSchemaValidator",
+    "OriginalDocument",
     "PPTXSchemaValidator",
     "RedliningValidator",
+    "SCHEMA_REGISTRY",
+    "SchemaRegistry",
 ]
@@ -2,12 +2,33 @@
 Base validator with common validation logic for document files.
 """
 
+import copy
+import io
+import os
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import defusedxml.minidom
 import lxml.etree
 
+from .original import OriginalDocument
+from .schema_registry import SCHEMA_REGISTRY
+
+_xsd_worker = None
+
+
+def _init_xsd_worker(validator_cls, unpacked_dir, original_file):
+    global _xsd_worker
+    _xsd_worker = validator_cls(unpacked_dir, original_file)
+
+
+def _validate_file_in_worker(xml_file):
+    result = _xsd_worker.validate_file_against_xsd(xml_file, verbose=False)
+    registry = _xsd_worker.schema_registry
+    return result, (os.getpid(), registry.compile_count, registry.compile_seconds)
+
 
 class BaseSchemaValidator:
 
@@ -73,6 +94,10 @@ class BaseSchemaValidator:
 
     MAIN_CONTENT_FOLDERS = {"word", "ppt", "xl"}
 
+    SCHEMAS_DIR = Path(__file__).parent.parent / "schemas"
+
+    schema_registry = SCHEMA_REGISTRY
+
     OOXML_NAMESPACES = {
         "http://schemas.openxmlformats.org/officeDocument/2006/math",
         "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
@@ -91,12 +116,16 @@ class BaseSchemaValidator:
         "http://www.w3.org/XML/1998/namespace",
     }
 
-    def __init__(self, unpacked_dir, original_file=None, verbose=False):
+    def __init__(self, unpacked_dir, original_file=None, verbose=False, original=None, jobs=1):
         self.unpacked_dir = Path(unpacked_dir).resolve()
         self.original_file = Path(original_file) if original_file else None
+        if original is None and self.original_file:
+            original = OriginalDocument(self.original_file)
+        self.original = original
         self.verbose = verbose
+        self.jobs = jobs
 
-        self.schemas_dir = Path(__file__).parent.parent / "schemas"
+        self.schemas_dir = self.SCHEMAS_DIR
 
         patterns = ["*.xml", "*.rels"]
         self.xml_files = [
@@ -106,9 +135,54 @@ class BaseSchemaValidator:
         if not self.xml_files:
             print(f"Warning: No XML files found in {self.unpacked_dir}")
 
+        self._parsed = {}
+        self.parse_count = 0
+        self.parse_cache_hits = 0
+        self.parse_seconds = 0.0
+        self._worker_schema_stats = {}
+
     def validate(self):
         raise NotImplementedError("Subclasses must implement the validate method")
 
+    def _parse(self, xml_file):
+        # Parsed once per run and shared by every pass, so callers must not
+        # modify the tree; passes that do use _parse_copy. A parse failure is
+        # remembered and raised again to each caller.
+        xml_file = Path(xml_file)
+        parsed = self._parsed.get(xml_file)
+        if parsed is None:
+            start = time.perf_counter()
+            try:
+                parsed = lxml.etree.parse(str(xml_file))
+            except Exception as e:
+                parsed = e
+            self.parse_seconds += time.perf_counter() - start
+            self.parse_count += 1
+            self._parsed[xml_file] = parsed
+        else:
+            self.parse_cache_hits += 1
+        if isinstance(parsed, Exception):
+            raise parsed
+        return parsed
+
+    def _parse_copy(self, xml_file):
+        return copy.deepcopy(self._parse(xml_file))
+
+    def _forget(self, xml_file):
+        self._parsed.pop(Path(xml_file), None)
+
+    def report_parse_stats(self):
+        print(
+            f"Parsed {self.parse_count} XML files in {self.parse_seconds:.2f}s "
+            f"({self.parse_cache_hits} reused)"
+        )
+
+    @classmethod
+    def preload_schemas(cls):
+        cls.schema_registry.preload(
+            cls.SCHEMAS_DIR / name for name in set(cls.SCHEMA_MAPPINGS.values())
+        )
+
     def repair(self) -> int:
         return self.repair_whitespace_preservation()
 
@@ -116,6 +190,8 @@ class BaseSchemaValidator:
         repairs = 0
 
         for xml_file in self.xml_files:
+            if not self._may_need_whitespace_repair(xml_file):
+                continue
             try:
                 content = xml_file.read_text(encoding="utf-8")
                 dom = defusedxml.minidom.parseString(content)
@@ -134,18 +210,41 @@ class BaseSchemaValidator:
 
                 if modified:
                     xml_file.write_bytes(dom.toxml(encoding="UTF-8"))
+                    self._forget(xml_file)
 
             except Exception:
                 pass
 
         return repairs
 
+    def _may_need_whitespace_repair(self, xml_file):
+        # Cheap check on the shared tree so the minidom rewrite only runs on
+        # files it would change. Errs towards True: unparseable files go
+        # through minidom, and like minidom's firstChild, a leading comment
+        # or processing instruction counts as the text.
+        try:
+            root = self._parse(xml_file).getroot()
+        except Exception:
+            return True
+        xml_space = f"{{{self.XML_NAMESPACE}}}space"
+        for elem in root.iter(lxml.etree.Element):
+            if not elem.prefix or lxml.etree.QName(elem).localname != "t":
+                continue
+            text = elem.text
+            if text is None and len(elem):
+                if elem[0].tag in (lxml.etree.Comment, lxml.etree.ProcessingInstruction):
+                    text = elem[0].text
+            if text and (text.startswith((" ", "\t")) or text.endswith((" ", "\t"))):
+                if elem.get(xml_space) != "preserve":
+                    return True
+        return False
+
     def validate_xml(self):
         errors = []
 
         for xml_file in self.xml_files:
             try:
-                lxml.etree.parse(str(xml_file))
+                self._parse(xml_file)
             except lxml.etree.XMLSyntaxError as e:
                 errors.append(
                     f"  {xml_file.relative_to(self.unpacked_dir)}: "
@@ -172,7 +271,7 @@ class BaseSchemaValidator:
 
         for xml_file in self.xml_files:
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse(xml_file).getroot()
                 declared = set(root.nsmap.keys()) - {None}  
 
                 for attr_val in [
@@ -202,12 +301,17 @@ class BaseSchemaValidator:
 
         for xml_file in self.xml_files:
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse(xml_file).getroot()
                 file_ids = {}  
 
                 mc_elements = root.xpath(
                     ".//mc:AlternateContent", namespaces={"mc": self.MC_NAMESPACE}
                 )
+                if mc_elements:
+                    root = self._parse_copy(xml_file).getroot()
+                    mc_elements = root.xpath(
+                        ".//mc:AlternateContent", namespaces={"mc": self.MC_NAMESPACE}
+                    )
                 for elem in mc_elements:
                     elem.getparent().remove(elem)
 
@@ -314,7 +418,7 @@ class BaseSchemaValidator:
 
         for rels_file in rels_files:
             try:
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
+                rels_root = self._parse(rels_file).getroot()
 
                 rels_dir = rels_file.parent
 
@@ -398,7 +502,7 @@ class BaseSchemaValidator:
                 continue
 
             try:
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
+                rels_root = self._parse(rels_file).getroot()
                 rid_to_type = {}
 
                 for rel in rels_root.findall(
@@ -418,7 +522,7 @@ class BaseSchemaValidator:
                         )
                         rid_to_type[rid] = type_name
 
-                xml_root = lxml.etree.parse(str(xml_file)).getroot()
+                xml_root = self._parse(xml_file).getroot()
 
                 r_ns = self.OFFICE_RELATIONSHIPS_NAMESPACE
                 rid_attrs_to_check = ["id", "embed", "link"]
@@ -498,7 +602,7 @@ class BaseSchemaValidator:
             return False
 
         try:
-            root = lxml.etree.parse(str(content_types_file)).getroot()
+            root = self._parse(content_types_file).getroot()
             declared_parts = set()
             declared_extensions = set()
 
@@ -553,7 +657,7 @@ class BaseSchemaValidator:
                     continue
 
                 try:
-                    root_tag = lxml.etree.parse(str(xml_file)).getroot().tag
+                    root_tag = self._parse(xml_file).getroot().tag
                     root_name = root_tag.split("}")[-1] if "}" in root_tag else root_tag
 
                     if root_name in declarable_roots and path_str not in declared_parts:
@@ -639,11 +743,10 @@ class BaseSchemaValidator:
         valid_count = 0
         skipped_count = 0
 
-        for xml_file in self.xml_files:
+        results = self._validate_files_against_xsd()
+
+        for xml_file, (is_valid, new_file_errors) in zip(self.xml_files, results):
             relative_path = str(xml_file.relative_to(self.unpacked_dir))
-            is_valid, new_file_errors = self.validate_file_against_xsd(
-                xml_file, verbose=False
-            )
 
             if is_valid is None:
                 skipped_count += 1
@@ -663,6 +766,19 @@ class BaseSchemaValidator:
                 )
 
         if self.verbose:
+            if self._worker_schema_stats:
+                compiled = sum(count for count, _ in self._worker_schema_stats.values())
+                seconds = sum(secs for _, secs in self._worker_schema_stats.values())
+                print(
+                    f"Schemas: {compiled} compiled in {seconds:.2f}s across "
+                    f"{len(self._worker_schema_stats)} worker process(es)"
+                )
+            else:
+                registry = self.schema_registry
+                print(
+                    f"Schemas: {len(registry)} cached, {registry.compile_count} compiled "
+                    f"in {registry.compile_seconds:.2f}s"
+                )
             print(f"Validated {len(self.xml_files)} files:")
             print(f"  - Valid: {valid_count}")
             print(f"  - Skipped (no schema): {skipped_count}")
@@ -682,6 +798,34 @@ class BaseSchemaValidator:
                 print("\nPASSED - No new XSD validation errors introduced")
             return True
 
+    def _validate_files_against_xsd(self):
+        self._worker_schema_stats = {}
+        schema_files = [f for f in self.xml_files if self._get_schema_path(f)]
+        workers = min(self.jobs, len(schema_files), os.cpu_count() or 1)
+        if workers <= 1:
+            return [
+                self.validate_file_against_xsd(xml_file, verbose=False)
+                for xml_file in self.xml_files
+            ]
+
+        # Largest parts first so a big document.xml is not left for last
+        schema_files.sort(key=lambda f: f.stat().st_size, reverse=True)
+        results = {}
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_xsd_worker,
+            initargs=(type(self), self.unpacked_dir, self.original_file),
+        ) as executor:
+            futures = {
+                xml_file: executor.submit(_validate_file_in_worker, xml_file)
+                for xml_file in schema_files
+            }
+            for xml_file, future in futures.items():
+                results[xml_file], (pid, count, seconds) = future.result()
+                self._worker_schema_stats[pid] = (count, seconds)
+
+        return [results.get(xml_file, (None, set())) for xml_file in self.xml_files]
+
     def _get_schema_path(self, xml_file):
         if xml_file.name in self.SCHEMA_MAPPINGS:
             return self.schemas_dir / self.SCHEMA_MAPPINGS[xml_file.name]
@@ -753,20 +897,21 @@ class BaseSchemaValidator:
             return None, None  
 
         try:
-            with open(schema_path, "rb") as xsd_file:
-                parser = lxml.etree.XMLParser()
-                xsd_doc = lxml.etree.parse(
-                    xsd_file, parser=parser, base_url=str(schema_path)
-                )
-                schema = lxml.etree.XMLSchema(xsd_doc)
+            xml_doc = self._parse(xml_file)
+        except Exception as e:
+            return False, {str(e)}
 
-            with open(xml_file, "r") as f:
-                xml_doc = lxml.etree.parse(f)
+        return self._validate_doc_xsd(
+            xml_doc, xml_file.relative_to(base_path), schema_path
+        )
+
+    def _validate_doc_xsd(self, xml_doc, relative_path, schema_path):
+        try:
+            schema = self.schema_registry.get(schema_path)
 
             xml_doc, _ = self._remove_template_tags_from_text_nodes(xml_doc)
             xml_doc = self._preprocess_for_mc_ignorable(xml_doc)
 
-            relative_path = xml_file.relative_to(base_path)
             if (
                 relative_path.parts
                 and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
@@ -785,32 +930,25 @@ class BaseSchemaValidator:
             return False, {str(e)}
 
     def _get_original_file_errors(self, xml_file):
-        if self.original_file is None:
+        if self.original is None:
             return set()
 
-        import tempfile
-        import zipfile
-
         xml_file = Path(xml_file).resolve()
-        unpacked_dir = self.unpacked_dir.resolve()
-        relative_path = xml_file.relative_to(unpacked_dir)
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                zip_ref.extractall(temp_path)
-
-            original_xml_file = temp_path / relative_path
-
-            if not original_xml_file.exists():
-                return set()
+        relative_path = xml_file.relative_to(self.unpacked_dir.resolve())
+        schema_path = self._get_schema_path(xml_file)
 
-            is_valid, errors = self._validate_single_file_xsd(
-                original_xml_file, temp_path
+        def validate_original(data):
+            try:
+                xml_doc = lxml.etree.parse(io.BytesIO(data))
+            except Exception as e:
+                return {str(e)}
+            is_valid, errors = self._validate_doc_xsd(
+                xml_doc, relative_path, schema_path
             )
             return errors if errors else set()
 
+        return self.original.xsd_errors(relative_path.as_posix(), validate_original)
+
     def _remove_template_tags_from_text_nodes(self, xml_doc):
         warnings = []
         template_pattern = re.compile(r"\{\{[^}]*\}\}")
@@ -0,0 +1,56 @@
+"""
+Read-only view of the original Office file that validation compares against.
+
+The zip is opened once and members are read on demand, so nothing is
+extracted to disk. XSD errors of original parts are memoized, so each part
+is validated at most once however many validators ask.
+"""
+
+import zipfile
+from pathlib import Path
+
+
+class OriginalDocument:
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._zip = None
+        self._names = None
+        self._xsd_errors = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+    def _open(self):
+        if self._zip is None:
+            self._zip = zipfile.ZipFile(self.path, "r")
+            self._names = set(self._zip.namelist())
+        return self._zip
+
+    def has(self, part_name):
+        self._open()
+        return part_name in self._names
+
+    def read(self, part_name):
+        zf = self._open()
+        if part_name not in self._names:
+            return None
+        return zf.read(part_name)
+
+    def xsd_errors(self, part_name, validate):
+        if part_name not in self._xsd_errors:
+            data = self.read(part_name)
+            self._xsd_errors[part_name] = set() if data is None else validate(data)
+        return self._xsd_errors[part_name]
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,146 @@
+"""Benchmark unpack.py and pack.py on a DOCX with a large document.xml.
+
+Builds a DOCX whose document.xml is about --mb megabytes of paragraphs with
+split runs, rsid attributes, proofErr markers, smart quotes and adjacent
+tracked changes, so every unpack transform has work to do. Then times
+`unpack.py` and `pack.py --validate false` for each checkout and reports
+wall time and peak memory. Outputs are compared against the first checkout
+and must be byte-identical.
+
+Usage:
+    python bench_unpack.py [--mb N] [--repeat N] [--scripts DIR ...]
+
+Pass --scripts once per checkout of this office/ directory to compare
+versions, e.g. one extracted from an earlier commit with `git archive`.
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+from bench_validate import XML_DECL, W, _content_types, _rels
+
+PARAGRAPH = (
+    '<w:p w:rsidR="00A1B2C3" w:rsidRDefault="00A1B2C3"><w:pPr><w:jc w:val="both"/></w:pPr>'
+    '<w:r w:rsidR="00A1B2C3"><w:rPr><w:b/></w:rPr><w:t xml:space="preserve">Paragraph {i} </w:t></w:r>'
+    '<w:r w:rsidR="00D4E5F6"><w:rPr><w:b/></w:rPr><w:t>has “smart” quotes</w:t></w:r>'
+    '<w:proofErr w:type="spellStart"/><w:r><w:t xml:space="preserve"> and a mispeled word.</w:t></w:r>'
+    '<w:proofErr w:type="spellEnd"/>'
+    '<w:ins w:id="{i}1" w:author="Reviewer" w:date="2024-01-01T00:00:00Z"><w:r><w:t xml:space="preserve"> Inserted</w:t></w:r></w:ins>'
+    '<w:ins w:id="{i}2" w:author="Reviewer" w:date="2024-01-02T00:00:00Z"><w:r><w:t xml:space="preserve"> twice.</w:t></w:r></w:ins>'
+    "</w:p>"
+)
+
+
+def make_docx(path, megabytes):
+    paragraph_size = len(PARAGRAPH.format(i=0).encode())
+    count = megabytes * 1024 * 1024 // paragraph_size
+    body = "".join(PARAGRAPH.format(i=i) for i in range(count))
+    document = (
+        f'{XML_DECL}<w:document xmlns:w="{W}"><w:body>{body}'
+        '<w:sectPr><w:pgSz w:w="12240" w:h="15840"/></w:sectPr></w:body></w:document>'
+    )
+    ct = "application/vnd.openxmlformats-officedocument.wordprocessingml"
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(
+            "[Content_Types].xml",
+            _content_types([("word/document.xml", f"{ct}.document.main+xml")]),
+        )
+        zf.writestr("_rels/.rels", _rels([("officeDocument", "word/document.xml")]))
+        zf.writestr("word/document.xml", document)
+    return len(document.encode())
+
+
+def run_measured(command):
+    """Run command, returning (seconds, peak RSS in MB)."""
+    start = time.perf_counter()
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    _, status, usage = os.wait4(process.pid, 0)
+    seconds = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode != 0:
+        print(f"warning: {' '.join(command)} exited {process.returncode}", file=sys.stderr)
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return seconds, usage.ru_maxrss / scale
+
+
+def snapshot(directory):
+    return {
+        path.relative_to(directory).as_posix(): path.read_bytes()
+        for path in sorted(Path(directory).rglob("*"))
+        if path.is_file()
+    }
+
+
+def packed_members(path):
+    with zipfile.ZipFile(path) as zf:
+        return {name: zf.read(name) for name in sorted(zf.namelist())}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--mb", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument(
+        "--scripts",
+        nargs="+",
+        default=[str(Path(__file__).resolve().parent)],
+        help="office/ directories whose unpack.py/pack.py to time (default: this one)",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp = Path(temp_dir)
+        docx = temp / "bench.docx"
+        size = make_docx(docx, args.mb)
+        print(f"document.xml: {size / 1024 / 1024:.1f} MB")
+
+        print(f"{'scripts':<40}  {'step':<6}  {'median':>8}  {'peak RSS':>9}  output")
+        reference = None
+        for scripts_dir in args.scripts:
+            unpack_samples, pack_samples = [], []
+            for _ in range(args.repeat):
+                unpacked = temp / "unpacked"
+                packed = temp / "packed.docx"
+                shutil.rmtree(unpacked, ignore_errors=True)
+                unpack_samples.append(
+                    run_measured([sys.executable, str(Path(scripts_dir) / "unpack.py"), str(docx), str(unpacked)])
+                )
+                unpacked_files = snapshot(unpacked)
+                pack_samples.append(
+                    run_measured(
+                        [sys.executable, str(Path(scripts_dir) / "pack.py"), str(unpacked), str(packed),
+                         "--validate", "false"]
+                    )
+                )
+                outputs = (unpacked_files, packed_members(packed))
+
+            if reference is None:
+                reference = outputs
+                same = ("reference", "reference")
+            else:
+                same = tuple(
+                    "identical" if ours == theirs else "DIFFERENT"
+                    for ours, theirs in zip(outputs, reference)
+                )
+            for step, samples, verdict in (
+                ("unpack", unpack_samples, same[0]),
+                ("pack", pack_samples, same[1]),
+            ):
+                print(
+                    f"{scripts_dir[-40:]:<40}  {step:<6}  "
+                    f"{statistics.median(s for s, _ in samples):>7.2f}s  "
+                    f"{max(m for _, m in samples):>7.0f}MB  {verdict}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""Benchmark validate.py on large synthetic documents.
+
+Builds a DOCX (one long document.xml, header parts and an embedded image)
+and a PPTX (many slides), then times `validate.py <file> --original <file>`
+on each, the way pack.py validates before packing. Every header also
+carries a schema error, as documents produced by other tools often do, so
+the "error already in the original" path is exercised too.
+
+Usage:
+    python bench_validate.py [--paragraphs N] [--headers N] [--media-mb N] [--slides N]
+                             [--repeat N] [--jobs N ...] [--scripts DIR ...]
+
+Pass --scripts once per checkout of this office/ directory to compare
+versions, e.g. one extracted from an earlier commit with `git archive`.
+Pass several --jobs values to compare process counts; --jobs is only
+forwarded to validate.py when it is above 1, so older checkouts still run.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+P = "http://schemas.openxmlformats.org/presentationml/2006/main"
+A = "http://schemas.openxmlformats.org/drawingml/2006/main"
+R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG_RELS = "http://schemas.openxmlformats.org/package/2006/relationships"
+CT = "http://schemas.openxmlformats.org/package/2006/content-types"
+REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+XML_DECL = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+
+def _rels(targets):
+    items = "".join(
+        f'<Relationship Id="rId{i}" Type="{REL_TYPE}/{rel_type}" Target="{target}"/>'
+        for i, (rel_type, target) in enumerate(targets, 1)
+    )
+    return f'{XML_DECL}<Relationships xmlns="{PKG_RELS}">{items}</Relationships>'
+
+
+def _content_types(overrides, defaults=()):
+    items = "".join(
+        f'<Default Extension="{extension}" ContentType="{content_type}"/>'
+        for extension, content_type in defaults
+    )
+    items += "".join(
+        f'<Override PartName="/{part}" ContentType="{content_type}"/>'
+        for part, content_type in overrides
+    )
+    return (
+        f'{XML_DECL}<Types xmlns="{CT}">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        f"{items}</Types>"
+    )
+
+
+def make_docx(path, paragraphs, headers, media_mb):
+    body = "".join(
+        f'<w:p><w:r><w:t xml:space="preserve">Paragraph {i} of the benchmark document. </w:t></w:r>'
+        f"<w:r><w:rPr><w:b/></w:rPr><w:t>Bold run {i}.</w:t></w:r></w:p>"
+        for i in range(paragraphs)
+    )
+    header_refs = "".join(
+        f'<w:headerReference w:type="default" r:id="rId{i + 1}"/>' for i in range(headers)
+    )
+    document = (
+        f'{XML_DECL}<w:document xmlns:w="{W}" xmlns:r="{R}"><w:body>{body}'
+        f'<w:sectPr>{header_refs}<w:pgSz w:w="12240" w:h="15840"/></w:sectPr></w:body></w:document>'
+    )
+    ct = "application/vnd.openxmlformats-officedocument.wordprocessingml"
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(
+            "[Content_Types].xml",
+            _content_types(
+                [("word/document.xml", f"{ct}.document.main+xml")]
+                + [(f"word/header{i}.xml", f"{ct}.header+xml") for i in range(1, headers + 1)],
+                defaults=[("png", "image/png")],
+            ),
+        )
+        zf.writestr("_rels/.rels", _rels([("officeDocument", "word/document.xml")]))
+        zf.writestr("word/document.xml", document)
+        zf.writestr(
+            "word/_rels/document.xml.rels",
+            _rels(
+                [("header", f"header{i}.xml") for i in range(1, headers + 1)]
+                + [("image", "media/image1.png")]
+            ),
+        )
+        # Incompressible, like real photos
+        zf.writestr("word/media/image1.png", os.urandom(media_mb * 1024 * 1024), zipfile.ZIP_STORED)
+        for i in range(1, headers + 1):
+            zf.writestr(
+                f"word/header{i}.xml",
+                f'{XML_DECL}<w:hdr xmlns:w="{W}"><w:p><w:pPr><w:unknownSetting/></w:pPr>'
+                f"<w:r><w:t>Header {i}</w:t></w:r></w:p></w:hdr>",
+            )
+
+
+def _shape_tree(text):
+    return (
+        "<p:cSld><p:spTree>"
+        '<p:nvGrpSpPr><p:cNvPr id="1" name=""/><p:cNvGrpSpPr/><p:nvPr/></p:nvGrpSpPr><p:grpSpPr/>'
+        '<p:sp><p:nvSpPr><p:cNvPr id="2" name="Title"/><p:cNvSpPr/><p:nvPr/></p:nvSpPr><p:spPr/>'
+        f"<p:txBody><a:bodyPr/><a:p><a:r><a:t>{text}</a:t></a:r></a:p></p:txBody></p:sp>"
+        "</p:spTree></p:cSld>"
+    )
+
+
+def make_pptx(path, slides):
+    ns = f'xmlns:p="{P}" xmlns:a="{A}" xmlns:r="{R}"'
+    ct = "application/vnd.openxmlformats-officedocument.presentationml"
+    slide_ids = "".join(
+        f'<p:sldId id="{256 + i}" r:id="rId{i + 3}"/>' for i in range(slides)
+    )
+    presentation = (
+        f"{XML_DECL}<p:presentation {ns}>"
+        '<p:sldMasterIdLst><p:sldMasterId id="2147483648" r:id="rId1"/></p:sldMasterIdLst>'
+        f'<p:sldIdLst>{slide_ids}</p:sldIdLst><p:sldSz cx="12192000" cy="6858000"/>'
+        '<p:notesSz cx="6858000" cy="9144000"/></p:presentation>'
+    )
+    master = (
+        f"{XML_DECL}<p:sldMaster {ns}>{_shape_tree('Master')}"
+        '<p:clrMap bg1="lt1" tx1="dk1" bg2="lt2" tx2="dk2" accent1="accent1" accent2="accent2" '
+        'accent3="accent3" accent4="accent4" accent5="accent5" accent6="accent6" hlink="hlink" folHlink="folHlink"/>'
+        '<p:sldLayoutIdLst><p:sldLayoutId id="2147483649" r:id="rId1"/></p:sldLayoutIdLst></p:sldMaster>'
+    )
+    layout = f'{XML_DECL}<p:sldLayout {ns}>{_shape_tree("Layout")}<p:clrMapOvr><a:masterClrMapping/></p:clrMapOvr></p:sldLayout>'
+    colors = "".join(
+        f'<a:{name}><a:srgbClr val="000000"/></a:{name}>'
+        for name in ("dk1", "lt1", "dk2", "lt2", "accent1", "accent2", "accent3",
+                     "accent4", "accent5", "accent6", "hlink", "folHlink")
+    )
+    font = '<a:latin typeface="Arial"/><a:ea typeface=""/><a:cs typeface=""/>'
+    fill = '<a:solidFill><a:schemeClr val="phClr"/></a:solidFill>'
+    line = f'<a:ln w="9525">{fill}</a:ln>'
+    theme = (
+        f'{XML_DECL}<a:theme xmlns:a="{A}" name="Bench"><a:themeElements>'
+        f'<a:clrScheme name="Bench">{colors}</a:clrScheme>'
+        f'<a:fontScheme name="Bench"><a:majorFont>{font}</a:majorFont><a:minorFont>{font}</a:minorFont></a:fontScheme>'
+        f'<a:fmtScheme name="Bench"><a:fillStyleLst>{fill * 3}</a:fillStyleLst><a:lnStyleLst>{line * 3}</a:lnStyleLst>'
+        f'<a:effectStyleLst>{"<a:effectStyle><a:effectLst/></a:effectStyle>" * 3}</a:effectStyleLst>'
+        f"<a:bgFillStyleLst>{fill * 3}</a:bgFillStyleLst></a:fmtScheme></a:themeElements></a:theme>"
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(
+            "[Content_Types].xml",
+            _content_types(
+                [
+                    ("ppt/presentation.xml", f"{ct}.presentation.main+xml"),
+                    ("ppt/slideMasters/slideMaster1.xml", f"{ct}.slideMaster+xml"),
+                    ("ppt/slideLayouts/slideLayout1.xml", f"{ct}.slideLayout+xml"),
+                    ("ppt/theme/theme1.xml", "application/vnd.openxmlformats-officedocument.theme+xml"),
+                ]
+                + [(f"ppt/slides/slide{i}.xml", f"{ct}.slide+xml") for i in range(1, slides + 1)]
+            ),
+        )
+        zf.writestr("_rels/.rels", _rels([("officeDocument", "ppt/presentation.xml")]))
+        zf.writestr("ppt/presentation.xml", presentation)
+        zf.writestr(
+            "ppt/_rels/presentation.xml.rels",
+            _rels(
+                [("slideMaster", "slideMasters/slideMaster1.xml"), ("theme", "theme/theme1.xml")]
+                + [("slide", f"slides/slide{i}.xml") for i in range(1, slides + 1)]
+            ),
+        )
+        zf.writestr("ppt/slideMasters/slideMaster1.xml", master)
+        zf.writestr(
+            "ppt/slideMasters/_rels/slideMaster1.xml.rels",
+            _rels([("slideLayout", "../slideLayouts/slideLayout1.xml"), ("theme", "../theme/theme1.xml")]),
+        )
+        zf.writestr("ppt/slideLayouts/slideLayout1.xml", layout)
+        zf.writestr(
+            "ppt/slideLayouts/_rels/slideLayout1.xml.rels",
+            _rels([("slideMaster", "../slideMasters/slideMaster1.xml")]),
+        )
+        zf.writestr("ppt/theme/theme1.xml", theme)
+        for i in range(1, slides + 1):
+            zf.writestr(
+                f"ppt/slides/slide{i}.xml",
+                f'{XML_DECL}<p:sld {ns}>{_shape_tree(f"Slide {i}")}<p:clrMapOvr><a:masterClrMapping/></p:clrMapOvr></p:sld>',
+            )
+            zf.writestr(
+                f"ppt/slides/_rels/slide{i}.xml.rels",
+                _rels([("slideLayout", "../slideLayouts/slideLayout1.xml")]),
+            )
+
+
+def time_validate(scripts_dir, document, repeat, jobs=1):
+    command = [sys.executable, str(Path(scripts_dir) / "validate.py"), str(document), "--original", str(document)]
+    if jobs > 1:
+        command += ["--jobs", str(jobs)]
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run(command, capture_output=True, text=True)
+        samples.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            print(f"warning: validate.py exited {result.returncode} on {document.name}:", file=sys.stderr)
+            print(result.stdout[-2000:], file=sys.stderr)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--paragraphs", type=int, default=5000)
+    parser.add_argument("--headers", type=int, default=40)
+    parser.add_argument("--media-mb", type=int, default=20)
+    parser.add_argument("--slides", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1])
+    parser.add_argument(
+        "--scripts",
+        nargs="+",
+        default=[str(Path(__file__).resolve().parent)],
+        help="office/ directories whose validate.py to time (default: this one)",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        docx = Path(temp_dir) / "bench.docx"
+        pptx = Path(temp_dir) / "bench.pptx"
+        make_docx(docx, args.paragraphs, args.headers, args.media_mb)
+        make_pptx(pptx, args.slides)
+
+        print(f"{'scripts':<40}  {'document':<28}  {'jobs':>4}  {'median':>8}  {'min':>8}")
+        for scripts_dir in args.scripts:
+            for document, label in (
+                (docx, f"docx {args.paragraphs}p/{args.headers}h"),
+                (pptx, f"pptx {args.slides} slides"),
+            ):
+                for jobs in args.jobs:
+                    samples = time_validate(scripts_dir, document, args.repeat, jobs)
+                    print(
+                        f"{scripts_dir[-40:]:<40}  {label:<28}  {jobs:>4}  "
+                        f"{statistics.median(samples):>7.2f}s  {min(samples):>7.2f}s"
+                    )
+
+
+if __name__ == "__main__":
+    main()
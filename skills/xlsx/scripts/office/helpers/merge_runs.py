@@ -10,7 +10,7 @@ Also:
 
 from pathlib import Path
 
-import defusedxml.minidom
+from .xml_part import XML_NAMESPACE, XmlPart, is_element, local_name, remove_node
 
 
 def merge_runs(input_dir: str) -> tuple[int, str]:
@@ -20,71 +20,56 @@ def merge_runs(input_dir: str) -> tuple[int, str]:
         return 0, f"Error: {doc_xml} not found"
 
     try:
-        dom = defusedxml.minidom.parseString(doc_xml.read_text(encoding="utf-8"))
-        root = dom.documentElement
+        part = XmlPart.parse(doc_xml.read_bytes())
+        merge_count = merge_part_runs(part)
+        doc_xml.write_bytes(part.to_xml().encode("utf-8"))
+        return merge_count, f"Merged {merge_count} runs"
 
-        _remove_elements(root, "proofErr")
-        _strip_run_rsid_attrs(root)
+    except Exception as e:
+        return 0, f"Error: {e}"
 
-        containers = {run.parentNode for run in _find_elements(root, "r")}
 
-        merge_count = 0
-        for container in containers:
-            merge_count += _merge_runs_in(container)
+def merge_part_runs(part: XmlPart) -> int:
+    root = part.root
 
-        doc_xml.write_bytes(dom.toxml(encoding="UTF-8"))
-        return merge_count, f"Merged {merge_count} runs"
+    _remove_elements(root, "proofErr")
+    _strip_run_rsid_attrs(root)
 
-    except Exception as e:
-        return 0, f"Error: {e}"
+    containers = dict.fromkeys(
+        run.getparent() for run in _find_elements(root, "r") if run is not root
+    )
 
+    merge_count = 0
+    for container in containers:
+        merge_count += _merge_runs_in(part, container)
 
+    return merge_count
 
 
-def _find_elements(root, tag: str) -> list:
-    results = []
 
-    def traverse(node):
-        if node.nodeType == node.ELEMENT_NODE:
-            name = node.localName or node.tagName
-            if name == tag or name.endswith(f":{tag}"):
-                results.append(node)
-            for child in node.childNodes:
-                traverse(child)
 
-    traverse(root)
-    return results
+def _find_elements(root, tag: str) -> list:
+    return list(root.iter(f"{{*}}{tag}"))
 
 
 def _get_child(parent, tag: str):
-    for child in parent.childNodes:
-        if child.nodeType == child.ELEMENT_NODE:
-            name = child.localName or child.tagName
-            if name == tag or name.endswith(f":{tag}"):
-                return child
-    return None
+    return parent.find(f"{{*}}{tag}")
 
 
 def _get_children(parent, tag: str) -> list:
-    results = []
-    for child in parent.childNodes:
-        if child.nodeType == child.ELEMENT_NODE:
-            name = child.localName or child.tagName
-            if name == tag or name.endswith(f":{tag}"):
-                results.append(child)
-    return results
+    return parent.findall(f"{{*}}{tag}")
 
 
 def _is_adjacent(elem1, elem2) -> bool:
-    node = elem1.nextSibling
-    while node:
-        if node == elem2:
+    if elem1.tail and elem1.tail.strip():
+        return False
+    for node in elem1.itersiblings():
+        if node is elem2:
             return True
-        if node.nodeType == node.ELEMENT_NODE:
+        if is_element(node):
             return False
-        if node.nodeType == node.TEXT_NODE and node.data.strip():
+        if node.tail and node.tail.strip():
             return False
-        node = node.nextSibling
     return False
 
 
@@ -92,29 +77,29 @@ def _is_adjacent(elem1, elem2) -> bool:
 
 def _remove_elements(root, tag: str):
     for elem in _find_elements(root, tag):
-        if elem.parentNode:
-            elem.parentNode.removeChild(elem)
+        if elem.getparent() is not None:
+            remove_node(elem)
 
 
 def _strip_run_rsid_attrs(root):
     for run in _find_elements(root, "r"):
-        for attr in list(run.attributes.values()):
-            if "rsid" in attr.name.lower():
-                run.removeAttribute(attr.name)
+        for name in list(run.attrib):
+            if "rsid" in name.rpartition("}")[2].lower():
+                del run.attrib[name]
 
 
 
 
-def _merge_runs_in(container) -> int:
+def _merge_runs_in(part, container) -> int:
     merge_count = 0
     run = _first_child_run(container)
 
-    while run:
+    while run is not None:
         while True:
             next_elem = _next_element_sibling(run)
-            if next_elem and _is_run(next_elem) and _can_merge(run, next_elem):
+            if next_elem is not None and _is_run(next_elem) and _can_merge(part, run, next_elem):
                 _merge_run_content(run, next_elem)
-                container.removeChild(next_elem)
+                remove_node(next_elem)
                 merge_count += 1
             else:
                 break
@@ -126,37 +111,31 @@ def _merge_runs_in(container) -> int:
 
 
 def _first_child_run(container):
-    for child in container.childNodes:
-        if child.nodeType == child.ELEMENT_NODE and _is_run(child):
+    for child in container:
+        if is_element(child) and _is_run(child):
             return child
     return None
 
 
 def _next_element_sibling(node):
-    sibling = node.nextSibling
-    while sibling:
-        if sibling.nodeType == sibling.ELEMENT_NODE:
+    for sibling in node.itersiblings():
+        if is_element(sibling):
             return sibling
-        sibling = sibling.nextSibling
     return None
 
 
 def _next_sibling_run(node):
-    sibling = node.nextSibling
-    while sibling:
-        if sibling.nodeType == sibling.ELEMENT_NODE:
-            if _is_run(sibling):
-                return sibling
-        sibling = sibling.nextSibling
+    for sibling in node.itersiblings():
+        if is_element(sibling) and _is_run(sibling):
+            return sibling
     return None
 
 
 def _is_run(node) -> bool:
-    name = node.localName or node.tagName
-    return name == "r" or name.endswith(":r")
+    return local_name(node) == "r"
 
 
-def _can_merge(run1, run2) -> bool:
+def _can_merge(part, run1, run2) -> bool:
     rpr1 = _get_child(run1, "rPr")
     rpr2 = _get_child(run2, "rPr")
 
@@ -164,36 +143,31 @@ def _can_merge(run1, run2) -> bool:
         return False
     if rpr1 is None:
         return True
-    return rpr1.toxml() == rpr2.toxml()  
+    return part.element_xml(rpr1) == part.element_xml(rpr2)
 
 
 def _merge_run_content(target, source):
-    for child in list(source.childNodes):
-        if child.nodeType == child.ELEMENT_NODE:
-            name = child.localName or child.tagName
-            if name != "rPr" and not name.endswith(":rPr"):
-                target.appendChild(child)
+    for child in list(source):
+        if is_element(child) and local_name(child) != "rPr":
+            # Text after the child stays behind in source, as with minidom
+            child.tail = None
+            target.append(child)
 
 
 def _consolidate_text(run):
     t_elements = _get_children(run, "t")
+    xml_space = f"{{{XML_NAMESPACE}}}space"
 
     for i in range(len(t_elements) - 1, 0, -1):
         curr, prev = t_elements[i], t_elements[i - 1]
 
         if _is_adjacent(prev, curr):
-            prev_text = prev.firstChild.data if prev.firstChild else ""
-            curr_text = curr.firstChild.data if curr.firstChild else ""
-            merged = prev_text + curr_text
-
-            if prev.firstChild:
-                prev.firstChild.data = merged
-            else:
-                prev.appendChild(run.ownerDocument.createTextNode(merged))
+            merged = (prev.text or "") + (curr.text or "")
+            prev.text = merged
 
             if merged.startswith(" ") or merged.endswith(" "):
-                prev.setAttribute("xml:space", "preserve")
-            elif prev.hasAttribute("xml:space"):
-                prev.removeAttribute("xml:space")
+                prev.set(xml_space, "preserve")
+            elif xml_space in prev.attrib:
+                del prev.attrib[xml_space]
 
-            run.removeChild(curr)
+            remove_node(curr)
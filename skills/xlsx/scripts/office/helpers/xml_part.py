@@ -0,0 +1,249 @@
+"""Parse and serialize Office XML parts with lxml, byte-compatible with minidom.
+
+The unpack/pack transforms used to round-trip every part through
+defusedxml.minidom. XmlPart parses with a hardened lxml parser (no entity
+resolution, no DTD loading, no network) and writes the exact bytes
+minidom's toxml()/toprettyxml() would, so output is unchanged while parts
+are parsed in C and held in a fraction of the memory.
+
+lxml does not expose which namespaces an element declares itself, so they
+are recorded from the parser's start-ns events and written back in source
+order, the way minidom keeps them as attributes. Nor does it keep the
+prefix an attribute was written with; that is recovered from the source
+only when a namespace is bound to more than one prefix.
+"""
+
+import io
+import re
+import xml.dom.minidom
+import xml.parsers.expat
+
+import lxml.etree
+
+XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
+
+
+def _minidom_escapes_quote_in_text():
+    # Python 3.13 stopped escaping '"' in text and started escaping
+    # tab/newline in attribute values; follow the interpreter's minidom
+    doc = xml.dom.minidom.Document()
+    elem = doc.createElement("a")
+    elem.appendChild(doc.createTextNode('"'))
+    return elem.toxml() == "<a>&quot;</a>"
+
+
+def _escaper(replacements):
+    special = re.compile("|".join(re.escape(char) for char in replacements))
+
+    def escape(text):
+        if special.search(text) is None:
+            return text
+        return special.sub(lambda match: replacements[match.group()], text)
+
+    return escape
+
+
+_TEXT_ESCAPES = {"&": "&amp;", "<": "&lt;", ">": "&gt;"}
+_ATTR_ESCAPES = {**_TEXT_ESCAPES, '"': "&quot;"}
+if _minidom_escapes_quote_in_text():
+    _TEXT_ESCAPES = _ATTR_ESCAPES
+else:
+    _ATTR_ESCAPES.update({"\r": "&#13;", "\n": "&#10;", "\t": "&#9;"})
+
+_escape_text = _escaper(_TEXT_ESCAPES)
+_escape_attr = _escaper(_ATTR_ESCAPES)
+
+
+def local_name(node) -> str:
+    return node.tag.rpartition("}")[2]
+
+
+def is_element(node) -> bool:
+    return isinstance(node.tag, str)
+
+
+def remove_node(node) -> None:
+    """Remove node but keep the text after it, as minidom's removeChild does."""
+    parent = node.getparent()
+    tail = node.tail
+    if tail:
+        previous = node.getprevious()
+        if previous is not None:
+            previous.tail = (previous.tail or "") + tail
+        else:
+            parent.text = (parent.text or "") + tail
+    parent.remove(node)
+
+
+def append_text(parent, text) -> None:
+    if len(parent):
+        last = parent[-1]
+        last.tail = (last.tail or "") + text
+    else:
+        parent.text = (parent.text or "") + text
+
+
+def _source_attr_qnames(data: bytes, root) -> dict:
+    """
+    Map each element with prefixed attributes to {Clark name: qname as
+    written}, for documents where the prefix can't be derived from the URI.
+    """
+    source_names = []
+    parser = xml.parsers.expat.ParserCreate()
+    parser.ordered_attributes = True
+    parser.StartElementHandler = lambda tag, attrs: source_names.append(attrs[::2])
+    parser.Parse(data, True)
+
+    attr_qnames = {}
+    elements = (node for node in root.iter() if is_element(node))
+    for elem, names in zip(elements, source_names):
+        qnames = {}
+        for qname in names:
+            prefix, _, local = qname.rpartition(":")
+            if prefix and prefix != "xmlns":
+                uri = XML_NAMESPACE if prefix == "xml" else elem.nsmap[prefix]
+                qnames[f"{{{uri}}}{local}"] = qname
+        if qnames:
+            attr_qnames[elem] = qnames
+    return attr_qnames
+
+
+class XmlPart:
+
+    def __init__(self, root, ns_declarations, attr_qnames=None):
+        self.root = root
+        self._ns_declarations = ns_declarations
+        self._attr_qnames = attr_qnames or {}
+        self._split_names = {}
+
+    @classmethod
+    def parse(cls, data: bytes) -> "XmlPart":
+        ns_declarations = {}
+        pending = []
+        events = lxml.etree.iterparse(
+            io.BytesIO(data),
+            events=("start-ns", "start"),
+            resolve_entities=False,
+            load_dtd=False,
+            no_network=True,
+            remove_blank_text=False,
+            remove_comments=False,
+            remove_pis=False,
+        )
+        bindings = set()
+        for event, item in events:
+            if event == "start-ns":
+                pending.append(item)
+                bindings.add(item)
+            elif pending:
+                ns_declarations[item] = pending
+                pending = []
+
+        root = events.root
+        if root.getroottree().docinfo.doctype:
+            raise ValueError("DOCTYPE declarations are not allowed in Office XML parts")
+
+        prefixed = [uri for prefix, uri in bindings if prefix]
+        attr_qnames = None
+        if len(prefixed) != len(set(prefixed)):
+            attr_qnames = _source_attr_qnames(data, root)
+        return cls(root, ns_declarations, attr_qnames)
+
+    def to_xml(self, pretty=False) -> str:
+        """The document as minidom's toxml() or toprettyxml(indent="  ") writes it."""
+        newl = "\n" if pretty else ""
+        encoding = "utf-8" if pretty else "UTF-8"
+        out = [f'<?xml version="1.0" encoding="{encoding}"?>{newl}']
+        for node in reversed(list(self.root.itersiblings(preceding=True))):
+            self._write(out, node, "", "  " if pretty else "", newl, {})
+        self._write(out, self.root, "", "  " if pretty else "", newl, {})
+        for node in self.root.itersiblings():
+            self._write(out, node, "", "  " if pretty else "", newl, {})
+        return "".join(out)
+
+    def element_xml(self, elem) -> str:
+        """One element as minidom's Element.toxml() writes it."""
+        out = []
+        self._write(out, elem, "", "", "", {})
+        return "".join(out)
+
+    def _write(self, out, node, indent, addindent, newl, scope):
+        tag = node.tag
+        if tag is lxml.etree.Comment:
+            data = node.text or ""
+            if "--" in data:
+                raise ValueError("'--' is not allowed in a comment node")
+            out.append(f"{indent}<!--{data}-->{newl}")
+            return
+        if tag is lxml.etree.ProcessingInstruction:
+            out.append(f"{indent}<?{node.target} {node.text or ''}?>{newl}")
+            return
+        if not isinstance(tag, str):
+            raise ValueError(f"Unsupported node in XML part: {node!r}")
+
+        declared = self._ns_declarations.get(node)
+        if declared:
+            scope = dict(scope)
+            for prefix, uri in reversed(declared):
+                if prefix:
+                    scope[uri] = prefix
+
+        qname = self._qualified_tag(node, tag, node.prefix)
+        out.append(f"{indent}<{qname}")
+        if declared:
+            for prefix, uri in declared:
+                name = f"xmlns:{prefix}" if prefix else "xmlns"
+                out.append(f' {name}="{_escape_attr(uri)}"')
+        for name, value in node.attrib.items():
+            if name[0] == "{":
+                name = self._qualified_attr(node, name, scope)
+            out.append(f' {name}="{_escape_attr(value)}"')
+
+        text = node.text
+        if not len(node):
+            if text is None:
+                out.append(f"/>{newl}")
+            else:
+                out.append(f">{_escape_text(text)}</{qname}>{newl}")
+            return
+
+        out.append(f">{newl}")
+        child_indent = indent + addindent
+        if text is not None:
+            out.append(_escape_text(f"{child_indent}{text}{newl}"))
+        for child in node:
+            self._write(out, child, child_indent, addindent, newl, scope)
+            tail = child.tail
+            if tail is not None:
+                out.append(_escape_text(f"{child_indent}{tail}{newl}"))
+        out.append(f"{indent}</{qname}>{newl}")
+
+    def _split(self, name):
+        split = self._split_names.get(name)
+        if split is None:
+            split = self._split_names[name] = tuple(name[1:].split("}", 1))
+        return split
+
+    def _qualified_tag(self, node, tag, prefix):
+        if tag[0] != "{":
+            return tag
+        local = self._split(tag)[1]
+        return f"{prefix}:{local}" if prefix else local
+
+    def _qualified_attr(self, node, name, scope):
+        qnames = self._attr_qnames.get(node)
+        if qnames and name in qnames:
+            return qnames[name]
+        uri, local = self._split(name)
+        if uri == XML_NAMESPACE:
+            return f"xml:{local}"
+        prefix = scope.get(uri)
+        if prefix is None:
+            prefix = next(
+                (p for p, u in node.nsmap.items() if u == uri and p), None
+            )
+        return f"{prefix}:{local}" if prefix else local
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
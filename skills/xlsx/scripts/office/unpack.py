@@ -4,6 +4,8 @@ Extracts the ZIP archive, pretty-prints XML files, and optionally:
 - Merges adjacent runs with identical formatting (DOCX only)
 - Simplifies adjacent tracked changes from same author (DOCX only)
 
+Each XML part is read once, transformed in memory with lxml and written once.
+
 Usage:
     python unpack.py <office_file> <output_dir> [options]
 
@@ -18,10 +20,9 @@ import sys
 import zipfile
 from pathlib import Path
 
-import defusedxml.minidom
-
-from helpers.merge_runs import merge_runs as do_merge_runs
-from helpers.simplify_redlines import simplify_redlines as do_simplify_redlines
+from helpers.merge_runs import merge_part_runs
+from helpers.simplify_redlines import simplify_part_redlines
+from helpers.xml_part import XmlPart
 
 SMART_QUOTE_REPLACEMENTS = {
     "\u201c": "&#x201C;",  
@@ -54,23 +55,25 @@ def unpack(
             zf.extractall(output_path)
 
         xml_files = list(output_path.rglob("*.xml")) + list(output_path.rglob("*.rels"))
+        document_xml = output_path / "word" / "document.xml"
+        simplify_count = merge_count = 0
         for xml_file in xml_files:
-            _pretty_print_xml(xml_file)
+            if suffix == ".docx" and xml_file == document_xml:
+                simplify_count, merge_count = _unpack_part(
+                    xml_file, simplify_redlines, merge_runs
+                )
+            else:
+                _unpack_part(xml_file)
 
         message = f"Unpacked {input_file} ({len(xml_files)} XML files)"
 
         if suffix == ".docx":
             if simplify_redlines:
-                simplify_count, _ = do_simplify_redlines(str(output_path))
                 message += f", simplified {simplify_count} tracked changes"
 
             if merge_runs:
-                merge_count, _ = do_merge_runs(str(output_path))
                 message += f", merged {merge_count} runs"
 
-        for xml_file in xml_files:
-            _escape_smart_quotes(xml_file)
-
         return None, message
 
     except zipfile.BadZipFile:
@@ -79,23 +82,48 @@ def unpack(
         return None, f"Error unpacking: {e}"
 
 
-def _pretty_print_xml(xml_file: Path) -> None:
-    try:
-        content = xml_file.read_text(encoding="utf-8")
-        dom = defusedxml.minidom.parseString(content)
-        xml_file.write_bytes(dom.toprettyxml(indent="  ", encoding="utf-8"))
-    except Exception:
-        pass  
+def _unpack_part(
+    xml_file: Path, simplify_redlines: bool = False, merge_runs: bool = False
+) -> tuple[int, int]:
+    data = xml_file.read_bytes()
+    simplify_count = merge_count = 0
 
+    data = _pretty_print_xml(data)
+
+    if simplify_redlines or merge_runs:
+        # Transform the pretty-printed text, whitespace nodes included,
+        # exactly as the separate passes used to see it on disk
+        try:
+            part = XmlPart.parse(data)
+            if simplify_redlines:
+                simplify_count = simplify_part_redlines(part)
+            if merge_runs:
+                merge_count = merge_part_runs(part)
+            data = part.to_xml().encode("utf-8")
+        except Exception:
+            pass
 
-def _escape_smart_quotes(xml_file: Path) -> None:
     try:
-        content = xml_file.read_text(encoding="utf-8")
-        for char, entity in SMART_QUOTE_REPLACEMENTS.items():
-            content = content.replace(char, entity)
+        content = _escape_smart_quotes(data.decode("utf-8"))
+    except UnicodeDecodeError:
+        xml_file.write_bytes(data)
+    else:
         xml_file.write_text(content, encoding="utf-8")
+
+    return simplify_count, merge_count
+
+
+def _pretty_print_xml(data: bytes) -> bytes:
+    try:
+        return XmlPart.parse(data).to_xml(pretty=True).encode("utf-8")
     except Exception:
-        pass
+        return data
+
+
+def _escape_smart_quotes(content: str) -> str:
+    for char, entity in SMART_QUOTE_REPLACEMENTS.items():
+        content = content.replace(char, entity)
+    return content
 
 
 if __name__ == "__main__":
@@ -2,24 +2,33 @@
 Command line tool to validate Office document XML files against XSD schemas and tracked changes.
 
 Usage:
-    python validate.py <path> [--original <original_file>] [--auto-repair] [--author NAME]
+    python validate.py <path> [--original <original_file>] [--auto-repair] [--author NAME] [--jobs N]
 
 The first argument can be either:
 - An unpacked directory containing the Office document XML files
 - A packed Office file (.docx/.pptx/.xlsx) which will be unpacked to a temp directory
 
+--jobs N validates parts against their XSD schemas in N worker processes,
+each compiling the schemas it needs once. Output is the same as with one job.
+
 Auto-repair fixes:
 - paraId/durableId values that exceed OOXML limits
 - Missing xml:space="preserve" on w:t elements with whitespace
 """
 
 import argparse
+import contextlib
 import sys
 import tempfile
 import zipfile
 from pathlib import Path
 
-from validators import DOCXSchemaValidator, PPTXSchemaValidator, RedliningValidator
+from validators import (
+    DOCXSchemaValidator,
+    OriginalDocument,
+    PPTXSchemaValidator,
+    RedliningValidator,
+)
 
 
 def main():
@@ -50,7 +59,16 @@ def main():
         default="Claude",
         help="Author name for redlining validation (default: Claude)",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of processes for XSD validation (default: 1)",
+    )
     args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
 
     path = Path(args.path)
     assert path.exists(), f"Error: {path} does not exist"
@@ -77,34 +95,36 @@ def main():
         assert path.is_dir(), f"Error: {path} is not a directory or Office file"
         unpacked_dir = path
 
-    match file_extension:
-        case ".docx":
-            validators = [
-                DOCXSchemaValidator(unpacked_dir, original_file, verbose=args.verbose),
-            ]
-            if original_file:
-                validators.append(
-                    RedliningValidator(unpacked_dir, original_file, verbose=args.verbose, author=args.author)  
-                )
-        case ".pptx":
-            validators = [
-                PPTXSchemaValidator(unpacked_dir, original_file, verbose=args.verbose),
-            ]
-        case _:
-            print(f"Error: Validation not supported for file type {file_extension}")
-            sys.exit(1)
-
-    if args.auto_repair:
-        total_repairs = sum(v.repair() for v in validators)
-        if total_repairs:
-            print(f"Auto-repaired {total_repairs} issue(s)")
-
-    success = all(v.validate() for v in validators)
-
-    if success:
-        print("All validations PASSED!")
-
-    sys.exit(0 if success else 1)
+    original_context = OriginalDocument(original_file) if original_file else contextlib.nullcontext()
+    with original_context as original:
+        match file_extension:
+            case ".docx":
+                validators = [
+                    DOCXSchemaValidator(unpacked_dir, original_file, verbose=args.verbose, original=original, jobs=args.jobs),
+                ]
+                if original_file:
+                    validators.append(
+                        RedliningValidator(unpacked_dir, original_file, verbose=args.verbose, author=args.author, original=original)  
+                    )
+            case ".pptx":
+                validators = [
+                    PPTXSchemaValidator(unpacked_dir, original_file, verbose=args.verbose, original=original, jobs=args.jobs),
+                ]
+            case _:
+                print(f"Error: Validation not supported for file type {file_extension}")
+                sys.exit(1)
+
+        if args.auto_repair:
+            total_repairs = sum(v.repair() for v in validators)
+            if total_repairs:
+                print(f"Auto-repaired {total_repairs} issue(s)")
+
+        success = all(v.validate() for v in validators)
+
+        if success:
+            print("All validations PASSED!")
+
+        sys.exit(0 if success else 1)
 
 
 if __name__ == "__main__":
@@ -2,10 +2,9 @@
 Validator for Word document XML files against XSD schemas.
 """
 
+import io
 import random
 import re
-import tempfile
-import zipfile
 
 import defusedxml.minidom
 import lxml.etree
@@ -61,6 +60,9 @@ class DOCXSchemaValidator(BaseSchemaValidator):
 
         self.compare_paragraph_counts()
 
+        if self.verbose:
+            self.report_parse_stats()
+
         return all_valid
 
     def validate_whitespace_preservation(self):
@@ -71,7 +73,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 continue
 
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse(xml_file).getroot()
 
                 for elem in root.iter(f"{{{self.WORD_2006_NAMESPACE}}}t"):
                     if elem.text:
@@ -117,7 +119,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 continue
 
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse(xml_file).getroot()
                 namespaces = {"w": self.WORD_2006_NAMESPACE}
 
                 for t_elem in root.xpath(".//w:del//w:t", namespaces=namespaces):
@@ -168,7 +170,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 continue
 
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse(xml_file).getroot()
                 paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
                 count = len(paragraphs)
             except Exception as e:
@@ -177,22 +179,20 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         return count
 
     def count_paragraphs_in_original(self):
-        original = self.original_file
+        original = self.original
         if original is None:
             return 0
 
         count = 0
 
         try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                with zipfile.ZipFile(original, "r") as zip_ref:
-                    zip_ref.extractall(temp_dir)
-
-                doc_xml_path = temp_dir + "/word/document.xml"
-                root = lxml.etree.parse(doc_xml_path).getroot()
+            data = original.read("word/document.xml")
+            if data is None:
+                raise FileNotFoundError(f"word/document.xml not found in {original.path}")
+            root = lxml.etree.parse(io.BytesIO(data)).getroot()
 
-                paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
-                count = len(paragraphs)
+            paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
+            count = len(paragraphs)
 
         except Exception as e:
             print(f"Error counting paragraphs in original document: {e}")
@@ -207,7 +207,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 continue
 
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse(xml_file).getroot()
                 namespaces = {"w": self.WORD_2006_NAMESPACE}
 
                 invalid_elements = root.xpath(
@@ -258,7 +258,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
 
         for xml_file in self.xml_files:
             try:
-                for elem in lxml.etree.parse(str(xml_file)).iter():
+                for elem in self._parse(xml_file).iter():
                     if val := elem.get(para_id_attr):
                         if self._parse_id_value(val, base=16) >= 0x80000000:
                             errors.append(
@@ -312,7 +312,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
             return True
 
         try:
-            doc_root = lxml.etree.parse(str(document_xml)).getroot()
+            doc_root = self._parse(document_xml).getroot()
             namespaces = {"w": self.WORD_2006_NAMESPACE}
 
             range_starts = {
@@ -352,7 +352,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
 
             comment_ids = set()
             if comments_xml and comments_xml.exists():
-                comments_root = lxml.etree.parse(str(comments_xml)).getroot()
+                comments_root = self._parse(comments_xml).getroot()
                 comment_ids = {
                     elem.get(f"{{{self.WORD_2006_NAMESPACE}}}id")
                     for elem in comments_root.xpath(
@@ -388,10 +388,32 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         repairs += self.repair_durableId()
         return repairs
 
+    def _durable_id_needs_repair(self, xml_file, durable_id):
+        try:
+            if xml_file.name == "numbering.xml":
+                return self._parse_id_value(durable_id, base=10) >= 0x7FFFFFFF
+            return self._parse_id_value(durable_id, base=16) >= 0x7FFFFFFF
+        except ValueError:
+            return True
+
+    def _may_need_durable_id_repair(self, xml_file):
+        try:
+            root = self._parse(xml_file).getroot()
+        except Exception:
+            return True
+        return any(
+            self._durable_id_needs_repair(xml_file, value)
+            for elem in root.iter(lxml.etree.Element)
+            for name, value in elem.attrib.items()
+            if name.endswith("}durableId")
+        )
+
     def repair_durableId(self) -> int:
         repairs = 0
 
         for xml_file in self.xml_files:
+            if not self._may_need_durable_id_repair(xml_file):
+                continue
             try:
                 content = xml_file.read_text(encoding="utf-8")
                 dom = defusedxml.minidom.parseString(content)
@@ -402,24 +424,8 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                         continue
 
                     durable_id = elem.getAttribute("w16cid:durableId")
-                    needs_repair = False
-
-                    if xml_file.name == "numbering.xml":
-                        try:
-                            needs_repair = (
-                                self._parse_id_value(durable_id, base=10) >= 0x7FFFFFFF
-                            )
-                        except ValueError:
-                            needs_repair = True
-                    else:
-                        try:
-                            needs_repair = (
-                                self._parse_id_value(durable_id, base=16) >= 0x7FFFFFFF
-                            )
-                        except ValueError:
-                            needs_repair = True
 
-                    if needs_repair:
+                    if self._durable_id_needs_repair(xml_file, durable_id):
                         value = random.randint(1, 0x7FFFFFFE)
                         if xml_file.name == "numbering.xml":
                             new_id = str(value)  
@@ -435,6 +441,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
 
                 if modified:
                     xml_file.write_bytes(dom.toxml(encoding="UTF-8"))
+                    self._forget(xml_file)
 
             except Exception:
                 pass
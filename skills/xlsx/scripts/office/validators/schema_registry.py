@@ -0,0 +1,53 @@
+"""
+Process-wide cache of compiled XSD schemas.
+
+Compiling a schema is the expensive part of XSD validation (wml.xsd with its
+imports takes ~150ms), and every part of a document that maps to the same
+schema can share one compiled copy for the life of the process.
+"""
+
+import time
+from pathlib import Path
+
+import lxml.etree
+
+
+class SchemaRegistry:
+
+    def __init__(self):
+        self._schemas = {}
+        self.compile_count = 0
+        self.compile_seconds = 0.0
+
+    def get(self, schema_path):
+        schema_path = Path(schema_path).resolve()
+        schema = self._schemas.get(schema_path)
+        if schema is None:
+            start = time.perf_counter()
+            with open(schema_path, "rb") as xsd_file:
+                parser = lxml.etree.XMLParser()
+                xsd_doc = lxml.etree.parse(
+                    xsd_file, parser=parser, base_url=str(schema_path)
+                )
+            schema = lxml.etree.XMLSchema(xsd_doc)
+            self.compile_seconds += time.perf_counter() - start
+            self.compile_count += 1
+            self._schemas[schema_path] = schema
+        return schema
+
+    def preload(self, schema_paths):
+        for schema_path in schema_paths:
+            self.get(schema_path)
+
+    def __contains__(self, schema_path):
+        return Path(schema_path).resolve() in self._schemas
+
+    def __len__(self):
+        return len(self._schemas)
+
+
+SCHEMA_REGISTRY = SchemaRegistry()
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")